@@ -1,6 +1,8 @@
 import cv2
 import mediapipe as mp
 
+from hand_gesture.effects import EffectEngine, finger_state_modes
+
 # 1. Initialize the standard legacy MediaPipe Hands API
 mp_drawing = mp.solutions.drawing_utils
 mp_drawing_styles = mp.solutions.drawing_styles
@@ -15,6 +17,10 @@ if not cap.isOpened():
 
 print("Hand Gesture Recognition started. Press 'q' to quit.")
 
+# Color modes per finger count: 1 greyscale, 2 purple, 3 orange, 4 yellow,
+# anything else normal. Tables and buffers are built once, not per frame.
+effects = EffectEngine(finger_state_modes())
+
 # 3. Use a context manager to initialize the Hands model
 with mp_hands.Hands(
     static_image_mode=False,
@@ -33,19 +39,16 @@ with mp_hands.Hands(
         frame = cv2.flip(frame, 1)
         
         # Convert the BGR image to RGB (MediaPipe requires RGB)
-        image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         
         # To improve performance, mark the image as not writeable to pass by reference
-        image.flags.writeable = False
+        rgb.flags.writeable = False
         
         # Process the image and find hands
-        results = hands.process(image)
-        
-        # Mark the image as writeable again
-        image.flags.writeable = True
+        results = hands.process(rgb)
         
-        # Convert the image back to BGR for OpenCV rendering
-        image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+        # Draw on the flipped BGR frame itself; the RGB copy was only for MediaPipe
+        image = frame
 
         # Draw hand landmarks
         finger_count = 0
@@ -93,38 +96,7 @@ with mp_hands.Hands(
                 break
         
         # Apply color/hue changes according to finger_count
-        if finger_count == 1:
-            # Greyscale
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            image = cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
-            mode_text = "Greyscale"
-        elif finger_count == 2:
-            # Purple tint (set hue to purple)
-            hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-            h, s, v = cv2.split(hsv)
-            h[:] = 140
-            hsv = cv2.merge([h, s, v])
-            image = cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
-            mode_text = "Purple"
-        elif finger_count == 3:
-            # Orange tint
-            hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-            h, s, v = cv2.split(hsv)
-            h[:] = 10
-            hsv = cv2.merge([h, s, v])
-            image = cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
-            mode_text = "Orange"
-        elif finger_count == 4:
-            # Yellow tint
-            hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-            h, s, v = cv2.split(hsv)
-            h[:] = 25
-            hsv = cv2.merge([h, s, v])
-            image = cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
-            mode_text = "Yellow"
-        else:
-            # Normal (no change) when 0 or 5+
-            mode_text = "Normal"
+        image, mode_text = effects.apply(image, finger_count)
 
         # Overlay current finger count and mode
         cv2.rectangle(image, (0,0), (220,40), (0,0,0), -1)
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import sys
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from hand_gesture.supervisor import STATE_LOST, STATE_RECOVERED, CaptureStatus, CaptureSupervisor
+
+FRAME = np.zeros((4, 4, 3), dtype=np.uint8)
+
+
+class FakeCapture:
+    # Scripted camera on an injectable clock. Between unplug_at and replug_at
+    # the device is gone: reads fail instantly, isOpened() is False and
+    # reopen() fails. suspend_* makes reads fail while the handle stays open.
+    def __init__(
+        self,
+        clock,
+        unplug_at: float = float("inf"),
+        replug_at: float = float("inf"),
+        suspend_at: float = float("inf"),
+        resume_at: float = float("inf"),
+        drop_probability: float = 0.0,
+        raise_probability: float = 0.0,
+        seed: int = 0,
+    ):
+        self.clock = clock
+        self.unplug_at = unplug_at
+        self.replug_at = replug_at
+        self.suspend_at = suspend_at
+        self.resume_at = resume_at
+        self.drop_probability = drop_probability
+        self.raise_probability = raise_probability
+        self.rng = random.Random(seed)
+        self.opened = True
+        self.reads = 0
+        self.reopen_calls = 0
+        self.camera_index = 0
+        self.dropped_frames = 0
+
+    def _present(self) -> bool:
+        now = self.clock()
+        return not (self.unplug_at <= now < self.replug_at)
+
+    def isOpened(self) -> bool:
+        return self.opened and self._present()
+
+    def read(self):
+        self.reads += 1
+        if not self._present():
+            self.opened = False
+            return False, None
+        if not self.opened:
+            return False, None
+        if self.suspend_at <= self.clock() < self.resume_at:
+            return False, None
+        if self.rng.random() < self.raise_probability:
+            raise OSError("injected driver error")
+        if self.rng.random() < self.drop_probability:
+            return False, None
+        return True, FRAME
+
+    def reopen(self) -> bool:
+        self.reopen_calls += 1
+        self.opened = self._present()
+        return self.opened
+
+    def release(self) -> None:
+        self.opened = False
+
+
+class SimClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _simulate(name: str, duration: float, supervised: bool, fault_end: float, **faults):
+    # Mirrors the controller loop on simulated time: a frame costs 1/30 s, a
+    # failed read costs the waitKey sleep (retry delay capped at 100 ms, at
+    # least 1 ms) or 20 us for the old immediate `continue`.
+    clock = SimClock()
+    device = FakeCapture(clock, **faults)
+    events: List[CaptureStatus] = []
+    capture = CaptureSupervisor(device, on_status=events.append, clock=clock) if supervised else device
+    frames = 0
+    first_frame_after_fault: Optional[float] = None
+    while clock.now < duration:
+        try:
+            ok, _ = capture.read()
+        except OSError:
+            ok = False
+        if ok:
+            frames += 1
+            if clock.now >= fault_end and first_frame_after_fault is None:
+                first_frame_after_fault = clock.now
+            clock.now += 1.0 / 30.0
+        elif supervised:
+            clock.now += max(0.001, min(capture.retry_delay(), 0.1))
+        else:
+            clock.now += 0.00002
+    lost = [event for event in events if event.state == STATE_LOST]
+    recovered = [event for event in events if event.state == STATE_RECOVERED]
+    return {
+        "scenario": name,
+        "mode": "supervised" if supervised else "spin",
+        "frames": frames,
+        "device_reads": device.reads,
+        "reopen_calls": device.reopen_calls,
+        "lost_events": len(lost),
+        "recovered_events": len(recovered),
+        "max_backoff": max((event.retry_in_seconds for event in lost), default=0.0),
+        "recovery_ms": (first_frame_after_fault - fault_end) * 1000.0 if first_frame_after_fault is not None and fault_end < duration else float("nan"),
+    }
+
+
+def _cpu_share(supervised: bool, seconds: float) -> float:
+    # Real time: an unplugged camera, with the loop sleeping where the UI
+    # loop would call waitKey.
+    device = FakeCapture(time.monotonic, unplug_at=0.0)
+    capture = CaptureSupervisor(device) if supervised else device
+    cpu_started = time.process_time()
+    started = time.monotonic()
+    while time.monotonic() - started < seconds:
+        ok, _ = capture.read()
+        if not ok and supervised:
+            time.sleep(max(0.001, min(capture.retry_delay(), 0.1)))
+    return (time.process_time() - cpu_started) / seconds
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Inject camera faults into a fake capture and compare the supervisor with the old spin loop.")
+    parser.add_argument("--seconds", type=float, default=1.0, help="Real-time CPU measurement length per mode.")
+    args = parser.parse_args()
+    # Injected driver errors are logged with tracebacks; keep the table readable.
+    logging.getLogger("hand_gesture.supervisor").setLevel(logging.CRITICAL)
+
+    scenarios = [
+        ("unplug 3s", 10.0, 2.0, 5.0, dict(unplug_at=2.0, replug_at=5.0)),
+        ("unplug 30s", 40.0, 2.0, 32.0, dict(unplug_at=2.0, replug_at=32.0)),
+        ("suspend 2s", 6.0, 1.0, 3.0, dict(suspend_at=1.0, resume_at=3.0)),
+        ("flaky 20% drops", 10.0, 10.0, 10.0, dict(drop_probability=0.2, seed=4)),
+        ("driver raises 5%", 10.0, 10.0, 10.0, dict(raise_probability=0.05, seed=5)),
+    ]
+    print(f"{'scenario':<18} {'mode':<10} {'frames':>6} {'reads':>8} {'reopens':>7} {'lost':>4} {'recov':>5} {'backoff_s':>9} {'recovery_ms':>11}")
+    ok = True
+    for name, duration, start, end, faults in scenarios:
+        for supervised in (False, True):
+            result = _simulate(name, duration, supervised, end, **faults)
+            print(
+                f"{result['scenario']:<18} {result['mode']:<10} {result['frames']:6d} {result['device_reads']:8d} "
+                f"{result['reopen_calls']:7d} {result['lost_events']:4d} {result['recovered_events']:5d} "
+                f"{result['max_backoff']:9.2f} {result['recovery_ms']:11.1f}"
+            )
+            if supervised and end > start:
+                # Every outage is reported once as lost and once as recovered.
+                ok = ok and result["recovered_events"] == 1
+            if supervised and end == start:
+                ok = ok and result["lost_events"] == 0
+    print(f"CPU share with the camera unplugged: spin {_cpu_share(False, args.seconds):.0%}, supervised {_cpu_share(True, args.seconds):.1%}")
+    print("fault checks:", "ok" if ok else "FAILED")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
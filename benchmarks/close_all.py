@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+from typing import Optional
+
+from hand_gesture.actions import DesktopActionExecutor
+from hand_gesture.config import RuntimeConfig
+from hand_gesture.gestures import GestureAction
+from hand_gesture.windows import FakeWindow, FakeWindowBackend
+
+SELF_PID = os.getpid()
+
+
+def _desktop(apps: int, unsaved: int, seed: int) -> FakeWindowBackend:
+    # Our own window in front (the user is gesturing at the camera view),
+    # then the apps; some take a while to shut down, some ask to save.
+    rng = random.Random(seed)
+    windows = []
+    for index in range(apps):
+        windows.append(
+            FakeWindow(
+                100 + index,
+                1000 + index,
+                f"App {index}",
+                close_delay_seconds=rng.uniform(0.02, 0.4),
+                refuses_close=index < unsaved,
+            )
+        )
+    rng.shuffle(windows)
+    return FakeWindowBackend([FakeWindow(1, SELF_PID, "Hand Gesture Control")] + windows)
+
+
+def _legacy(backend: FakeWindowBackend, iterations: int, delay: float) -> dict:
+    # The Windows path of the old close/switch loop: focus the last external
+    # window, Alt+F4 it, sleep, switch back to it or Alt+Tab, sleep, then
+    # re-read the foreground window as the next target.
+    def external_foreground() -> Optional[int]:
+        front = backend.list_windows()[0] if backend.windows else None
+        return front.handle if front is not None and front.pid != SELF_PID else None
+
+    target = next((window.handle for window in backend.list_windows() if window.pid != SELF_PID), None)
+    aborted = False
+    for _ in range(iterations):
+        if target is None or not backend.is_open(target):
+            aborted = True
+            break
+        backend.focus(target)
+        time.sleep(0.05)
+        backend.request_close([target])
+        time.sleep(delay)
+        if not (target is not None and backend.is_open(target) and backend.focus(target)):
+            windows = backend.list_windows()
+            if len(windows) > 1:
+                backend.focus(windows[1].handle)
+        time.sleep(delay)
+        target = external_foreground() or target
+    return {"aborted": aborted}
+
+
+def _report(label: str, backend: FakeWindowBackend, apps: int, seconds: float, extra: str = "") -> None:
+    time.sleep(0.7)  # let pending closes land before counting
+    still_open = sum(1 for window in backend.windows if window.pid != SELF_PID)
+    own_open = any(window.pid == SELF_PID for window in backend.windows)
+    requests = backend.close_requests
+    duplicates = len(requests) - len(set(requests))
+    print(
+        f"  {label:<10} {seconds * 1000:9.0f} {apps - still_open:6d} {still_open:6d} "
+        f"{duplicates:10d} {backend.enumerations:5d} {'yes' if own_open else 'NO':>8} {extra}"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare the close/switch/sleep CLOSE_ALL_APPS loop with batched window closing on a simulated desktop.")
+    parser.add_argument("--apps", type=int, nargs="+", default=[4, 12])
+    parser.add_argument("--unsaved", type=int, default=1, help="Apps that ask to save instead of closing.")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    logging.getLogger("hand_gesture.actions").setLevel(logging.ERROR)
+
+    config = RuntimeConfig()
+    print(
+        f"legacy: {config.close_all_iterations} iterations, {config.close_all_step_delay_seconds:g}s steps; "
+        f"batched: {config.close_all_timeout_seconds:g}s deadline"
+    )
+    for apps in args.apps:
+        for unsaved in sorted({0, args.unsaved}):
+            print(f"{apps} apps, {unsaved} with unsaved changes")
+            print(f"  {'method':<10} {'elapsed_ms':>9} {'closed':>6} {'open':>6} {'duplicates':>10} {'enums':>5} {'self_ok':>8}")
+
+            backend = _desktop(apps, unsaved, args.seed + apps + unsaved)
+            started = time.perf_counter()
+            outcome = _legacy(backend, config.close_all_iterations, config.close_all_step_delay_seconds)
+            _report("legacy", backend, apps, time.perf_counter() - started, "aborted: no target" if outcome["aborted"] else "")
+
+            backend = _desktop(apps, unsaved, args.seed + apps + unsaved)
+            executor = DesktopActionExecutor(
+                close_all_iterations=config.close_all_iterations,
+                close_all_step_delay_seconds=config.close_all_step_delay_seconds,
+                close_all_timeout_seconds=config.close_all_timeout_seconds,
+                window_backend=backend,
+            )
+            started = time.perf_counter()
+            ok = executor.execute(GestureAction.CLOSE_ALL_APPS)
+            _report("batched", backend, apps, time.perf_counter() - started, "" if ok else executor.last_error or "failed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from hand_gesture.effects import EffectEngine, finger_state_modes, overlay_modes
+
+
+def _legacy_finger_state(image, finger_count: int):
+    # The per-frame code the color-classification script used to run.
+    if finger_count == 1:
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        return cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
+    hue = {2: 140, 3: 10, 4: 25}.get(finger_count)
+    if hue is None:
+        return image
+    hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+    h, s, v = cv2.split(hsv)
+    h[:] = hue
+    hsv = cv2.merge([h, s, v])
+    return cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
+
+
+def _legacy_overlay(image, finger_count: int):
+    colors = {1: (255, 220, 160), 2: (180, 255, 220), 3: (170, 235, 255)}
+    color = colors.get(finger_count, (210, 210, 255) if finger_count >= 4 else (200, 200, 200))
+    overlay = image.copy()
+    cv2.rectangle(overlay, (0, 0), (image.shape[1], image.shape[0]), color, -1)
+    return cv2.addWeighted(overlay, 0.08, image, 0.92, 0)
+
+
+def _legacy_round_trip(image):
+    rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    return cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+
+
+def _shared_round_trip(image):
+    cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    return image
+
+
+def _time(fn, frame, repeats: int) -> float:
+    # Each call gets a fresh copy, as a camera frame would be; the copy is
+    # timed separately and subtracted.
+    work = frame.copy()
+    fn(work)
+    started = time.perf_counter()
+    for _ in range(repeats):
+        np.copyto(work, frame)
+        fn(work)
+    total = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(repeats):
+        np.copyto(work, frame)
+    return (total - (time.perf_counter() - started)) / repeats
+
+
+def _synthetic_frame(width: int, height: int) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    noise = (rng.random((height // 8, width // 8, 3)) * 255).astype(np.uint8)
+    return cv2.GaussianBlur(cv2.resize(noise, (width, height), interpolation=cv2.INTER_CUBIC), (0, 0), 2)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Time each color effect mode before and after the LUT/channel-transform engine.")
+    parser.add_argument("--image", help="Frame to use; a synthetic 1280x720 frame is used when omitted.")
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    frame = cv2.imread(args.image) if args.image else _synthetic_frame(1280, 720)
+    if frame is None:
+        print(f"Could not read {args.image}")
+        return 1
+    height, width = frame.shape[:2]
+    print(f"{width}x{height}, {args.repeats} repeats, OpenCV {cv2.__version__}, {cv2.getNumThreads()} threads")
+    print(f"{'mode':<24} {'before_ms':>9} {'after_ms':>8} {'speedup':>7} {'max_diff':>8}")
+
+    rows = []
+    finger_engine = EffectEngine(finger_state_modes())
+    for count in (0, 1, 2, 3, 4):
+        label = finger_engine.mode_for(count).label
+        rows.append((f"finger {count} {label}", lambda image, c=count: _legacy_finger_state(image, c), lambda image, c=count: finger_engine.apply(image, c)[0]))
+    modes = overlay_modes()
+    overlay_engine = EffectEngine(modes, default=modes[0])
+    for count in (0, 2, 4):
+        label = overlay_engine.mode_for(count).label
+        rows.append((f"overlay {count} {label}", lambda image, c=count: _legacy_overlay(image, c), lambda image, c=count: overlay_engine.apply(image, c)[0]))
+    rows.append(("vision bgr/rgb", _legacy_round_trip, _shared_round_trip))
+
+    for label, before, after in rows:
+        before_ms = max(_time(before, frame, args.repeats) * 1000.0, 0.0)
+        after_ms = max(_time(after, frame, args.repeats) * 1000.0, 0.0)
+        diff = int(np.abs(before(frame.copy()).astype(np.int16) - after(frame.copy()).astype(np.int16)).max())
+        # Pass-through modes cost nothing either way; a ratio would be noise.
+        speedup = f"{before_ms / after_ms:6.1f}x" if min(before_ms, after_ms) > 0.05 else f"{'-':>7}"
+        print(f"{label:<24} {before_ms:9.3f} {after_ms:8.3f} {speedup} {diff:8d}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
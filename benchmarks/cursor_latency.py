@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from hand_gesture.cursor import PredictiveCursor
+
+Point = Tuple[float, float]
+
+
+def _min_jerk(start: Point, end: Point, duration: float) -> Callable[[float], Point]:
+    def position(t: float) -> Point:
+        s = min(max(t / duration, 0.0), 1.0)
+        blend = 10 * s ** 3 - 15 * s ** 4 + 6 * s ** 5
+        return (start[0] + (end[0] - start[0]) * blend, start[1] + (end[1] - start[1]) * blend)
+
+    return position
+
+
+def build_trajectory() -> Tuple[Callable[[float], Point], List[Tuple[float, float]], float]:
+    # Rests and strokes across a 1920x1080 screen; returns the position
+    # function, the rest intervals and the total duration.
+    segments: List[Tuple[float, Callable[[float], Point], bool]] = []
+    position = (400.0, 500.0)
+    rng = random.Random(11)
+    for _ in range(8):
+        segments.append((0.8, (lambda p: lambda t: p)(position), True))
+        target = (rng.uniform(200, 1700), rng.uniform(150, 950))
+        duration = rng.uniform(0.35, 0.8)
+        segments.append((duration, _min_jerk(position, target, duration), False))
+        position = target
+    segments.append((0.8, (lambda p: lambda t: p)(position), True))
+
+    starts = []
+    rests = []
+    t = 0.0
+    for duration, _, resting in segments:
+        starts.append(t)
+        if resting:
+            rests.append((t, t + duration))
+        t += duration
+
+    def trajectory(time_s: float) -> Point:
+        for start, (duration, fn, _) in zip(starts, segments):
+            if time_s < start + duration:
+                return fn(time_s - start)
+        return segments[-1][1](0.0)
+
+    return trajectory, rests, t
+
+
+def _evaluate(samples: List[Tuple[float, Point]], trajectory, rests, duration: float):
+    times = np.arange(0.5, duration, 0.001)
+    cursor = np.zeros((len(times), 2))
+    idx = 0
+    current = samples[0][1]
+    for row, t in enumerate(times):
+        while idx < len(samples) and samples[idx][0] <= t:
+            current = samples[idx][1]
+            idx += 1
+        cursor[row] = current
+    truth = np.array([trajectory(t) for t in times])
+    moving = np.ones(len(times), dtype=bool)
+    settled = np.zeros(len(times), dtype=bool)
+    spreads = []
+    for start, end in rests:
+        moving &= ~((times >= start) & (times < end))
+        window = (times >= start + 0.25) & (times < end)
+        settled |= window
+        if np.any(window):
+            spreads.append(np.sqrt(np.mean(np.var(cursor[window], axis=0))))
+
+    best_lag, best_error = 0.0, float("inf")
+    for lag_ms in range(0, 301, 2):
+        shifted = np.array([trajectory(t - lag_ms / 1000.0) for t in times[moving]])
+        error = float(np.sqrt(np.mean(np.sum((cursor[moving] - shifted) ** 2, axis=1))))
+        if error < best_error:
+            best_lag, best_error = lag_ms, error
+    rms = float(np.sqrt(np.mean(np.sum((cursor - truth) ** 2, axis=1))))
+    # Jitter: cursor travel per second while the hand rests and the cursor
+    # has had time to settle.
+    steps = np.linalg.norm(np.diff(cursor, axis=0), axis=1)[settled[1:] & settled[:-1]]
+    jitter = float(np.sum(steps) / max(np.sum(settled) / 1000.0, 1e-9))
+    return best_lag, rms, jitter, float(np.mean(spreads))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Simulate pointer latency and jitter of the per-frame EMA cursor vs the predictive cursor.")
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--latency-ms", type=float, default=60.0, help="Capture-to-landmark pipeline latency.")
+    parser.add_argument("--timestamp-ms", type=float, default=15.0, help="Delay from exposure to the frame timestamp.")
+    parser.add_argument("--noise-px", type=float, default=3.0, help="Fingertip noise in screen pixels.")
+    parser.add_argument("--rate", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    trajectory, rests, duration = build_trajectory()
+    rng = np.random.default_rng(args.seed)
+    frames = []
+    t = 0.0
+    while t < duration:
+        point = trajectory(t)
+        noisy = (point[0] + rng.normal(0, args.noise_px), point[1] + rng.normal(0, args.noise_px))
+        frames.append((t + args.latency_ms / 1000.0, t + args.timestamp_ms / 1000.0, noisy))
+        t += 1.0 / args.fps
+
+    # Before: main.py's EMA (alpha 0.28) applied once per processed frame.
+    ema_samples: List[Tuple[float, Point]] = []
+    smoothed = None
+    for available, _, point in frames:
+        if smoothed is None:
+            smoothed = point
+        else:
+            smoothed = (smoothed[0] * 0.72 + point[0] * 0.28, smoothed[1] * 0.72 + point[1] * 0.28)
+        ema_samples.append((available, smoothed))
+
+    # After: the predictive cursor fed the same frames, ticking at --rate.
+    results = {}
+    for lead_ms in (0.0, args.latency_ms - args.timestamp_ms):
+        predicted_samples: List[Tuple[float, Point]] = []
+        clock = [0.0]
+        cursor = PredictiveCursor(
+            move=lambda x, y: predicted_samples.append((clock[0], (x, y))),
+            rate_hz=args.rate,
+            lead_seconds=lead_ms / 1000.0,
+            clock=lambda: clock[0],
+        )
+        frame_idx = 0
+        tick = 0.0
+        while tick < duration:
+            while frame_idx < len(frames) and frames[frame_idx][0] <= tick:
+                cursor.update(frames[frame_idx][2], frames[frame_idx][1])
+                frame_idx += 1
+            clock[0] = tick
+            cursor.step(tick)
+            tick += 1.0 / args.rate
+        results[lead_ms] = predicted_samples
+
+    print(f"{args.fps:.0f} FPS camera, {args.latency_ms:.0f} ms pipeline latency, {args.noise_px:.1f} px fingertip noise")
+    print(f"{'cursor':<28} {'updates/s':>9} {'lag_ms':>7} {'rms_px':>7} {'jitter_px/s':>11} {'rest_sd_px':>10}")
+    rows = [("ema per frame (before)", ema_samples, args.fps)]
+    for lead_ms, samples in results.items():
+        rows.append((f"kalman {args.rate:.0f} Hz lead {lead_ms:.0f} ms", samples, len(samples) / duration))
+    for label, samples, rate in rows:
+        lag, rms, jitter, spread = _evaluate(samples, trajectory, rests, duration)
+        print(f"{label:<28} {rate:9.1f} {lag:7.0f} {rms:7.1f} {jitter:11.1f} {spread:10.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import sys
+import time
+from typing import List, Optional, Tuple
+
+from hand_gesture.dynamic import (
+    DynamicGestureEngine,
+    MotionTemplate,
+    circle_template,
+    default_templates,
+    swipe_template,
+)
+from hand_gesture.gestures import GestureAction, HandInfo
+
+_SWIPE_BY_QUADRANT = (
+    GestureAction.SWIPE_RIGHT,
+    GestureAction.SWIPE_DOWN,
+    GestureAction.SWIPE_LEFT,
+    GestureAction.SWIPE_UP,
+)
+
+
+def build_library(count: int) -> List[MotionTemplate]:
+    templates = default_templates()
+    if count <= len(templates):
+        return templates
+    count -= len(templates)
+    swipe_angles = max(4, count // 2)
+    for idx in range(swipe_angles):
+        angle = 360.0 * idx / swipe_angles
+        action = _SWIPE_BY_QUADRANT[int(((angle + 45.0) % 360.0) // 90.0)]
+        templates.append(swipe_template(action, angle, points=8 + idx % 3))
+    circle_starts = max(1, (count - len(templates)) // 2)
+    for idx in range(circle_starts):
+        start = 360.0 * idx / circle_starts
+        templates.append(circle_template(GestureAction.CIRCLE_CLOCKWISE, True, start, points=14 + idx % 4))
+        templates.append(circle_template(GestureAction.CIRCLE_COUNTERCLOCKWISE, False, start, points=14 + idx % 4))
+    return templates
+
+
+def _hand(x: float, y: float, palm_scale: float = 0.1) -> HandInfo:
+    return HandInfo(
+        finger_state=(1, 1, 1, 1, 1),
+        finger_count=5,
+        index_tip=(x, y - palm_scale),
+        palm_center=(x, y),
+        bounding_box_area=0.05,
+        palm_scale=palm_scale,
+        hand_label="Right",
+        finger_spread=0.3,
+        thumb_is_vertical=False,
+    )
+
+
+def synthetic_stream(fps: float, seed: int) -> Tuple[List[Tuple[float, HandInfo]], List[GestureAction]]:
+    rng = random.Random(seed)
+    frames: List[Tuple[float, HandInfo]] = []
+    expected: List[GestureAction] = []
+    t = 0.0
+    x, y = 0.5, 0.5
+
+    def emit(px: float, py: float) -> None:
+        nonlocal t
+        frames.append((t, _hand(px + rng.gauss(0, 0.002), py + rng.gauss(0, 0.002))))
+        t += 1.0 / fps
+
+    def idle(seconds: float) -> None:
+        for _ in range(int(seconds * fps)):
+            emit(x, y)
+
+    for _ in range(20):
+        idle(0.6)
+        kind = rng.choice(("right", "left", "up", "down", "cw", "ccw"))
+        duration = rng.uniform(0.3, 0.6)
+        steps = int(duration * fps)
+        if kind in ("right", "left", "up", "down"):
+            dx, dy = {"right": (1, 0), "left": (-1, 0), "up": (0, -1), "down": (0, 1)}[kind]
+            for i in range(1, steps + 1):
+                emit(x + dx * 0.25 * i / steps, y + dy * 0.25 * i / steps)
+            x, y = x + dx * 0.25, y + dy * 0.25
+            expected.append(
+                {
+                    "right": GestureAction.SWIPE_RIGHT,
+                    "left": GestureAction.SWIPE_LEFT,
+                    "up": GestureAction.SWIPE_UP,
+                    "down": GestureAction.SWIPE_DOWN,
+                }[kind]
+            )
+        else:
+            sign = 1.0 if kind == "cw" else -1.0
+            radius = 0.08
+            start = rng.uniform(0.0, 2.0 * math.pi)
+            cx, cy = x - radius * math.cos(start), y - radius * math.sin(start)
+            for i in range(1, steps + 1):
+                angle = start + sign * 2.0 * math.pi * i / steps
+                emit(cx + radius * math.cos(angle), cy + radius * math.sin(angle))
+            expected.append(
+                GestureAction.CIRCLE_CLOCKWISE if kind == "cw" else GestureAction.CIRCLE_COUNTERCLOCKWISE
+            )
+    idle(0.6)
+    return frames, expected
+
+
+# (label, pruning, group_degrees): no pruning, early abandoning alone, and
+# abandoning with near-duplicate templates sharing a lower-bound column.
+MODES = (("none", False, 0.0), ("abandon", True, 0.0), ("grouped", True, 30.0))
+
+
+def run(templates: List[MotionTemplate], frames, pruning: bool, group_degrees: float):
+    engine = DynamicGestureEngine(templates=templates, pruning=pruning, cooldown_seconds=0.3, group_degrees=group_degrees)
+    timings: List[float] = []
+    matches: List[Tuple[float, Optional[GestureAction]]] = []
+    for timestamp, hand in frames:
+        started = time.perf_counter()
+        action = engine.update(hand, timestamp)
+        timings.append(time.perf_counter() - started)
+        if action is not None:
+            matches.append((timestamp, action))
+    return timings, matches, engine
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the streaming DTW motion-gesture engine.")
+    parser.add_argument("--templates", type=int, nargs="+", default=[12, 120, 480])
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    frames, expected = synthetic_stream(args.fps, args.seed)
+    print(f"{len(frames)} frames, {len(expected)} scripted gestures")
+    print(f"{'templates':>9} {'mode':>8} {'columns':>7} {'mean_us':>8} {'p99_us':>8} {'max_us':>8} {'cells/step':>10} {'recall':>7}")
+    ok = True
+    for count in args.templates:
+        templates = build_library(count)
+        results = {}
+        for label, pruning, group_degrees in MODES:
+            timings, matches, engine = run(templates, frames, pruning, group_degrees)
+            ordered = sorted(timings)
+            recognised = [action for _, action in matches]
+            hits = sum(1 for want, got in zip(expected, recognised) if want == got)
+            recall = hits / len(expected) if len(recognised) == len(expected) else 0.0
+            results[label] = matches
+            print(
+                f"{len(templates):9d} {label:>8} {engine.groups:7d} {sum(timings) / len(timings) * 1e6:8.1f} "
+                f"{ordered[int(len(ordered) * 0.99)] * 1e6:8.1f} {ordered[-1] * 1e6:8.1f} "
+                f"{engine.cells_updated / max(engine.steps_processed, 1):10.1f} {recall:7.0%}"
+            )
+        if any(matches != results["none"] for matches in results.values()):
+            print("FAIL: pruning changed the matches")
+            ok = False
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import argparse
+import math
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from benchmarks.pose_templates import _pose_points
+from hand_gesture.config import RuntimeConfig
+from hand_gesture.gestures import extract_hand_info
+from hand_gesture.recognizer import hand_infos_from_landmarks, iter_hand_events, process_many
+
+# Curl per finger (thumb first) for the poses the stream cycles through.
+_POSES = (
+    (0.0, 0.0, 0.0, 0.0, 0.0),
+    (1.4, 1.4, 1.4, 1.4, 1.4),
+    (1.4, 0.0, 1.4, 1.4, 1.4),
+    (1.4, 0.0, 0.0, 1.4, 1.4),
+    (0.0, 1.4, 1.4, 1.4, 1.4),
+    (1.4, 0.0, 0.0, 0.0, 1.4),
+)
+
+
+def synthetic_stream(frames: int, fps: float, seed: int):
+    # Each pose is held for about a second with landmark jitter and drift;
+    # one frame in 40 has no hand (all-NaN row).
+    rng = np.random.default_rng(seed)
+    shapes = [np.array(_pose_points(curls)) for curls in _POSES]
+    hold = int(fps)
+    landmarks = np.empty((frames, 21, 3))
+    for idx in range(frames):
+        shape = shapes[(idx // hold) % len(shapes)]
+        angle = math.radians(10.0 * math.sin(idx / 45.0))
+        rotation = np.array([[math.cos(angle), -math.sin(angle)], [math.sin(angle), math.cos(angle)]])
+        origin = np.array([0.5 + 0.1 * math.sin(idx / 70.0), 0.7])
+        landmarks[idx, :, :2] = origin + 0.12 * shape @ rotation.T + rng.normal(0.0, 0.002, (21, 2))
+        landmarks[idx, :, 2] = rng.normal(0.0, 0.01, 21)
+        if idx % 40 == 39:
+            landmarks[idx] = np.nan
+    return np.arange(frames) / fps, landmarks
+
+
+def _fresh_import_modules() -> str:
+    code = (
+        "import sys, hand_gesture.recognizer; "
+        "print(','.join(m for m in ('cv2', 'mediapipe', 'pyautogui') if m in sys.modules) or 'none')"
+    )
+    return subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.strip()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare per-frame iter_hand_events with batched process_many on synthetic landmarks.")
+    parser.add_argument("--frames", type=int, default=20000)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    timestamps, landmarks = synthetic_stream(args.frames, args.fps, args.seed)
+    config = RuntimeConfig(dynamic_gestures_enabled=True)
+
+    started = time.perf_counter()
+    reference = [
+        None if np.isnan(row).any() else extract_hand_info(SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y) for x, y, _ in row]), "Right")
+        for row in landmarks.tolist()
+    ]
+    scalar_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    batched = hand_infos_from_landmarks(landmarks, "Right")
+    vector_seconds = time.perf_counter() - started
+    mismatched_infos = sum(1 for a, b in zip(reference, batched) if a != b)
+
+    started = time.perf_counter()
+    streamed = list(iter_hand_events(zip(timestamps.tolist(), landmarks), config=config, hand_label="Right"))
+    stream_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    many = process_many(landmarks, timestamps, hand_labels="Right", config=config)
+    many_seconds = time.perf_counter() - started
+    mismatched_events = sum(1 for a, b in zip(streamed, many) if a != b)
+    decisions = sum(len(event.decisions) for event in many)
+
+    print(f"{args.frames} frames, {decisions} decisions, modules loaded by importing hand_gesture.recognizer: {_fresh_import_modules()}")
+    print(f"{'stage':<36} {'frames/s':>10} {'us/frame':>9}")
+    for label, seconds in (
+        ("extract_hand_info per frame", scalar_seconds),
+        ("hand_infos_from_landmarks batch", vector_seconds),
+        ("iter_hand_events (landmark arrays)", stream_seconds),
+        ("process_many", many_seconds),
+    ):
+        print(f"{label:<36} {args.frames / seconds:10.0f} {seconds / args.frames * 1e6:9.1f}")
+    print(f"HandInfo mismatches: {mismatched_infos}, event mismatches: {mismatched_events}")
+    return 0 if mismatched_infos == 0 and mismatched_events == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, Tuple
+
+import cv2
+import numpy as np
+
+from hand_gesture.filesource import FileFrameSource
+
+
+def _write_fixtures(directory: str, frames: int, fps: float, size: Tuple[int, int]) -> Tuple[str, str]:
+    # A moving gradient with noise, so the encoder cannot make every frame
+    # trivially cheap to decode.
+    width, height = size
+    rng = np.random.default_rng(0)
+    video_path = os.path.join(directory, "fixture.mp4")
+    writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    for index in range(frames):
+        row = (x + index * 4) % 256
+        frame = np.repeat(np.repeat(row[np.newaxis, :, np.newaxis], height, axis=0), 3, axis=2)
+        frame = (frame + rng.normal(0.0, 12.0, frame.shape)).clip(0, 255).astype(np.uint8)
+        writer.write(frame)
+        cv2.imwrite(os.path.join(directory, f"frame_{index:05d}.jpg"), frame)
+    writer.release()
+    return video_path, os.path.join(directory, "frame_*.jpg")
+
+
+def _work(milliseconds: float) -> Callable[[np.ndarray], None]:
+    # Stands in for inference and drawing: a fixed amount of per-frame time.
+    def run(frame: np.ndarray) -> None:
+        deadline = time.perf_counter() + milliseconds / 1000.0
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        while time.perf_counter() < deadline:
+            time.sleep(0.0005)
+
+    return run
+
+
+def _synchronous(path: str, work: Callable[[np.ndarray], None]) -> Tuple[int, float]:
+    cap = cv2.VideoCapture(path)
+    frames = 0
+    started = time.perf_counter()
+    while True:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        work(frame)
+        frames += 1
+    cap.release()
+    return frames, time.perf_counter() - started
+
+
+def _source(path: str, mode: str, fps: float, work: Callable[[np.ndarray], None]) -> Tuple[FileFrameSource, float]:
+    source = FileFrameSource(path, mode=mode, fps=fps)
+    started = time.perf_counter()
+    while source.isOpened():
+        ok, frame = source.read()
+        if ok:
+            work(frame)
+    seconds = time.perf_counter() - started
+    source.release()
+    return source, seconds
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure FileFrameSource throughput in fast mode and timing in paced mode.")
+    parser.add_argument("--frames", type=int, default=150)
+    parser.add_argument("--fps", type=float, default=30.0, help="Frame rate of the generated fixtures.")
+    parser.add_argument("--work-ms", type=float, nargs="+", default=[0.0, 8.0, 45.0], help="Simulated per-frame processing time.")
+    args = parser.parse_args()
+    logging.getLogger("hand_gesture.filesource").setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as directory:
+        video_path, image_glob = _write_fixtures(directory, args.frames, args.fps, (640, 480))
+        print(f"{args.frames} frames at {args.fps:g} fps, 640x480 (mp4v video and JPEG sequence)")
+        print(f"{'source':<8} {'reader':<22} {'work_ms':>7} {'fps':>8} {'frames':>7} {'dropped':>7} {'decode_fps':>10} {'wait_ms':>8}")
+        for work_ms in args.work_ms:
+            work = _work(work_ms)
+            frames, seconds = _synchronous(video_path, work)
+            print(f"{'video':<8} {'VideoCapture.read':<22} {work_ms:7.1f} {frames / seconds:8.1f} {frames:7d}")
+            for name, path in (("video", video_path), ("images", image_glob)):
+                for mode in ("fast", "paced"):
+                    source, seconds = _source(path, mode, args.fps, work)
+                    stats = source.stats()
+                    print(
+                        f"{name:<8} {f'FileFrameSource {mode}':<22} {work_ms:7.1f} {stats.frames / seconds:8.1f} "
+                        f"{stats.frames:7d} {stats.dropped_frames:7d} {stats.decode_fps:10.1f} {stats.wait_ms_per_frame:8.2f}"
+                    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from types import SimpleNamespace
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from hand_gesture.config import RuntimeConfig
+from hand_gesture.flight import FlightRecorder
+from hand_gesture.gestures import HandInfo, extract_hand_info
+from hand_gesture.recognizer import GestureRecognizer
+from hand_gesture.replay import SessionFrame, load_session, replay_session
+
+# Open palm and fist landmark sets (wrist, then four points per finger),
+# enough to flip finger states back and forth.
+_OPEN = (
+    [(0.5, 0.8)]
+    + [(0.45 - 0.05 * j, 0.75 - 0.03 * j) for j in range(4)]
+    + [(0.35 + 0.07 * f, 0.7 - 0.08 * j) for f in range(1, 5) for j in range(4)]
+)
+_FIST = [(0.5, 0.8)] + [(0.38 + 0.06 * f, 0.68 - 0.02 * j + 0.05 * (j == 3)) for f in range(5) for j in range(4)]
+
+
+def _session(frames: int, fps: float) -> List[SessionFrame]:
+    # Hand present most of the time, alternating poses in 2 s blocks and
+    # drifting slightly, so votes, holds and steadiness all move.
+    rng = np.random.default_rng(0)
+    session: List[SessionFrame] = []
+    for index in range(frames):
+        timestamp = index / fps
+        if (index // int(fps * 2)) % 4 == 3:
+            session.append(SessionFrame(timestamp, None))
+            continue
+        base = _OPEN if (index // int(fps * 2)) % 2 == 0 else _FIST
+        dx, dy = (float(value) for value in rng.normal(0.0, 0.002, 2))
+        points = [SimpleNamespace(x=x + dx, y=y + dy) for x, y in base]
+        session.append(SessionFrame(timestamp, extract_hand_info(SimpleNamespace(landmark=points), "Right")))
+    return session
+
+
+def _loop(session: List[SessionFrame], config: RuntimeConfig, observe: Optional[Callable[..., None]]) -> float:
+    # The controller's per-frame decision path with the observer where the
+    # flight recorder (or the DEBUG line) sits; returns seconds spent.
+    recognizer = GestureRecognizer.from_config(config)
+    executor = recognizer.executor
+    started = time.perf_counter()
+    for frame in session:
+        hand_info: Optional[HandInfo] = frame.hand_info
+        votes = Counter(item for _, item in recognizer.stabilizer.action_history if item is not None)
+        event = recognizer.update(frame.timestamp, hand_info)
+        decision = event.decisions[-1] if event.decisions else None
+        if observe is not None:
+            observe(frame, hand_info, event.action, recognizer.stabilizer, votes, decision, executor)
+    return time.perf_counter() - started
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure flight recorder cost per frame and check that its dumps replay like the original session.")
+    parser.add_argument("--frames", type=int, default=30000)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--seconds", type=float, default=10.0, help="Flight recorder window.")
+    args = parser.parse_args()
+
+    config = RuntimeConfig(flight_recorder_seconds=args.seconds)
+    session = _session(args.frames, args.fps)
+    with tempfile.TemporaryDirectory() as directory:
+        recorder = FlightRecorder(args.seconds, args.fps, directory, config)
+
+        def record(frame, hand_info, action, stabilizer, votes, decision, executor) -> None:
+            recorder.record(
+                frame.timestamp,
+                hand_info,
+                action,
+                stabilizer.candidate_action,
+                decision,
+                votes.items(),
+                hold_seconds=stabilizer.hold_seconds,
+                steady_seconds=stabilizer.steady_seconds,
+                task_view_active=executor.task_view_active,
+                target_window=None,
+                status="Ready",
+                error=executor.last_error,
+            )
+
+        debug_logger = logging.getLogger("benchmarks.flight_recorder.debug")
+        handler = logging.FileHandler(os.path.join(directory, "debug.log"))
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        debug_logger.addHandler(handler)
+        debug_logger.setLevel(logging.DEBUG)
+        debug_logger.propagate = False
+
+        def log_debug(frame, hand_info, action, stabilizer, votes, decision, executor) -> None:
+            # The controller's per-frame DEBUG line.
+            debug_logger.debug(
+                "Frame %d: finger_count=%d finger_state=%s mapped_action=%s steady_seconds=%.3f vote_snapshot=%s task_view_active=%s",
+                0,
+                hand_info.finger_count if hand_info else 0,
+                hand_info.finger_state if hand_info else None,
+                action.value if action else None,
+                stabilizer.steady_seconds,
+                {key.value: value for key, value in votes.items()},
+                executor.task_view_active,
+            )
+
+        baseline = _loop(session, config, None)
+        recorded = _loop(session, config, record)
+        logged = _loop(session, config, log_debug)
+        handler.close()
+        log_bytes = os.path.getsize(os.path.join(directory, "debug.log"))
+        per_frame = 1e6 / len(session)
+        print(f"{len(session)} frames at {args.fps:g} fps, {args.seconds:g} s window ({recorder.capacity} slots)")
+        print(f"{'observer':<22} {'us/frame':>9} {'overhead_us':>12}")
+        print(f"{'none':<22} {baseline * per_frame:9.2f} {0.0:12.2f}")
+        print(f"{'flight recorder':<22} {recorded * per_frame:9.2f} {(recorded - baseline) * per_frame:12.2f}")
+        print(f"{'DEBUG log to file':<22} {logged * per_frame:9.2f} {(logged - baseline) * per_frame:12.2f}")
+        print(f"DEBUG log: {log_bytes / len(session):.0f} bytes/frame")
+
+        started = time.perf_counter()
+        path = recorder.dump("benchmark")
+        snapshot_ms = (time.perf_counter() - started) * 1000.0
+        recorder.close()
+        size = os.path.getsize(path)
+        loaded = load_session(path)
+        window = session[-len(loaded):]
+        hands_match = all(a.hand_info == b.hand_info and a.timestamp == b.timestamp for a, b in zip(loaded, window))
+        replayed = [(item.timestamp, item.action) for item in replay_session(loaded, config)]
+        expected = [(item.timestamp, item.action) for item in replay_session(window, config)]
+        print(
+            f"dump: {len(loaded)} frames, {size / 1024:.1f} KiB ({size / max(len(loaded), 1):.0f} bytes/frame), "
+            f"{snapshot_ms:.2f} ms on the loop thread"
+        )
+        print(f"round trip: HandInfo identical={hands_match}, replayed decisions identical={replayed == expected} ({len(replayed)})")
+    return 0 if hands_match and replayed == expected else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
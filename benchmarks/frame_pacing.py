@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from hand_gesture.config import RuntimeConfig
+from hand_gesture.pacing import FramePacer, effective_target_fps
+
+
+class _Camera:
+    # Blocking read that returns the newest frame at a fixed sensor rate,
+    # like CameraCapture with stale-frame draining.
+    def __init__(self, fps: float, frame: np.ndarray):
+        self.period = 1.0 / fps
+        self.frame = frame
+        self.origin = time.perf_counter()
+
+    def read(self):
+        now = time.perf_counter()
+        ticks = int((now - self.origin) / self.period) + 1
+        time.sleep(max(self.origin + ticks * self.period - now, 0.0))
+        return True, self.frame
+
+
+def _work(frame: np.ndarray) -> None:
+    # Roughly the per-frame OpenCV cost of the loop around MediaPipe:
+    # colour conversion, a blur for the effects and the window resize.
+    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    blurred = cv2.GaussianBlur(rgb, (9, 9), 0)
+    cv2.resize(blurred, (1280, 960))
+
+
+def _run(label: str, seconds: float, camera_fps: float, pacer: FramePacer, busy_poll_fps: float = 0.0, threads: int = -1) -> None:
+    previous_threads = cv2.getNumThreads()
+    if threads >= 0:
+        cv2.setNumThreads(threads)
+    frame = np.random.default_rng(0).integers(0, 255, (480, 640, 3), dtype=np.uint8)
+    camera = _Camera(camera_fps, frame)
+    deadline = time.perf_counter()
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        if busy_poll_fps > 0:
+            deadline += 1.0 / busy_poll_fps
+            while time.perf_counter() < deadline:
+                pass
+        pacer.wait()
+        ok, image = camera.read()
+        _work(image)
+    wall = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+    cv2.setNumThreads(previous_threads)
+    stats = pacer.stats()
+    print(
+        f"{label:<34} {stats.achieved_fps:8.1f} {stats.jitter_ms:10.2f} "
+        f"{cpu / max(pacer.frames, 1) * 1000.0:10.2f} {cpu / wall:8.0%}"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare unpaced, busy-polled and FramePacer loops on a simulated camera.")
+    parser.add_argument("--seconds", type=float, default=4.0, help="Length of each run.")
+    parser.add_argument("--camera-fps", type=float, default=60.0, help="Rate the simulated camera actually delivers.")
+    parser.add_argument("--target-fps", type=float, default=30.0)
+    args = parser.parse_args()
+
+    saver = RuntimeConfig(target_fps=args.target_fps, power_profile="power_saver")
+    print(f"camera delivers {args.camera_fps:g} fps, OpenCV threads by default: {cv2.getNumThreads()}")
+    print(f"{'loop':<34} {'fps':>8} {'jitter_ms':>10} {'cpu_ms/fr':>10} {'cpu':>8}")
+    _run("unpaced (camera rate)", args.seconds, args.camera_fps, FramePacer(0.0))
+    _run(f"busy-poll {args.target_fps:g} fps", args.seconds, args.camera_fps, FramePacer(0.0), busy_poll_fps=args.target_fps)
+    _run(f"FramePacer {args.target_fps:g} fps", args.seconds, args.camera_fps, FramePacer(args.target_fps))
+    _run(
+        f"power_saver {effective_target_fps(saver):g} fps, {saver.power_saver_opencv_threads} thread",
+        args.seconds,
+        args.camera_fps,
+        FramePacer.from_config(saver),
+        threads=saver.power_saver_opencv_threads,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, List, Optional
+
+import cv2
+import numpy as np
+
+from hand_gesture.pacing import FramePacer
+from hand_gesture.recording import FrameRecorder, frame_record
+from hand_gesture.replay import load_session
+
+
+def _frame_work(frame: np.ndarray, index: int, work_ms: float) -> None:
+    # CPU-bound stand-in for inference plus the overlay drawn in place.
+    deadline = time.perf_counter() + work_ms / 1000.0
+    while time.perf_counter() < deadline:
+        cv2.GaussianBlur(frame[:120, :160], (7, 7), 0)
+    frame[:] = (index * 3) % 255
+    cv2.putText(frame, f"frame {index}", (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255, 255, 255), 2)
+    cv2.rectangle(frame, (100 + index % 300, 200), (220 + index % 300, 320), (0, 200, 255), 3)
+
+
+def _loop(frames: int, fps: float, work_ms: float, record: Optional[Callable[[float, np.ndarray], None]]) -> List[float]:
+    # Busy time per frame, excluding the pacer's sleep: the part recording
+    # could slow down.
+    pacer = FramePacer(fps)
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    busy: List[float] = []
+    for index in range(frames):
+        pacer.wait()
+        started = time.perf_counter()
+        _frame_work(frame, index, work_ms)
+        if record is not None:
+            record(time.time(), frame)
+        busy.append(time.perf_counter() - started)
+    return busy
+
+
+def _row(label: str, busy: List[float], written: int, dropped: int) -> None:
+    values = np.asarray(busy) * 1000.0
+    print(f"{label:<26} {values.mean():8.2f} {np.percentile(values, 95):8.2f} {values.max():8.2f} {written:8d} {dropped:8d}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure the frame-loop overhead of the asynchronous frame recorder.")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--work-ms", type=float, default=12.0, help="Simulated per-frame processing time.")
+    parser.add_argument("--fps", type=float, nargs="+", default=[30.0, 0.0], help="Loop rates; 0 runs unpaced to force back-pressure.")
+    parser.add_argument("--queue-size", type=int, default=8)
+    args = parser.parse_args()
+    logging.getLogger("hand_gesture.recording").setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for fps in args.fps:
+            print(f"loop {'unpaced' if fps <= 0 else f'{fps:g} fps'}, {args.frames} frames of 640x480, {args.work_ms:g} ms work")
+            print(f"{'recording':<26} {'mean_ms':>8} {'p95_ms':>8} {'max_ms':>8} {'written':>8} {'dropped':>8}")
+            _row("off", _loop(args.frames, fps, args.work_ms, None), 0, 0)
+
+            path = os.path.join(directory, "sync.mp4")
+            writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps or 30.0, (640, 480))
+            busy = _loop(args.frames, fps, args.work_ms, lambda timestamp, frame: writer.write(frame))
+            writer.release()
+            _row("VideoWriter in the loop", busy, args.frames, 0)
+
+            path = os.path.join(directory, "async.mp4")
+            recorder = FrameRecorder(path, fps=fps or 30.0, queue_size=args.queue_size)
+            busy = _loop(
+                args.frames,
+                fps,
+                args.work_ms,
+                lambda timestamp, frame: recorder.submit(timestamp, frame, frame_record(None, None, status="ok")),
+            )
+            recorder.close()
+            _row(f"FrameRecorder (queue {args.queue_size})", busy, recorder.written, recorder.dropped)
+            sidecar = load_session(recorder.sidecar_path)
+            video = cv2.VideoCapture(path)
+            video_frames = int(video.get(cv2.CAP_PROP_FRAME_COUNT))
+            video.release()
+            print(f"  sidecar: {len(sidecar)} lines, video: {video_frames} frames")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
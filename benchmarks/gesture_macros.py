@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from typing import List, Optional, Sequence, Tuple
+
+from hand_gesture.gestures import MOTION_ACTIONS, GestureAction
+from hand_gesture.macros import MacroRecognizer, MacroSpec
+
+STATIC_ACTIONS = tuple(action for action in GestureAction if action not in MOTION_ACTIONS)
+
+
+def _macros(count: int, seed: int = 0) -> List[MacroSpec]:
+    # Distinct sequences of 2 to 6 stabilized gestures, mostly poses, with
+    # varied gap and total-time limits.
+    rng = random.Random(seed)
+    alphabet = list(STATIC_ACTIONS) * 3 + list(MOTION_ACTIONS)
+    seen = set()
+    macros: List[MacroSpec] = []
+    while len(macros) < count:
+        sequence = tuple(rng.choice(alphabet) for _ in range(rng.randint(2, 6)))
+        if sequence in seen:
+            continue
+        seen.add(sequence)
+        macros.append(
+            MacroSpec(
+                name=f"macro{len(macros)}",
+                sequence=sequence,
+                actions=(GestureAction.SHOW_DESKTOP,),
+                max_gap_seconds=rng.choice((0.8, 1.2, 1.5)),
+                within_seconds=rng.choice((None, 3.0, 5.0)),
+            )
+        )
+    return macros
+
+
+def _events(count: int, seed: int = 1) -> List[Tuple[GestureAction, float]]:
+    rng = random.Random(seed)
+    alphabet = list(STATIC_ACTIONS) * 3 + list(MOTION_ACTIONS)
+    timestamp = 0.0
+    events = []
+    for _ in range(count):
+        timestamp += rng.expovariate(1.0 / 0.6)
+        events.append((rng.choice(alphabet), timestamp))
+    return events
+
+
+class NaiveMatcher:
+    # Every macro checked against the recent events on every event: what a
+    # list of hand-written sequence checks amounts to. Same semantics as
+    # MacroRecognizer (longest match wins, restart after a match or a pause
+    # longer than every macro's gap).
+    def __init__(self, macros: Sequence[MacroSpec]):
+        self.macros = sorted(macros, key=lambda spec: len(spec.sequence), reverse=True)
+        self.max_gap_seconds = max(spec.max_gap_seconds for spec in macros)
+        self.actions: List[GestureAction] = []
+        self.times: List[float] = []
+
+    def feed(self, action: GestureAction, timestamp: float) -> Optional[MacroSpec]:
+        if self.times and timestamp - self.times[-1] > self.max_gap_seconds:
+            self.actions, self.times = [], []
+        self.actions.append(action)
+        self.times.append(timestamp)
+        for spec in self.macros:
+            length = len(spec.sequence)
+            if len(self.actions) < length or tuple(self.actions[-length:]) != spec.sequence:
+                continue
+            times = self.times[-length:]
+            if spec.within_seconds is not None and times[-1] - times[0] > spec.within_seconds:
+                continue
+            if any(later - earlier > spec.max_gap_seconds for earlier, later in zip(times, times[1:])):
+                continue
+            self.actions, self.times = [], []
+            return spec
+        return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Per-event cost of the macro automaton against checking every macro, as the macro count grows.")
+    parser.add_argument("--macros", type=int, nargs="+", default=[10, 100, 1000, 5000, 20000])
+    parser.add_argument("--events", type=int, default=100000)
+    parser.add_argument("--naive-events", type=int, default=5000, help="Events for the per-macro baseline, which is slow.")
+    args = parser.parse_args()
+
+    events = _events(args.events)
+    print(f"{args.events} gesture events (automaton), {args.naive_events} (per-macro baseline)")
+    print(f"{'macros':>7} {'states':>7} {'compile_ms':>10} {'auto_us':>8} {'naive_us':>9} {'matches':>8} {'agree':>6}")
+    ok = True
+    for count in args.macros:
+        macros = _macros(count)
+        started = time.perf_counter()
+        recognizer = MacroRecognizer(macros)
+        compile_ms = (time.perf_counter() - started) * 1000.0
+
+        matches = []
+        started = time.perf_counter()
+        for action, timestamp in events:
+            match = recognizer.feed(action, timestamp)
+            if match is not None:
+                matches.append((match.spec.name, timestamp))
+        auto_us = (time.perf_counter() - started) / len(events) * 1e6
+
+        naive = NaiveMatcher(macros)
+        naive_matches = []
+        prefix = events[: args.naive_events]
+        started = time.perf_counter()
+        for action, timestamp in prefix:
+            spec = naive.feed(action, timestamp)
+            if spec is not None:
+                naive_matches.append((spec.name, timestamp))
+        naive_us = (time.perf_counter() - started) / len(prefix) * 1e6
+
+        end = prefix[-1][1]
+        agree = naive_matches == [item for item in matches if item[1] <= end]
+        ok = ok and agree
+        print(
+            f"{count:7d} {recognizer.automaton.states:7d} {compile_ms:10.1f} {auto_us:8.2f} {naive_us:9.1f} "
+            f"{len(matches):8d} {str(agree):>6}"
+        )
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import sys
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.pose_templates import _pose_points
+from hand_gesture.config import RuntimeConfig
+from hand_gesture.gestures import GestureAction, HandInfo, extract_hand_info
+from hand_gesture.identity import HandTracker, hand_score
+from hand_gesture.recognizer import GestureRecognizer
+
+# Finger curls (thumb first). The gesturing right hand rests in a pose with
+# no action, then holds "three fingers"; the other hand idles in view.
+NEUTRAL = (1.4, 1.4, 0.0, 1.4, 0.0)
+GESTURE = (1.4, 0.0, 0.0, 0.0, 1.4)
+IDLE = (1.4, 1.4, 0.0, 0.0, 0.0)
+TARGET = GestureAction.MINIMIZE_TARGET_APP
+
+
+def _hand(curls, label: str, origin: Tuple[float, float], scale: float, rng: random.Random, jitter: float) -> HandInfo:
+    # A noisy detection: landmark jitter plus a few percent of box-size
+    # wobble, which is what makes two similar hands trade places.
+    scale *= 1.0 + rng.gauss(0.0, 0.03)
+    points = [
+        SimpleNamespace(x=origin[0] + scale * x + rng.gauss(0.0, jitter), y=origin[1] + scale * y + rng.gauss(0.0, jitter))
+        for x, y in _pose_points(curls)
+    ]
+    return extract_hand_info(SimpleNamespace(landmark=points), label)
+
+
+def _trial(area_ratio: float, seed: int, fps: float, rest: float, hold: float, jitter: float) -> Dict[str, Tuple[Optional[float], int]]:
+    rng = random.Random(seed)
+    config = RuntimeConfig()
+    scale_a = 0.12
+    # Size the idle hand so its mean box area is area_ratio times the gesture's.
+    area_a = _hand(GESTURE, "Right", (0.4, 0.55), scale_a, random.Random(0), 0.0).bounding_box_area
+    area_b = _hand(IDLE, "Left", (0.62, 0.6), scale_a, random.Random(0), 0.0).bounding_box_area
+    scale_b = scale_a * math.sqrt(area_ratio * area_a / area_b)
+
+    frames = []
+    for index in range(int((rest + hold) * fps)):
+        timestamp = index / fps
+        drift = 0.01 * math.sin(timestamp * 1.3)
+        candidates = [
+            (_hand(GESTURE if timestamp >= rest else NEUTRAL, "Right", (0.4 + drift, 0.55), scale_a, rng, jitter), 0.95),
+        ]
+        if timestamp >= 0.3:
+            candidates.append((_hand(IDLE, "Left", (0.62 - drift, 0.6), scale_b, rng, jitter), 0.95))
+        rng.shuffle(candidates)
+        frames.append((timestamp, candidates))
+
+    results: Dict[str, Tuple[Optional[float], int]] = {}
+
+    # Old behaviour: pick the best-scoring hand on every frame.
+    recognizer = GestureRecognizer.from_config(config)
+    latency = None
+    flips = 0
+    previous_label = None
+    for timestamp, candidates in frames:
+        hand_info = max((info for info, _ in candidates), key=hand_score)
+        if previous_label is not None and hand_info.hand_label != previous_label:
+            flips += 1
+        previous_label = hand_info.hand_label
+        event = recognizer.update(timestamp, hand_info)
+        if latency is None and timestamp >= rest and TARGET.value in event.decisions:
+            latency = timestamp - rest
+    results["per-frame best"] = (latency, flips)
+
+    # Stable IDs: one recognizer per tracked hand, decisions from the active one.
+    tracker = HandTracker.from_config(config)
+    recognizers: Dict[int, GestureRecognizer] = {}
+    latency = None
+    for timestamp, candidates in frames:
+        tracker.update(candidates, timestamp)
+        for track in tracker.visible():
+            state = recognizers.setdefault(track.hand_id, GestureRecognizer.from_config(config))
+            event = state.update(timestamp, track.hand_info)
+            if track.hand_id == tracker.active_id and latency is None and timestamp >= rest and TARGET.value in event.decisions:
+                latency = timestamp - rest
+    results["tracked IDs"] = (latency, tracker.switches)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare decision latency in two-hand scenes with per-frame hand picking and with tracked hand IDs.")
+    parser.add_argument("--trials", type=int, default=200)
+    parser.add_argument("--area-ratios", type=float, nargs="+", default=[0.6, 0.8, 0.9, 1.0], help="Idle hand box area relative to the gesturing hand.")
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--jitter", type=float, default=0.002, help="Landmark noise, normalized image units.")
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    rest, hold = 1.0, 2.5
+    print(f"{args.trials} trials per ratio, gesture held {hold:g}s, fired = decision within the hold")
+    print(f"{'area_ratio':>10} {'method':<16} {'fired':>6} {'median_ms':>9} {'p90_ms':>7} {'switches':>8}")
+    for ratio in args.area_ratios:
+        collected: Dict[str, List[Tuple[Optional[float], int]]] = {}
+        for trial in range(args.trials):
+            for method, outcome in _trial(ratio, args.seed * 10007 + trial, args.fps, rest, hold, args.jitter).items():
+                collected.setdefault(method, []).append(outcome)
+        for method, outcomes in collected.items():
+            latencies = sorted(latency for latency, _ in outcomes if latency is not None)
+            switches = sum(count for _, count in outcomes) / len(outcomes)
+            median = f"{latencies[len(latencies) // 2] * 1000:9.0f}" if latencies else f"{'-':>9}"
+            p90 = f"{latencies[int(len(latencies) * 0.9)] * 1000:7.0f}" if latencies else f"{'-':>7}"
+            print(f"{ratio:10.2f} {method:<16} {len(latencies) / len(outcomes):6.0%} {median} {p90} {switches:8.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from typing import List, Optional
+
+import cv2
+import numpy as np
+
+from hand_gesture.vision import VisionEngine
+
+
+def _read_frames(path: str, limit: Optional[int]) -> List[np.ndarray]:
+    cap = cv2.VideoCapture(path)
+    frames: List[np.ndarray] = []
+    while limit is None or len(frames) < limit:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def _run(frames: List[np.ndarray], detection_interval: int, args):
+    engine = VisionEngine(
+        max_num_hands=args.max_num_hands,
+        min_detection_confidence=args.min_detection_confidence,
+        min_tracking_confidence=args.min_tracking_confidence,
+        warm_up_size=(frames[0].shape[1], frames[0].shape[0]),
+        detection_interval=detection_interval,
+        flow_max_fb_error=args.max_fb_error,
+    )
+    engine.wait_until_ready()
+    landmarks = []
+    started = time.perf_counter()
+    for frame in frames:
+        _, hand_info = engine.process_frame(frame)
+        landmarks.append(np.asarray(hand_info.landmarks) if hand_info else None)
+    elapsed = time.perf_counter() - started
+    engine.close()
+    return landmarks, elapsed, engine
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Measure FPS and landmark error of optical-flow propagation against full inference on a video.",
+    )
+    parser.add_argument("video", help="Recorded video of hand gestures.")
+    parser.add_argument("--intervals", type=int, nargs="+", default=[2, 3, 5])
+    parser.add_argument("--frames", type=int, default=None)
+    parser.add_argument("--max-num-hands", type=int, default=1)
+    parser.add_argument("--min-detection-confidence", type=float, default=0.8)
+    parser.add_argument("--min-tracking-confidence", type=float, default=0.8)
+    parser.add_argument("--max-fb-error", type=float, default=1.5)
+    args = parser.parse_args()
+
+    frames = _read_frames(args.video, args.frames)
+    if not frames:
+        print(f"No frames read from {args.video}")
+        return 1
+    height, width = frames[0].shape[:2]
+    reference, reference_s, _ = _run(frames, 1, args)
+    print(f"{len(frames)} frames at {width}x{height}; full inference {len(frames) / reference_s:.1f} FPS")
+    print(f"{'interval':>8} {'fps':>7} {'speedup':>7} {'detector':>8} {'mean_px':>7} {'p95_px':>7} {'palm%':>6} {'missed':>6}")
+    for interval in args.intervals:
+        landmarks, elapsed, engine = _run(frames, interval, args)
+        errors = []
+        relative = []
+        missed = 0
+        for expected, actual in zip(reference, landmarks):
+            if expected is None:
+                continue
+            if actual is None:
+                missed += 1
+                continue
+            pixel_error = np.linalg.norm((actual - expected) * (width, height), axis=1)
+            palm = np.linalg.norm((expected[0] - expected[9]) * (width, height))
+            errors.extend(pixel_error)
+            relative.append(pixel_error.mean() / max(palm, 1e-6))
+        errors_array = np.asarray(errors) if errors else np.zeros(1)
+        print(
+            f"{interval:8d} {len(frames) / elapsed:7.1f} {reference_s / elapsed:6.2f}x "
+            f"{engine.detector_runs:8d} {errors_array.mean():7.2f} {np.percentile(errors_array, 95):7.2f} "
+            f"{(np.mean(relative) if relative else 0.0) * 100.0:6.1f} {missed:6d}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
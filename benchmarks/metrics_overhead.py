@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import threading
+import time
+import urllib.request
+
+from hand_gesture.gestures import GestureAction
+from hand_gesture.metrics import GestureMetrics, MetricsServer
+
+REQUIRED = (
+    "hand_gesture_frames_total",
+    "hand_gesture_fps",
+    "hand_gesture_hand_present_ratio",
+    "hand_gesture_inference_seconds_bucket",
+    "hand_gesture_actions_total",
+    "hand_gesture_cooldown_blocks_total",
+    "hand_gesture_dropped_frames_total",
+    "hand_gesture_executor_errors_total",
+)
+
+
+def _frame_updates(metrics: GestureMetrics, frames: int) -> float:
+    started = time.perf_counter()
+    for idx in range(frames):
+        timestamp = idx / 30.0
+        metrics.inference_time(0, 0.012 + (idx % 7) * 0.004)
+        metrics.frame(timestamp, idx % 5 != 0)
+        if idx % 90 == 0:
+            metrics.action(GestureAction.SHOW_DESKTOP, idx % 270 != 0, "Action failed: test")
+        elif idx % 90 == 45:
+            metrics.cooldown_blocked(GestureAction.SHOW_DESKTOP)
+    return time.perf_counter() - started
+
+
+def _scrape(url: str) -> str:
+    with urllib.request.urlopen(url, timeout=2.0) as response:
+        return response.read().decode("utf-8")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure per-frame metrics cost with and without a scraper, and check the localhost endpoint.")
+    parser.add_argument("--frames", type=int, default=200000)
+    parser.add_argument("--scrape-hz", type=float, default=50.0)
+    args = parser.parse_args()
+
+    metrics = GestureMetrics()
+    dropped = {"value": 0}
+    metrics.dropped_frames_source(lambda: [(("0",), dropped["value"])])
+    server = MetricsServer(metrics.registry, port=0).start()
+    host, port = server.address
+    url = f"http://{host}:{port}/metrics"
+
+    idle_seconds = _frame_updates(metrics, args.frames)
+
+    stop = threading.Event()
+    scrapes = []
+
+    def scraper() -> None:
+        while not stop.is_set():
+            started = time.perf_counter()
+            _scrape(url)
+            scrapes.append(time.perf_counter() - started)
+            stop.wait(1.0 / args.scrape_hz)
+
+    thread = threading.Thread(target=scraper, daemon=True)
+    thread.start()
+    busy_seconds = _frame_updates(metrics, args.frames)
+    stop.set()
+    thread.join()
+
+    dropped["value"] = 7
+    body = _scrape(url)
+    server.stop()
+    missing = [name for name in REQUIRED if f"\n{name}" not in "\n" + body]
+    count_line = next(line for line in body.splitlines() if line.startswith('hand_gesture_inference_seconds_count{camera="0"}'))
+    frames_line = next(line for line in body.splitlines() if line.startswith("hand_gesture_frames_total "))
+
+    print(f"{args.frames} frames per run, per-frame updates: inference, frame, actions every 45 frames")
+    print(f"{'run':<26} {'us/frame':>9}")
+    print(f"{'no scraper':<26} {idle_seconds / args.frames * 1e6:9.2f}")
+    print(f"{f'scraped at {args.scrape_hz:g} Hz':<26} {busy_seconds / args.frames * 1e6:9.2f}")
+    if scrapes:
+        scrapes.sort()
+        print(f"scrapes: {len(scrapes)}, median {scrapes[len(scrapes) // 2] * 1e3:.2f} ms, {len(body)} bytes")
+    print(frames_line)
+    print(count_line)
+    print("missing metrics:", ", ".join(missing) or "none")
+    return 1 if missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from hand_gesture.multicam import MultiCameraPipeline
+from hand_gesture.vision import VisionEngine
+
+
+class _LoopingVideo:
+    # Stands in for CameraCapture: replays a file forever at its own frame rate.
+    def __init__(self, path: str, fps: float):
+        self._cap = cv2.VideoCapture(path)
+        self._interval = 1.0 / fps
+        self._next = time.perf_counter()
+
+    def isOpened(self) -> bool:
+        return self._cap.isOpened()
+
+    def read(self):
+        delay = self._next - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        self._next = max(self._next + self._interval, time.perf_counter() - self._interval)
+        ok, frame = self._cap.read()
+        if not ok:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self._cap.read()
+        return ok, frame
+
+    def release(self) -> None:
+        self._cap.release()
+
+
+def _synthetic_video(path: str, frames: int = 60) -> None:
+    rng = np.random.default_rng(0)
+    base = cv2.GaussianBlur((rng.random((480, 640, 3)) * 255).astype(np.uint8), (9, 9), 0)
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30.0, (640, 480))
+    for idx in range(frames):
+        writer.write(np.roll(base, idx * 4, axis=1))
+    writer.release()
+
+
+def _run(video: str, sources: int, workers: int, fps: float, seconds: float):
+    pipeline = MultiCameraPipeline(
+        [
+            (idx, _LoopingVideo(video, fps), VisionEngine(max_num_hands=1, min_detection_confidence=0.8, min_tracking_confidence=0.8), 0)
+            for idx in range(sources)
+        ],
+        workers=workers,
+    )
+    pipeline.wait_until_ready()
+    pipeline.start()
+    time.sleep(1.0)
+    cpu_started = time.process_time()
+    wall_started = time.perf_counter()
+    depth_samples = []
+    while time.perf_counter() - wall_started < seconds:
+        time.sleep(0.1)
+        depth_samples.append([item.queue_depth for item in pipeline.stats()])
+    cpu = (time.process_time() - cpu_started) / (time.perf_counter() - wall_started)
+    stats = pipeline.stats()
+    pipeline.release()
+    return stats, cpu, np.mean(depth_samples, axis=0)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure multi-camera throughput as vision workers are added.")
+    parser.add_argument("--video", help="Video to replay on every source; a synthetic clip is used when omitted.")
+    parser.add_argument("--sources", type=int, default=3)
+    parser.add_argument("--fps", type=float, default=30.0, help="Frame rate each simulated camera delivers.")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        video = args.video
+        if video is None:
+            video = os.path.join(directory, "synthetic.avi")
+            _synthetic_video(video)
+        print(f"{args.sources} sources at {args.fps:.0f} FPS each, {os.cpu_count()} CPUs")
+        print(f"{'workers':>7} {'total_fps':>9} {'cpu_cores':>9}  per-source processed fps / mean queue depth / dropped")
+        for workers in range(1, args.sources + 1):
+            stats, cpu, depths = _run(video, args.sources, workers, args.fps, args.seconds)
+            per_source = "  ".join(
+                f"cam{item.camera_index}:{item.processed_fps:5.1f}/{depth:.1f}/{item.dropped_frames}"
+                for item, depth in zip(stats, depths)
+            )
+            print(f"{workers:7d} {sum(item.processed_fps for item in stats):9.1f} {cpu:9.2f}  {per_source}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import List, Optional, Tuple
+
+from benchmarks.embedded_api import _POSES, synthetic_stream
+from benchmarks.pose_templates import _hand
+from hand_gesture.config import RuntimeConfig
+from hand_gesture.gestures import GestureAction, HandInfo, extract_hand_info
+from hand_gesture.memo import MemoizedPoseClassifier
+from hand_gesture.pose_templates import PoseTemplateClassifier, append_templates, pose_vector
+from hand_gesture.recognizer import GestureRecognizer
+from hand_gesture.replay import load_session
+
+Frame = Tuple[float, Optional[SimpleNamespace], Optional[str]]
+
+
+def _synthetic_frames(frames: int, fps: float, seed: int) -> List[Frame]:
+    timestamps, landmarks = synthetic_stream(frames, fps, seed)
+    result: List[Frame] = []
+    for timestamp, row in zip(timestamps.tolist(), landmarks.tolist()):
+        if row[0][0] != row[0][0]:
+            result.append((timestamp, None, None))
+            continue
+        result.append((timestamp, SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y) for x, y, _ in row]), "Right"))
+    return result
+
+
+def _session_frames(path: str) -> List[Frame]:
+    result: List[Frame] = []
+    for frame in load_session(path):
+        info = frame.hand_info
+        if info is None or len(info.landmarks) != 21:
+            result.append((frame.timestamp, None, None))
+            continue
+        points = [SimpleNamespace(x=x, y=y) for x, y in info.landmarks]
+        result.append((frame.timestamp, SimpleNamespace(landmark=points), info.hand_label))
+    return result
+
+
+def _decide(frames: List[Frame], infos: List[Optional[HandInfo]], pose_classifier) -> Tuple[list, list, float]:
+    config = RuntimeConfig()
+    recognizer = GestureRecognizer.from_config(config)
+    recognizer.pose_classifier = pose_classifier
+    actions = []
+    decisions = []
+    started = time.perf_counter()
+    for (timestamp, _, _), info in zip(frames, infos):
+        event = recognizer.update(timestamp, info)
+        actions.append(event.action)
+        decisions.extend((round(timestamp, 6), decision) for decision in event.decisions)
+    return actions, decisions, time.perf_counter() - started
+
+
+def _template_library(path: str, seed: int) -> None:
+    # One action per synthetic pose, 20 noisy samples each.
+    rng = random.Random(seed)
+    actions = list(GestureAction)
+    for index, curls in enumerate(_POSES):
+        vectors = [pose_vector(_hand([curl + rng.gauss(0.0, 0.04) for curl in curls], rng)) for _ in range(20)]
+        append_templates(path, actions[index], vectors)
+
+
+def _run(name: str, frames: List[Frame], tolerances: List[float], templates_path: str) -> bool:
+    infos = [extract_hand_info(landmarks, label) if landmarks is not None else None for _, landmarks, label in frames]
+    hands = sum(1 for info in infos if info is not None)
+    classifier = PoseTemplateClassifier(templates_path, max_distance=1.5, fallback=True)
+    _, _, heuristic_seconds = _decide(frames, infos, None)
+    plain_actions, plain_decisions, plain_seconds = _decide(frames, infos, classifier)
+
+    print(f"{name}: {len(frames)} frames, {hands} with a hand, {len(plain_decisions)} decisions")
+    print(f"  {'decision path':<26} {'us/frame':>9} {'hit_rate':>8} {'actions_diff':>12} {'decisions':>9}")
+    print(f"  {'heuristic':<26} {heuristic_seconds / len(frames) * 1e6:9.2f}")
+    print(f"  {'templates':<26} {plain_seconds / len(frames) * 1e6:9.2f}")
+    ok = True
+    for tolerance in tolerances:
+        memoized = MemoizedPoseClassifier(classifier, tolerance)
+        memo_actions, memo_decisions, memo_seconds = _decide(frames, infos, memoized)
+        mismatches = sum(1 for a, b in zip(plain_actions, memo_actions) if a != b)
+        same = memo_decisions == plain_decisions
+        print(
+            f"  {f'templates, memo {tolerance:g}':<26} {memo_seconds / len(frames) * 1e6:9.2f} "
+            f"{memoized.hits / max(memoized.hits + memoized.misses, 1):8.1%} {mismatches:12d} {'same' if same else 'DIFFER':>9}"
+        )
+        ok = ok and same
+    return ok
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check that memoized pose-template classification gives the same decisions as uncached evaluation, and measure its cost.")
+    parser.add_argument("--session", nargs="*", default=[], help="Recorded session JSONL files (session_record_path) to replay.")
+    parser.add_argument("--frames", type=int, default=20000, help="Synthetic frames when no session is given.")
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--tolerances", type=float, nargs="+", default=[0.05, RuntimeConfig().pose_memo_tolerance, 0.2], help="Palm scales.")
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    sources = [(path, _session_frames(path)) for path in args.session]
+    if not sources:
+        sources = [("synthetic", _synthetic_frames(args.frames, args.fps, args.seed))]
+    ok = True
+    with tempfile.TemporaryDirectory() as directory:
+        templates_path = os.path.join(directory, "templates.npy")
+        _template_library(templates_path, args.seed)
+        for name, frames in sources:
+            ok = _run(name, frames, args.tolerances, templates_path) and ok
+    print("result:", "identical" if ok else "MISMATCH")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
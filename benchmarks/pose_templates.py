@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from hand_gesture.gestures import GestureAction, HandInfo, extract_hand_info, map_action
+from hand_gesture.pose_templates import KDTree, LinearIndex, PoseTemplateClassifier, append_templates, pose_vector
+
+# Base direction (degrees from straight up) and segment lengths per finger, in
+# palm-length units, for landmarks 1-4, 5-8, 9-12, 13-16 and 17-20.
+_FINGERS = (
+    (-55.0, (0.35, 0.3, 0.25, 0.2)),
+    (-15.0, (0.9, 0.4, 0.25, 0.2)),
+    (0.0, (1.0, 0.45, 0.28, 0.22)),
+    (14.0, (0.95, 0.4, 0.26, 0.2)),
+    (28.0, (0.85, 0.32, 0.2, 0.18)),
+)
+
+
+def _pose_points(curls: Sequence[float]) -> List[Tuple[float, float]]:
+    points = [(0.0, 0.0)]
+    for (base, segments), curl in zip(_FINGERS, curls):
+        x, y = 0.0, 0.0
+        heading = math.radians(base)
+        for joint, length in enumerate(segments):
+            if joint > 0:
+                heading += curl * (1.0 if base >= 0.0 else -1.0)
+            x += length * math.sin(heading)
+            y -= length * math.cos(heading)
+            points.append((x, y))
+    return points
+
+
+def _hand(curls: Sequence[float], rng: random.Random) -> HandInfo:
+    angle = math.radians(rng.uniform(-30.0, 30.0))
+    scale = rng.uniform(0.08, 0.15)
+    origin = (rng.uniform(0.3, 0.7), rng.uniform(0.5, 0.8))
+    cos_a, sin_a = math.cos(angle), math.sin(angle)
+    landmarks = []
+    for x, y in _pose_points(curls):
+        landmarks.append(
+            SimpleNamespace(
+                x=origin[0] + scale * (x * cos_a - y * sin_a),
+                y=origin[1] + scale * (x * sin_a + y * cos_a),
+            )
+        )
+    return extract_hand_info(SimpleNamespace(landmark=landmarks), "Right")
+
+
+def build_library(path: str, poses: int, users: int, samples: int, seed: int):
+    rng = random.Random(seed)
+    actions = list(GestureAction)
+    centers = [[rng.uniform(0.0, 1.4) for _ in range(5)] for _ in range(poses)]
+    for user in range(users):
+        for pose, curls in enumerate(centers):
+            vectors = []
+            for _ in range(samples):
+                noisy = [curl + rng.gauss(0.0, 0.04) for curl in curls]
+                vectors.append(pose_vector(_hand(noisy, rng)))
+            append_templates(path, actions[pose % len(actions)], vectors, user=f"user{user}")
+    return centers
+
+
+def _time_per_call(fn, items) -> float:
+    started = time.perf_counter()
+    for item in items:
+        fn(item)
+    return (time.perf_counter() - started) / len(items)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare pose-template classification latency with the heuristic path, and the linear scan with the KD-tree as the library grows.")
+    parser.add_argument("--poses", type=int, default=40)
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 5, 25, 50, 100])
+    parser.add_argument("--samples", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    # linear_us and kdtree_us time the index lookup alone; classify_us is
+    # map_action with the classifier, which picks one of the two by size.
+    print(f"{'templates':>9} {'heuristic_us':>12} {'linear_us':>9} {'kdtree_us':>9} {'classify_us':>11} {'index':>11} {'accuracy':>8} {'exact':>6}")
+    ok = True
+    for users in args.users:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "templates.npy")
+            centers = build_library(path, args.poses, users, args.samples, args.seed)
+            classifier = PoseTemplateClassifier(path, max_distance=float("inf"), fallback=False)
+            vectors = np.asarray(classifier.templates["vector"])
+            linear = LinearIndex(vectors)
+            tree = KDTree(vectors)
+
+            rng = random.Random(args.seed + 1)
+            queries = []
+            for _ in range(args.queries):
+                pose = rng.randrange(len(centers))
+                queries.append((pose, _hand([curl + rng.gauss(0.0, 0.04) for curl in centers[pose]], rng)))
+            hands = [hand for _, hand in queries]
+            query_vectors = [pose_vector(hand) for hand in hands]
+
+            heuristic_s = _time_per_call(map_action, hands)
+            linear_s = _time_per_call(linear.nearest, query_vectors)
+            tree_s = _time_per_call(tree.nearest, query_vectors)
+            classify_s = _time_per_call(lambda hand: map_action(hand, pose_classifier=classifier), hands)
+
+            actions = list(GestureAction)
+            labels = classifier.templates["action"]
+            correct = 0
+            exact = 0
+            for (pose, hand), query in zip(queries, query_vectors):
+                correct += classifier.classify(hand) == actions[pose % len(actions)]
+                diff = vectors - query
+                reference = labels[int(np.argmin(np.einsum("ij,ij->i", diff, diff)))]
+                exact += labels[linear.nearest(query)[0]] == reference and labels[tree.nearest(query)[0]] == reference
+            print(
+                f"{len(vectors):9d} {heuristic_s * 1e6:12.1f} {linear_s * 1e6:9.1f} {tree_s * 1e6:9.1f} {classify_s * 1e6:11.1f} "
+                f"{type(classifier.index).__name__:>11} {correct / len(queries):8.1%} {exact / len(queries):6.1%}"
+            )
+            ok = ok and exact == len(queries)
+            del classifier, vectors, linear, tree
+    if not ok:
+        print("FAIL: an index disagrees with the brute-force nearest neighbour")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import argparse
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+from hand_gesture.gestures import HandInfo
+from hand_gesture.publisher import FrameMessage, StatePublisher, decode_message, encode_frame, open_subscriber
+
+HAND = HandInfo(
+    finger_state=(0, 1, 1, 0, 0),
+    finger_count=2,
+    index_tip=(0.52, 0.31),
+    palm_center=(0.5, 0.55),
+    bounding_box_area=0.06,
+    palm_scale=0.12,
+    hand_label="Right",
+    finger_spread=0.25,
+    thumb_is_vertical=False,
+    landmarks=tuple((0.4 + idx * 0.01, 0.6 - idx * 0.01) for idx in range(21)),
+)
+# Landmarks and HandInfo floats travel as float32.
+EXPECTED = decode_message(encode_frame(1, 0.0, HAND)).hand_info
+
+
+def _receiver(sock: socket.socket, counts: dict, stop: threading.Event, slow_seconds: float) -> None:
+    while not stop.is_set():
+        try:
+            data = sock.recv(4096)
+        except socket.timeout:
+            continue
+        except OSError:
+            return
+        message = decode_message(data)
+        counts["received"] += 1
+        counts["last_sequence"] = message.sequence
+        if isinstance(message, FrameMessage) and message.hand_info != EXPECTED:
+            counts["corrupt"] += 1
+        if slow_seconds:
+            time.sleep(slow_seconds)
+
+
+def _run(target: str, messages: int, slow_seconds: float):
+    sock = open_subscriber(target, timeout=0.2)
+    counts = {"received": 0, "last_sequence": 0, "corrupt": 0}
+    stop = threading.Event()
+    thread = threading.Thread(target=_receiver, args=(sock, counts, stop, slow_seconds), daemon=True)
+    thread.start()
+    publisher = StatePublisher(target)
+    durations = []
+    started = time.perf_counter()
+    for idx in range(messages):
+        call_started = time.perf_counter()
+        publisher.publish_frame(idx * 0.001, HAND)
+        durations.append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+    time.sleep(0.5)
+    stop.set()
+    thread.join()
+    sock.close()
+    publisher.close()
+    durations.sort()
+    return messages / elapsed, counts, publisher, durations[int(len(durations) * 0.99)]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure hand-state publisher throughput in messages per second.")
+    parser.add_argument("--messages", type=int, default=100000)
+    parser.add_argument("--port", type=int, default=15005)
+    args = parser.parse_args()
+
+    targets = [f"udp://127.0.0.1:{args.port}"]
+    directory = tempfile.TemporaryDirectory()
+    if hasattr(socket, "AF_UNIX"):
+        targets.append(f"unix://{os.path.join(directory.name, 'hand_state.sock')}")
+    print(f"{'target':<10} {'subscriber':<10} {'publish/s':>10} {'received':>9} {'dropped':>8} {'p99_call_us':>11} {'corrupt':>7}")
+    ok = True
+    for target in targets:
+        for label, slow in (("fast", 0.0), ("slow", 0.001)):
+            rate, counts, publisher, p99 = _run(target, args.messages, slow)
+            print(
+                f"{target.split(':')[0]:<10} {label:<10} {rate:10.0f} {counts['received']:9d} "
+                f"{publisher.dropped:8d} {p99 * 1e6:11.1f} {counts['corrupt']:7d}"
+            )
+            ok = ok and counts["corrupt"] == 0
+    directory.cleanup()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from typing import Callable, List
+
+import cv2
+import numpy as np
+
+from hand_gesture.skeleton import HAND_CONNECTIONS, SKELETON_STYLES, SkeletonRenderer
+
+
+def _hands(count: int, seed: int = 0) -> np.ndarray:
+    # Open hands at random places and scales: wrist, then four points per
+    # finger fanning upwards.
+    rng = np.random.default_rng(seed)
+    fingers = np.array([[-0.5 + 0.25 * f - 0.1 * j * (f == 0), -0.3 - 0.25 * j] for f in range(5) for j in range(4)])
+    shape = np.vstack([[0.0, 0.0], fingers])
+    hands = []
+    for _ in range(count):
+        scale = rng.uniform(0.15, 0.35)
+        center = rng.uniform(0.3, 0.7, 2)
+        angle = rng.uniform(-0.4, 0.4)
+        rotation = np.array([[np.cos(angle), -np.sin(angle)], [np.sin(angle), np.cos(angle)]])
+        hands.append(center + (shape @ rotation.T) * scale * (1.0, 0.75) + rng.normal(0.0, 0.003, shape.shape))
+    return np.asarray(hands)
+
+
+def _time_per_hand(draw: Callable[[np.ndarray, int], None], frame: np.ndarray, count: int, repeats: int) -> float:
+    started = time.perf_counter()
+    for repeat in range(repeats):
+        for index in range(count):
+            draw(frame, index)
+    return (time.perf_counter() - started) / (repeats * count) * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Per-hand skeleton draw time: mp_drawing and per-connection OpenCV calls against the batched renderer.")
+    parser.add_argument("--hands", type=int, default=200, help="Distinct hand poses to cycle through.")
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    from mediapipe.framework.formats import landmark_pb2
+    from mediapipe.python.solutions import drawing_utils, hands as mp_hands
+
+    poses = _hands(args.hands)
+    height, width = 480, 640
+    frame = np.zeros((height, width, 3), dtype=np.uint8)
+    # What VisionEngine had per hand: the NormalizedLandmarkList from
+    # MediaPipe and HandInfo.landmarks as tuples.
+    protos = []
+    for pose in poses:
+        proto = landmark_pb2.NormalizedLandmarkList()
+        for x, y in pose:
+            proto.landmark.add(x=float(x), y=float(y), z=0.0)
+        protos.append(proto)
+    tuples = [tuple((float(x), float(y)) for x, y in pose) for pose in poses]
+    spec = drawing_utils.DrawingSpec(color=(255, 255, 255), thickness=2, circle_radius=2)
+
+    def mp_drawing(image: np.ndarray, index: int) -> None:
+        drawing_utils.draw_landmarks(image, protos[index], mp_hands.HAND_CONNECTIONS, spec, spec)
+
+    def per_call(image: np.ndarray, index: int) -> None:
+        # The optical-flow and Tasks paths: one conversion, line and circle
+        # per landmark and connection.
+        pixels = [(int(x * width), int(y * height)) for x, y in tuples[index]]
+        for start, end in HAND_CONNECTIONS:
+            cv2.line(image, pixels[start], pixels[end], (255, 255, 255), 2)
+        for pixel in pixels:
+            cv2.circle(image, pixel, 2, (255, 255, 255), 2)
+
+    paths: List[tuple] = [("mp_drawing.draw_landmarks", mp_drawing), ("cv2.line/circle per call", per_call)]
+    for name in SKELETON_STYLES:
+        renderer = SkeletonRenderer.from_name(name)
+        paths.append((f"SkeletonRenderer {name}", lambda image, index, renderer=renderer: renderer.draw(image, tuples[index])))
+
+    reference = np.zeros_like(frame)
+    mp_drawing(reference, 0)
+    print(f"{args.hands} hand poses x {args.repeats} repeats on {width}x{height}")
+    print(f"{'path':<28} {'us/hand':>8} {'speedup':>8} {'px_diff':>8}")
+    baseline = None
+    for name, draw in paths:
+        per_hand = _time_per_hand(draw, frame, args.hands, args.repeats)
+        baseline = baseline or per_hand
+        # Pixels that differ from MediaPipe's drawing of the first pose.
+        image = np.zeros_like(frame)
+        draw(image, 0)
+        changed = int(np.count_nonzero((image != reference).any(axis=2)))
+        print(f"{name:<28} {per_hand:8.1f} {baseline / per_hand:7.1f}x {changed:8d}")
+    drawn = int(np.count_nonzero(reference.any(axis=2)))
+    print(f"(MediaPipe's drawing of that pose covers {drawn} pixels)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
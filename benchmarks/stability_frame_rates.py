@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import List, Optional
+
+from hand_gesture.config import RuntimeConfig
+from hand_gesture.gestures import GestureAction, HandInfo
+from hand_gesture.replay import SessionFrame, replay_session
+
+PALM = (1, 1, 1, 1, 1)
+RELAXED = (0, 0, 1, 1, 0)
+
+
+def _hand(finger_state, palm_center) -> HandInfo:
+    return HandInfo(
+        finger_state=finger_state,
+        finger_count=sum(finger_state),
+        index_tip=(palm_center[0], palm_center[1] - 0.12),
+        palm_center=palm_center,
+        bounding_box_area=0.06,
+        palm_scale=0.12,
+        hand_label="Right",
+        finger_spread=0.3,
+        thumb_is_vertical=False,
+    )
+
+
+def motion_at(t: float) -> Optional[HandInfo]:
+    # The hand enters relaxed, forms an open palm at 0.25 s while still
+    # sliding into place, comes to rest at 0.55 s and holds until 2 s.
+    if t < 0.1:
+        return None
+    x = 0.35 + 0.3 * min(t, 0.55)
+    finger_state = PALM if t >= 0.25 else RELAXED
+    return _hand(finger_state, (x, 0.5))
+
+
+def sample(fps: float, duration: float = 2.0) -> List[SessionFrame]:
+    count = int(duration * fps)
+    return [SessionFrame(timestamp=i / fps, hand_info=motion_at(i / fps)) for i in range(count)]
+
+
+def decision_time(fps: float, config: RuntimeConfig) -> Optional[float]:
+    for decision in replay_session(sample(fps), config):
+        if decision.action == GestureAction.CLOSE_CURRENT_APP.value:
+            return decision.timestamp
+    return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Replay one motion at several frame rates and compare decision times.")
+    parser.add_argument("--fps", type=float, nargs="+", default=[12.0, 15.0, 24.0, 30.0, 60.0, 120.0])
+    args = parser.parse_args()
+
+    config = RuntimeConfig()
+    times = {}
+    for fps in args.fps:
+        times[fps] = decision_time(fps, config)
+        shown = f"{times[fps] * 1000.0:.0f} ms" if times[fps] is not None else "no decision"
+        print(f"{fps:6.1f} FPS -> {shown}")
+
+    fired = [value for value in times.values() if value is not None]
+    if len(fired) != len(times):
+        print("FAIL: the gesture did not fire at every frame rate")
+        return 1
+    spread = max(fired) - min(fired)
+    # Decisions can only land on frame boundaries, so one interval at the
+    # slowest rate is the best any stabilizer can do.
+    tolerance = 1.0 / min(args.fps)
+    print(f"spread {spread * 1000.0:.0f} ms (tolerance {tolerance * 1000.0:.0f} ms)")
+    if spread > tolerance:
+        print("FAIL: decision time depends on frame rate")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
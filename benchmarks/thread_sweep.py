@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from hand_gesture.threads import available_cpus, pin_current_thread
+
+Layout = Dict[str, Tuple[int, ...]]
+
+
+def _layouts(cpus: Tuple[int, ...]) -> List[Tuple[str, Layout]]:
+    layouts: List[Tuple[str, Layout]] = [("unpinned", {})]
+    if len(cpus) >= 2:
+        layouts.append(("inference apart", {"capture_cpus": cpus[:1], "ui_cpus": cpus[:1], "inference_cpus": cpus[1:]}))
+    if len(cpus) >= 4:
+        layouts.append(
+            ("three stages", {"capture_cpus": cpus[:1], "ui_cpus": cpus[1:2], "inference_cpus": cpus[2:]})
+        )
+    return layouts
+
+
+def _thread_counts(cpus: Tuple[int, ...]) -> List[int]:
+    counts = {1, len(cpus)}
+    count = 2
+    while count < len(cpus):
+        counts.add(count)
+        count *= 2
+    return sorted(counts)
+
+
+def _build_hands(inference_cpus: Tuple[int, ...]):
+    # Same as VisionEngine: the graph is built on a thread pinned to the
+    # inference CPUs so MediaPipe's own threads inherit the mask.
+    built = {}
+
+    def build():
+        pin_current_thread(inference_cpus, "inference")
+        import mediapipe as mp
+
+        built["hands"] = mp.solutions.hands.Hands(static_image_mode=False, max_num_hands=2)
+
+    thread = threading.Thread(target=build, name="vision warm-up")
+    thread.start()
+    thread.join()
+    return built["hands"]
+
+
+def _run(frames: int, jpeg: np.ndarray, opencv_threads: int, layout: Layout, use_mediapipe: bool) -> Dict[str, float]:
+    original_mask = os.sched_getaffinity(0) if hasattr(os, "sched_getaffinity") else None
+    previous_threads = cv2.getNumThreads()
+    cv2.setNumThreads(opencv_threads)
+    hands = _build_hands(layout.get("inference_cpus", ())) if use_mediapipe else None
+    pending: "queue.Queue[Optional[np.ndarray]]" = queue.Queue(maxsize=2)
+
+    def capture():
+        # MJPG decode, as CameraCapture does for a USB webcam.
+        pin_current_thread(layout.get("capture_cpus", ()), "capture")
+        for _ in range(frames):
+            pending.put(cv2.imdecode(jpeg, cv2.IMREAD_COLOR))
+        pending.put(None)
+
+    capture_thread = threading.Thread(target=capture, name="capture")
+    capture_thread.start()
+    # As in the controller: the UI thread is pinned once the workers run.
+    pin_current_thread(layout.get("ui_cpus", ()), "ui")
+    times: List[float] = []
+    starts: List[float] = []
+    try:
+        while True:
+            frame = pending.get()
+            if frame is None:
+                break
+            started = time.perf_counter()
+            # VisionEngine and the overlay: flip, RGB conversion, inference,
+            # then a tinted, resized preview.
+            frame = cv2.flip(frame, 1)
+            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            if hands is not None:
+                rgb.flags.writeable = False
+                hands.process(rgb)
+            preview = cv2.GaussianBlur(frame, (9, 9), 0)
+            cv2.resize(preview, (1280, 960))
+            times.append(time.perf_counter() - started)
+            starts.append(started)
+    finally:
+        capture_thread.join()
+        if hands is not None:
+            hands.close()
+        cv2.setNumThreads(previous_threads)
+        if original_mask is not None:
+            os.sched_setaffinity(0, original_mask)
+    # The first frames include graph and pool start-up.
+    warm = times[len(times) // 10 :]
+    intervals = np.diff(starts[len(starts) // 10 :])
+    return {
+        "mean_ms": float(np.mean(warm)) * 1000.0,
+        "p95_ms": float(np.percentile(warm, 95)) * 1000.0,
+        "jitter_ms": float(np.std(intervals)) * 1000.0 if len(intervals) else 0.0,
+        "fps": 1.0 / float(np.mean(intervals)) if len(intervals) else 0.0,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Sweep OpenCV thread counts and capture/inference/UI CPU layouts and report the best settings for this host."
+    )
+    parser.add_argument("--frames", type=int, default=150, help="Frames per setting.")
+    parser.add_argument("--opencv-threads", type=int, nargs="*", help="Thread counts to try (default: 1, powers of two, all CPUs).")
+    parser.add_argument("--no-mediapipe", action="store_true", help="Time only the OpenCV stages.")
+    args = parser.parse_args()
+    logging.getLogger("hand_gesture.threads").setLevel(logging.WARNING)
+
+    cpus = available_cpus()
+    use_mediapipe = not args.no_mediapipe
+    if use_mediapipe:
+        try:
+            import mediapipe  # noqa: F401
+        except ImportError:
+            print("mediapipe is not installed; timing the OpenCV stages only")
+            use_mediapipe = False
+    rng = np.random.default_rng(0)
+    image = cv2.GaussianBlur(rng.integers(0, 255, (480, 640, 3), dtype=np.uint8), (5, 5), 0)
+    jpeg = cv2.imencode(".jpg", image)[1]
+
+    counts = args.opencv_threads or _thread_counts(cpus)
+    print(f"CPUs available: {list(cpus)}, {args.frames} frames per setting, mediapipe: {'yes' if use_mediapipe else 'no'}")
+    print(f"{'opencv_threads':>14} {'layout':<16} {'fps':>7} {'mean_ms':>8} {'p95_ms':>8} {'jitter_ms':>9}")
+    results = []
+    for name, layout in _layouts(cpus):
+        for count in counts:
+            stats = _run(args.frames, jpeg, count, layout, use_mediapipe)
+            results.append((stats, count, name, layout))
+            print(f"{count:14d} {name:<16} {stats['fps']:7.1f} {stats['mean_ms']:8.2f} {stats['p95_ms']:8.2f} {stats['jitter_ms']:9.2f}")
+
+    # Tail latency decides: a steady frame time matters more than the mean.
+    stats, count, name, layout = min(results, key=lambda item: (item[0]["p95_ms"], item[0]["mean_ms"]))
+    best = {"opencv_threads": count, **{key: list(value) for key, value in layout.items()}}
+    print(f"best: opencv_threads={count}, layout={name} (p95 {stats['p95_ms']:.2f} ms)")
+    print("runtime config:", json.dumps(best, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
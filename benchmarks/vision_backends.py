@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from typing import List
+
+import cv2
+import numpy as np
+
+from hand_gesture.config import RuntimeConfig
+from hand_gesture.filesource import FileFrameSource
+from hand_gesture.landmarker import TasksVisionEngine, create_vision_engine
+
+
+def _synthetic_video(directory: str, frames: int, fps: float) -> str:
+    # No hands in it: the palm detector runs on every frame, the worst case.
+    path = os.path.join(directory, "synthetic.mp4")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (640, 480))
+    rng = np.random.default_rng(0)
+    for index in range(frames):
+        frame = cv2.GaussianBlur(rng.integers(0, 255, (480, 640, 3), dtype=np.uint8), (15, 15), 0)
+        cv2.circle(frame, (320 + int(100 * np.sin(index / 10)), 240), 60, (90, 140, 200), -1)
+        writer.write(frame)
+    writer.release()
+    return path
+
+
+def _render(image: np.ndarray, work_ms: float) -> None:
+    # Overlay and display cost on the loop thread.
+    deadline = time.perf_counter() + work_ms / 1000.0
+    while time.perf_counter() < deadline:
+        cv2.GaussianBlur(image[:120, :160], (7, 7), 0)
+
+
+def _run(path: str, mode: str, config: RuntimeConfig, work_ms: float) -> None:
+    engine = create_vision_engine(config)
+    engine.start_warm_up()
+    engine.wait_until_ready()
+    source = FileFrameSource(path, mode=mode)
+    blocked: List[float] = []
+    hands = 0
+    started = time.perf_counter()
+    while source.isOpened():
+        ok, frame = source.read()
+        if not ok:
+            continue
+        call = time.perf_counter()
+        image, hand_info = engine.process_frame(frame, source.timestamp)
+        blocked.append(time.perf_counter() - call)
+        hands += hand_info is not None
+        _render(image, work_ms)
+    seconds = time.perf_counter() - started
+    source.release()
+    engine.close()
+    blocked_ms = np.asarray(blocked) * 1000.0
+    if isinstance(engine, TasksVisionEngine):
+        results = engine.results_received
+        latency = engine.mean_latency_ms
+        skipped = engine.skipped_frames
+    else:
+        # Blocking: every frame gets a result, as late as the call took.
+        results = len(blocked)
+        latency = float(blocked_ms.mean())
+        skipped = 0
+    print(
+        f"{config.vision_backend:<10} {mode:<6} {len(blocked) / seconds:8.1f} {results / seconds:10.1f} "
+        f"{blocked_ms.mean():10.2f} {np.percentile(blocked_ms, 95):9.2f} {latency:11.1f} {skipped:8d} {hands:6d}"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare the legacy Hands solution and the Tasks HandLandmarker (LIVE_STREAM) on a recorded video.")
+    parser.add_argument("video", nargs="?", help="Recorded video; a synthetic clip without hands is used when omitted.")
+    parser.add_argument("--model", default=RuntimeConfig().hand_landmarker_model_path, help="hand_landmarker.task bundle.")
+    parser.add_argument("--frames", type=int, default=200, help="Length of the synthetic clip.")
+    parser.add_argument("--work-ms", type=float, default=5.0, help="Simulated overlay and display time per frame.")
+    args = parser.parse_args()
+    logging.getLogger("hand_gesture").setLevel(logging.WARNING)
+
+    if not os.path.isfile(args.model):
+        print(f"HandLandmarker model not found at {args.model}; pass --model path/to/hand_landmarker.task")
+        return 1
+    config = RuntimeConfig(hand_landmarker_model_path=args.model, min_detection_confidence=0.5, min_tracking_confidence=0.5)
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.video or _synthetic_video(directory, args.frames, 30.0)
+        print(f"input: {args.video or f'synthetic, {args.frames} frames at 30 fps'}, {args.work_ms:g} ms render work per frame")
+        print(f"{'backend':<10} {'mode':<6} {'loop_fps':>8} {'results/s':>10} {'blocked_ms':>10} {'p95_ms':>9} {'latency_ms':>11} {'skipped':>8} {'hands':>6}")
+        for mode in ("paced", "fast"):
+            for backend in ("solutions", "tasks"):
+                _run(path, mode, replace(config, vision_backend=backend), args.work_ms)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
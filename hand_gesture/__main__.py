@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import argparse
+import logging
+from dataclasses import replace
+from typing import Optional, Sequence
+
+from hand_gesture.config import RuntimeConfig, load_runtime_config
+from hand_gesture.controller import GestureController
+from hand_gesture.filesource import SOURCE_MODES
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the gesture controller on a camera, a video file or an image sequence.")
+    parser.add_argument("--config", help="Runtime config JSON to start from.")
+    parser.add_argument("--camera", type=int, help="Camera index (overrides camera_index).")
+    parser.add_argument("--source", help="Video file or image glob, e.g. 'fixtures/*.png', used instead of the camera.")
+    parser.add_argument("--mode", choices=SOURCE_MODES, help="paced: original timing; fast: as fast as frames decode.")
+    parser.add_argument("--source-fps", type=float, help="Frame rate of an image sequence.")
+    parser.add_argument("--read-ahead", type=int, help="Frames decoded ahead of the loop.")
+    parser.add_argument("--loop", action="store_true", help="Restart the file at the end (soak tests).")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(name)s | %(message)s")
+    config = load_runtime_config(args.config) if args.config else RuntimeConfig()
+    overrides = {
+        "camera_index": args.camera,
+        "frame_source": args.source,
+        "frame_source_mode": args.mode,
+        "frame_source_fps": args.source_fps,
+        "frame_source_read_ahead": args.read_ahead,
+        "frame_source_loop": True if args.loop else None,
+    }
+    config = replace(config, **{key: value for key, value in overrides.items() if value is not None})
+    GestureController(config).run()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,32 +5,35 @@ import logging
 import os
 import platform
 import time
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Optional
 
 from hand_gesture.gestures import GestureAction
-
-try:
-    import pyautogui
-except Exception:
-    pyautogui = None
+from hand_gesture.windows import close_all_windows, default_window_backend
 
 logger = logging.getLogger(__name__)
 
 
 class DesktopActionExecutor:
-    def __init__(self, close_all_iterations: int, close_all_step_delay_seconds: float):
+    def __init__(
+        self,
+        close_all_iterations: int,
+        close_all_step_delay_seconds: float,
+        close_all_timeout_seconds: float = 3.0,
+        window_backend: Optional[Any] = None,
+    ):
         self.close_all_iterations = close_all_iterations
         self.close_all_step_delay_seconds = close_all_step_delay_seconds
+        self.close_all_timeout_seconds = close_all_timeout_seconds
         self.os_name = platform.system().lower()
+        # Enumerates and closes windows in one batch for CLOSE_ALL_APPS; None
+        # (no backend for this OS) keeps the keyboard close/switch loop.
+        self.window_backend = window_backend if window_backend is not None else default_window_backend(self.os_name)
         self.last_error: Optional[str] = None
         self._self_pid = os.getpid()
         self._last_external_hwnd: Optional[int] = None
         self._task_view_active = False
 
-        if pyautogui is not None:
-            pyautogui.FAILSAFE = False
-            pyautogui.PAUSE = 0.05
-
     def refresh_external_target(self) -> None:
         if self._task_view_active:
             return
@@ -47,7 +50,8 @@ class DesktopActionExecutor:
     def execute(self, action: GestureAction) -> bool:
         self.last_error = None
         logger.debug("Requested execute action: %s", action.value)
-        if self.os_name != "windows" and pyautogui is None:
+        batched_close = action == GestureAction.CLOSE_ALL_APPS and self.window_backend is not None
+        if self.os_name != "windows" and not batched_close and _pyautogui() is None:
             self.last_error = "pyautogui not installed. Run: pip install pyautogui"
             logger.error(self.last_error)
             return False
@@ -67,6 +71,16 @@ class DesktopActionExecutor:
                 self._show_desktop()
             elif action == GestureAction.CLOSE_ALL_APPS:
                 self._close_all_apps()
+            elif action == GestureAction.SWIPE_LEFT:
+                self._swipe_windows("left")
+            elif action == GestureAction.SWIPE_RIGHT:
+                self._swipe_windows("right")
+            elif action == GestureAction.SWIPE_UP:
+                self._open_task_view()
+            elif action == GestureAction.SWIPE_DOWN:
+                self._minimize_current_app()
+            elif action in (GestureAction.CIRCLE_CLOCKWISE, GestureAction.CIRCLE_COUNTERCLOCKWISE):
+                self._show_desktop()
             else:
                 return False
             logger.debug("Action execution completed: %s", action.value)
@@ -83,9 +97,9 @@ class DesktopActionExecutor:
                 self.last_error = "No external app selected. Focus another app first; this app protects itself."
                 raise RuntimeError(self.last_error)
         elif self.os_name == "darwin":
-            pyautogui.hotkey("command", "q")
+            _pyautogui().hotkey("command", "q")
         else:
-            pyautogui.hotkey("alt", "f4")
+            _pyautogui().hotkey("alt", "f4")
 
     def _minimize_current_app(self) -> None:
         logger.debug("Minimizing selected external app.")
@@ -94,27 +108,27 @@ class DesktopActionExecutor:
                 self.last_error = "No external app selected to minimize."
                 raise RuntimeError(self.last_error)
             return
-        if pyautogui is None:
+        if _pyautogui() is None:
             self.last_error = "pyautogui not installed. Run: pip install pyautogui"
             raise RuntimeError(self.last_error)
         if self.os_name == "darwin":
-            pyautogui.hotkey("command", "m")
+            _pyautogui().hotkey("command", "m")
         else:
-            pyautogui.hotkey("alt", "space")
-            pyautogui.press("n")
+            _pyautogui().hotkey("alt", "space")
+            _pyautogui().press("n")
 
     def _show_desktop(self) -> None:
         logger.debug("Showing desktop.")
         if self.os_name == "windows":
             _send_windows_hotkey("win", "d")
             return
-        if pyautogui is None:
+        if _pyautogui() is None:
             self.last_error = "pyautogui not installed. Run: pip install pyautogui"
             raise RuntimeError(self.last_error)
         if self.os_name == "darwin":
-            pyautogui.hotkey("fn", "f11")
+            _pyautogui().hotkey("fn", "f11")
         else:
-            pyautogui.hotkey("winleft", "d")
+            _pyautogui().hotkey("winleft", "d")
 
     def _switch_window(self) -> None:
         logger.debug("Switching window.")
@@ -122,11 +136,43 @@ class DesktopActionExecutor:
             if not self._focus_last_external_window():
                 _send_windows_hotkey("alt", "tab")
         elif self.os_name == "darwin":
-            pyautogui.hotkey("command", "tab")
+            _pyautogui().hotkey("command", "tab")
+        else:
+            _pyautogui().hotkey("alt", "tab")
+
+    def _swipe_windows(self, direction: str) -> None:
+        logger.debug("Swipe navigation: %s", direction)
+        if self._task_view_active:
+            self.navigate_task_view(direction)
+            return
+        if direction == "right":
+            self._switch_window()
+        elif self.os_name == "windows":
+            _send_windows_hotkey("alt", "shift", "tab")
+        elif self.os_name == "darwin":
+            _pyautogui().hotkey("command", "shift", "tab")
         else:
-            pyautogui.hotkey("alt", "tab")
+            _pyautogui().hotkey("alt", "shift", "tab")
+
+    def _close_all_windows(self) -> None:
+        result = close_all_windows(self.window_backend, self._self_pid, self.close_all_timeout_seconds)
+        self._last_external_hwnd = None
+        logger.info(
+            "Close all apps: requested=%d closed=%d still_open=%d skipped_own=%d in %.0f ms",
+            result.requested,
+            result.closed,
+            len(result.remaining),
+            result.skipped_own,
+            result.elapsed_seconds * 1000.0,
+        )
+        if result.remaining:
+            titles = ", ".join(window.title for window in result.remaining[:3])
+            logger.warning("Windows still open after %.1fs: %s", self.close_all_timeout_seconds, titles)
 
     def _close_all_apps(self) -> None:
+        if self.window_backend is not None:
+            self._close_all_windows()
+            return
         logger.info("Closing all apps sequence started: iterations=%d", self.close_all_iterations)
         for _ in range(self.close_all_iterations):
             self._close_current_app()
@@ -140,6 +186,11 @@ class DesktopActionExecutor:
     def task_view_active(self) -> bool:
         return self._task_view_active
 
+    @property
+    def external_target(self) -> Optional[int]:
+        # Window that CLOSE_CURRENT_APP and MINIMIZE_TARGET_APP would act on.
+        return self._last_external_hwnd
+
     def _open_task_view(self) -> None:
         if self.os_name == "windows":
             if self._task_view_active:
@@ -206,9 +257,23 @@ class DesktopActionExecutor:
         return _show_window(hwnd, _SW_MINIMIZE)
 
 
+@lru_cache(maxsize=None)
+def _pyautogui():
+    # Imported on first use: the Windows paths go through user32 directly and
+    # never need it, and importing it costs noticeable startup time.
+    try:
+        import pyautogui
+    except Exception:
+        return None
+    pyautogui.FAILSAFE = False
+    pyautogui.PAUSE = 0.05
+    return pyautogui
+
+
 _WINDOWS_VK = {
     "win": 0x5B,
     "alt": 0x12,
+    "shift": 0x10,
     "tab": 0x09,
     "f4": 0x73,
     "left": 0x25,
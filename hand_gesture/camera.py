@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import logging
+import platform
+import time
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import cv2
+
+logger = logging.getLogger(__name__)
+
+_BACKEND_APIS = {
+    "any": cv2.CAP_ANY,
+    "dshow": cv2.CAP_DSHOW,
+    "msmf": cv2.CAP_MSMF,
+    "v4l2": cv2.CAP_V4L2,
+    "avfoundation": cv2.CAP_AVFOUNDATION,
+}
+_AUTO_BACKENDS = {
+    # DirectShow opens much faster than Media Foundation on most webcams and
+    # honours MJPG; MSMF is kept as a fallback.
+    "windows": ("dshow", "msmf", "any"),
+    "linux": ("v4l2", "any"),
+    "darwin": ("avfoundation", "any"),
+}
+
+
+@dataclass(frozen=True)
+class CameraSettings:
+    backend: str
+    fourcc: str
+    width: int
+    height: int
+    fps: float
+    buffer_size: int
+
+
+def _fourcc_to_str(code: float) -> str:
+    value = int(code)
+    if value <= 0:
+        return ""
+    return "".join(chr((value >> (8 * i)) & 0xFF) for i in range(4))
+
+
+def _backend_candidates(backends: Sequence[str]) -> list[str]:
+    candidates: list[str] = []
+    for backend in backends:
+        names = _AUTO_BACKENDS.get(platform.system().lower(), ("any",)) if backend == "auto" else (backend,)
+        for name in names:
+            if name not in _BACKEND_APIS:
+                logger.warning("Unknown camera backend ignored: %s", name)
+                continue
+            if name not in candidates:
+                candidates.append(name)
+    return candidates or ["any"]
+
+
+class CameraCapture:
+    def __init__(
+        self,
+        camera_index: int,
+        width: int,
+        height: int,
+        fps: float,
+        buffer_size: int = 1,
+        backends: Sequence[str] = ("auto",),
+        fourccs: Sequence[str] = ("MJPG", "YUYV"),
+        drain_stale_frames: bool = True,
+        max_drain_frames: int = 4,
+    ):
+        self.camera_index = camera_index
+        self.requested = CameraSettings(
+            backend=",".join(backends),
+            fourcc=",".join(fourccs),
+            width=width,
+            height=height,
+            fps=fps,
+            buffer_size=buffer_size,
+        )
+        self.drain_stale_frames = drain_stale_frames
+        self.max_drain_frames = max(0, max_drain_frames)
+        self.settings: Optional[CameraSettings] = None
+        self.dropped_frames = 0
+        self._fourccs = tuple(fourccs)
+        self._cap: Optional[cv2.VideoCapture] = None
+        self._backends = _backend_candidates(backends)
+        self._open(self._backends)
+
+    def _open(self, backends: Sequence[str]) -> None:
+        for backend in backends:
+            cap = cv2.VideoCapture(self.camera_index, _BACKEND_APIS[backend])
+            if cap.isOpened():
+                self._cap = cap
+                self.settings = self._negotiate(backend)
+                return
+            cap.release()
+            logger.info("Camera %d did not open with backend=%s", self.camera_index, backend)
+        logger.error("Camera %d could not be opened with any backend: %s", self.camera_index, ", ".join(backends))
+
+    def _apply(self, fourcc: Optional[str]) -> None:
+        cap = self._cap
+        # FOURCC has to go first: many UVC cameras only offer 30 FPS at 640x480
+        # and above when they stream MJPG rather than raw YUYV.
+        if fourcc:
+            cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.requested.width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.requested.height)
+        cap.set(cv2.CAP_PROP_FPS, self.requested.fps)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, self.requested.buffer_size)
+
+    def _read_back(self, backend: str) -> CameraSettings:
+        cap = self._cap
+        return CameraSettings(
+            backend=backend,
+            fourcc=_fourcc_to_str(cap.get(cv2.CAP_PROP_FOURCC)),
+            width=int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            height=int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            fps=float(cap.get(cv2.CAP_PROP_FPS)),
+            buffer_size=int(cap.get(cv2.CAP_PROP_BUFFERSIZE)),
+        )
+
+    def _negotiate(self, backend: str) -> CameraSettings:
+        applied: Optional[CameraSettings] = None
+        for fourcc in self._fourccs or (None,):
+            self._apply(fourcc)
+            applied = self._read_back(backend)
+            if not fourcc or applied.fourcc.upper() == fourcc.upper():
+                break
+            logger.info("Camera rejected FOURCC %s (driver reports %r)", fourcc, applied.fourcc)
+
+        mismatches = []
+        if (applied.width, applied.height) != (self.requested.width, self.requested.height):
+            mismatches.append(
+                f"resolution {applied.width}x{applied.height} != {self.requested.width}x{self.requested.height}"
+            )
+        # Some backends report 0 when they cannot query the rate.
+        if applied.fps > 0 and abs(applied.fps - self.requested.fps) > 0.5:
+            mismatches.append(f"fps {applied.fps:.1f} != {self.requested.fps:.1f}")
+        if applied.buffer_size > 0 and applied.buffer_size != self.requested.buffer_size:
+            mismatches.append(f"buffer {applied.buffer_size} != {self.requested.buffer_size}")
+        if self._fourccs and applied.fourcc.upper() not in {code.upper() for code in self._fourccs}:
+            mismatches.append(f"fourcc {applied.fourcc!r} not in {list(self._fourccs)}")
+        for mismatch in mismatches:
+            logger.warning("Camera setting not applied: %s", mismatch)
+        logger.info(
+            "Camera negotiated: backend=%s fourcc=%s %dx%d@%.1f buffer=%d drain=%s",
+            applied.backend,
+            applied.fourcc or "?",
+            applied.width,
+            applied.height,
+            applied.fps,
+            applied.buffer_size,
+            self.drain_stale_frames,
+        )
+        return applied
+
+    @property
+    def frame_interval(self) -> float:
+        fps = self.settings.fps if self.settings and self.settings.fps > 0 else self.requested.fps
+        return 1.0 / max(fps, 1.0)
+
+    def isOpened(self) -> bool:
+        return self._cap is not None and self._cap.isOpened()
+
+    def read(self):
+        if self._cap is None:
+            return False, None
+        if not self.drain_stale_frames:
+            return self._cap.read()
+        return self._read_latest()
+
+    def _read_latest(self):
+        # A grab() that returns almost immediately was served from the driver
+        # queue and is stale; keep grabbing until one has to wait for the
+        # sensor, then decode only that frame.
+        fresh_threshold = self.frame_interval * 0.5
+        for drained in range(self.max_drain_frames + 1):
+            started_at = time.perf_counter()
+            if not self._cap.grab():
+                return False, None
+            if time.perf_counter() - started_at >= fresh_threshold:
+                break
+        self.dropped_frames += drained
+        return self._cap.retrieve()
+
+    def reopen(self) -> bool:
+        # Used after the device disappeared (unplugged, suspended, claimed by
+        # another app); the same backend and format negotiation runs again.
+        self.release()
+        self._cap = None
+        self._open(self._backends)
+        return self.isOpened()
+
+    def release(self) -> None:
+        if self._cap is not None:
+            self._cap.release()
@@ -1,20 +1,109 @@
-from dataclasses import dataclass
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Mapping, Optional
 
 
 @dataclass(frozen=True)
 class RuntimeConfig:
     camera_index: int = 0
+    frame_width: int = 640
+    frame_height: int = 480
+    camera_fps: float = 30.0
+    camera_buffer_size: int = 1
+    camera_backends: tuple[str, ...] = ("auto",)
+    camera_fourccs: tuple[str, ...] = ("MJPG", "YUYV")
+    drain_stale_frames: bool = True
+    max_drain_frames: int = 4
+    capture_failure_threshold: int = 5
+    capture_backoff_initial_seconds: float = 0.1
+    capture_backoff_max_seconds: float = 2.0
+    frame_source: Optional[str] = None
+    frame_source_mode: str = "paced"
+    frame_source_fps: float = 30.0
+    frame_source_read_ahead: int = 8
+    frame_source_loop: bool = False
+    target_fps: float = 0.0
+    power_profile: str = "default"
+    power_saver_fps: float = 12.0
+    power_saver_opencv_threads: int = 1
+    opencv_threads: int = -1
+    capture_cpus: tuple[int, ...] = ()
+    inference_cpus: tuple[int, ...] = ()
+    ui_cpus: tuple[int, ...] = ()
+    camera_indices: tuple[int, ...] = ()
+    source_priorities: tuple[int, ...] = ()
+    vision_workers: int = 0
+    source_queue_size: int = 2
+    source_stale_seconds: float = 0.5
+    vision_backend: str = "solutions"
+    hand_landmarker_model_path: str = "models/hand_landmarker.task"
+    skeleton_style: str = "full"
     max_num_hands: int = 2
     min_detection_confidence: float = 0.8
     min_tracking_confidence: float = 0.8
-    consecutive_frames_required: int = 9
-    action_vote_window: int = 12
+    hand_match_distance: float = 1.5
+    hand_lost_seconds: float = 0.5
+    hand_switch_margin: float = 0.25
+    hand_switch_seconds: float = 0.4
+    detection_interval: int = 1
+    flow_max_fb_error: float = 1.5
+    flow_min_valid_fraction: float = 0.7
+    hold_seconds_required: float = 0.3
+    action_vote_window_seconds: float = 0.4
     action_vote_ratio: float = 0.65
     action_cooldown_seconds: float = 2.0
-    hand_steady_delta: float = 0.02
-    steady_frames_required: int = 6
+    hand_steady_speed: float = 0.6
+    steady_seconds_required: float = 0.2
     close_all_iterations: int = 7
     close_all_step_delay_seconds: float = 0.2
+    close_all_timeout_seconds: float = 3.0
     switch_nav_min_delta: float = 0.1
     switch_nav_cooldown_seconds: float = 0.2
-    switch_nav_frame_deadzone: float = 0.006
+    switch_nav_deadzone_speed: float = 0.18
+    dynamic_gestures_enabled: bool = False
+    dynamic_gesture_point: str = "palm_center"
+    dynamic_step_palm_scales: float = 0.2
+    dynamic_idle_reset_seconds: float = 0.35
+    dynamic_cooldown_seconds: float = 0.8
+    dynamic_group_degrees: float = 0.0
+    pose_classifier: str = "heuristic"
+    pose_templates_path: str = "pose_templates.npy"
+    pose_template_max_distance: float = 1.5
+    pose_template_fallback: bool = True
+    pose_memo_tolerance: float = 0.1
+    macros_path: Optional[str] = None
+    macro_max_gap_seconds: float = 1.5
+    session_record_path: Optional[str] = None
+    video_record_path: Optional[str] = None
+    video_record_annotated: bool = True
+    video_record_queue_size: int = 8
+    video_record_codec: str = "mp4v"
+    flight_recorder_seconds: float = 10.0
+    flight_recorder_dir: str = "flight_dumps"
+    flight_recorder_hotkey: str = "f"
+    publish_target: Optional[str] = None
+    publish_max_rate_hz: float = 0.0
+    metrics_port: Optional[int] = None
+    metrics_host: str = "127.0.0.1"
+
+
+def runtime_config_from_dict(data: Mapping[str, Any]) -> RuntimeConfig:
+    known = {item.name for item in fields(RuntimeConfig)}
+    unknown = sorted(set(data) - known)
+    if unknown:
+        raise ValueError(f"Unknown RuntimeConfig keys: {', '.join(unknown)}")
+    values = {key: tuple(value) if isinstance(value, list) else value for key, value in data.items()}
+    return RuntimeConfig(**values)
+
+
+def load_runtime_config(path: str) -> RuntimeConfig:
+    with open(path, "r", encoding="utf-8") as handle:
+        return runtime_config_from_dict(json.load(handle))
+
+
+def save_runtime_config(config: RuntimeConfig, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(asdict(config), handle, indent=2, sort_keys=True)
+        handle.write("\n")
@@ -2,15 +2,31 @@ from __future__ import annotations
 
 import logging
 import time
-from collections import Counter, deque
-from typing import Optional
+from collections import Counter
+from typing import List, Optional, Tuple, Union
 
 import cv2
+import numpy as np
 
 from hand_gesture.actions import DesktopActionExecutor
+from hand_gesture.camera import CameraCapture
 from hand_gesture.config import RuntimeConfig
-from hand_gesture.effects import apply_visual_effect
-from hand_gesture.gestures import GestureAction, action_label, map_action
+from hand_gesture.effects import EffectEngine, overlay_modes
+from hand_gesture.filesource import FileFrameSource
+from hand_gesture.flight import FlightRecorder
+from hand_gesture.gestures import DESTRUCTIVE_ACTIONS, action_label
+from hand_gesture.landmarker import TasksVisionEngine, create_vision_engine
+from hand_gesture.memo import MemoizedPoseClassifier
+from hand_gesture.metrics import GestureMetrics, MetricsServer
+from hand_gesture.multicam import MultiCameraPipeline
+from hand_gesture.pacing import FramePacer, apply_power_profile, effective_target_fps
+from hand_gesture.publisher import StatePublisher
+from hand_gesture.recognizer import GestureRecognizer
+from hand_gesture.recording import FrameRecorder, frame_record
+from hand_gesture.replay import SessionRecorder
+from hand_gesture.startup import StartupTimer
+from hand_gesture.supervisor import STATE_LOST, STATE_RECOVERED, CaptureStatus, CaptureSupervisor
+from hand_gesture.threads import apply_thread_settings, pin_ui_thread
 from hand_gesture.ui import draw_overlay
 from hand_gesture.vision import VisionEngine
 
@@ -20,238 +36,305 @@ logger = logging.getLogger(__name__)
 class GestureController:
     def __init__(self, config: Optional[RuntimeConfig] = None):
         self.config = config or RuntimeConfig()
-        self.cap = cv2.VideoCapture(self.config.camera_index)
-        self.vision = VisionEngine(
-            max_num_hands=self.config.max_num_hands,
-            min_detection_confidence=self.config.min_detection_confidence,
-            min_tracking_confidence=self.config.min_tracking_confidence,
-        )
-        self.executor = DesktopActionExecutor(
-            close_all_iterations=self.config.close_all_iterations,
-            close_all_step_delay_seconds=self.config.close_all_step_delay_seconds,
-        )
-        self.action_history: deque[Optional[GestureAction]] = deque(
-            maxlen=self.config.action_vote_window
-        )
-        self.candidate_action: Optional[GestureAction] = None
-        self.consecutive_count = 0
-        self.last_action_time = 0.0
+        self.startup = StartupTimer()
+        apply_power_profile(self.config)
+        apply_thread_settings(self.config)
+        self.pacer = FramePacer.from_config(self.config)
+        self.vision: Optional[Union[VisionEngine, TasksVisionEngine]] = None
+        self.cap: Optional[Union[CaptureSupervisor, FileFrameSource]] = None
+        self.pipeline: Optional[MultiCameraPipeline] = None
+        if len(self.config.camera_indices) > 1 and not self.config.frame_source:
+            with self.startup.phase("camera open"):
+                self.pipeline = MultiCameraPipeline.from_config(self.config.camera_indices, self.config, self.startup)
+        else:
+            self.vision = create_vision_engine(self.config, self.startup)
+            self.vision.start_warm_up()
+            with self.startup.phase("camera open"):
+                if self.config.frame_source:
+                    self.cap = FileFrameSource.from_config(self.config)
+                else:
+                    camera = CameraCapture(
+                        camera_index=self.config.camera_indices[0] if self.config.camera_indices else self.config.camera_index,
+                        width=self.config.frame_width,
+                        height=self.config.frame_height,
+                        fps=self.config.camera_fps,
+                        buffer_size=self.config.camera_buffer_size,
+                        backends=self.config.camera_backends,
+                        fourccs=self.config.camera_fourccs,
+                        drain_stale_frames=self.config.drain_stale_frames,
+                        max_drain_frames=self.config.max_drain_frames,
+                    )
+                    self.cap = CaptureSupervisor.from_config(camera, self.config, on_status=self._on_capture_status)
+        with self.startup.phase("executor init"):
+            self.executor = DesktopActionExecutor(
+                close_all_iterations=self.config.close_all_iterations,
+                close_all_step_delay_seconds=self.config.close_all_step_delay_seconds,
+                close_all_timeout_seconds=self.config.close_all_timeout_seconds,
+            )
+        # Decisions (stabilizers, motion gestures, macros, cooldowns, Task
+        # View navigation) live in the recognizer; the controller handles
+        # capture, side effects and the UI.
+        self.recognizer = GestureRecognizer.from_config(self.config, executor=self.executor)
+        modes = overlay_modes()
+        self.effects = EffectEngine(modes, default=modes[0])
         self.status_text = "Ready"
-        self.last_index_tip: Optional[tuple[float, float]] = None
-        self.last_palm_center: Optional[tuple[float, float]] = None
-        self.steady_frames = 0
-        self.last_switch_nav_time = 0.0
-        self.switch_motion_accum = (0.0, 0.0)
         self.frame_index = 0
-
-    def _update_hand_steadiness(self, hand_info) -> None:
-        if hand_info is None:
-            self.last_palm_center = None
-            self.steady_frames = 0
-            return
-
-        current_center = hand_info.palm_center
-        if self.last_palm_center is None:
-            self.last_palm_center = current_center
-            self.steady_frames = 1
-            return
-
-        dx = current_center[0] - self.last_palm_center[0]
-        dy = current_center[1] - self.last_palm_center[1]
-        if (dx * dx + dy * dy) ** 0.5 <= self.config.hand_steady_delta:
-            self.steady_frames += 1
-        else:
-            self.steady_frames = 0
-        self.last_palm_center = current_center
-
-    def _vote_ratio(self, action: GestureAction) -> float:
-        if not self.action_history:
-            return 0.0
-        matches = sum(1 for item in self.action_history if item == action)
-        return matches / len(self.action_history)
-
-    def _update_stability(self, action: Optional[GestureAction]) -> None:
-        self.action_history.append(action)
-        if action is None:
-            if self.candidate_action is not None:
-                logger.debug("Stability reset: previous_candidate=%s", self.candidate_action.value)
-            self.candidate_action = None
-            self.consecutive_count = 0
-            return
-        if action == self.candidate_action:
-            self.consecutive_count += 1
-            logger.debug(
-                "Stability tick: action=%s consecutive=%d/%d vote_ratio=%.2f",
-                action.value,
-                self.consecutive_count,
-                self.config.consecutive_frames_required,
-                self._vote_ratio(action),
+        self.last_stats_time = 0.0
+        self.last_result = None
+        self.capture_state = "ok"
+        self.status_image: Optional[np.ndarray] = None
+        self.session_recorder: Optional[SessionRecorder] = None
+        if self.config.session_record_path:
+            self.session_recorder = SessionRecorder(self.config.session_record_path)
+            logger.info("Recording session to %s", self.config.session_record_path)
+        self.frame_recorder: Optional[FrameRecorder] = None
+        if self.config.video_record_path:
+            self.frame_recorder = FrameRecorder.from_config(
+                self.config, fps=effective_target_fps(self.config) or self.config.camera_fps
             )
-        else:
-            self.candidate_action = action
-            self.consecutive_count = 1
-            logger.debug("New stability candidate: action=%s", action.value)
-
-    def _try_execute_action(self) -> None:
-        if self.candidate_action is None:
-            return
-        now = time.time()
-        cooldown_elapsed = now - self.last_action_time
-        if self.consecutive_count < self.config.consecutive_frames_required:
-            return
-        vote_ratio = self._vote_ratio(self.candidate_action)
-        if vote_ratio < self.config.action_vote_ratio:
-            self.status_text = f"Stabilizing {vote_ratio:.0%}"
-            return
-        if self.steady_frames < self.config.steady_frames_required:
-            self.status_text = f"Hold still {self.steady_frames}/{self.config.steady_frames_required}"
-            return
-        cooldown_required = self.config.action_cooldown_seconds
-        if (
-            self.candidate_action == GestureAction.SELECT_TASK_WINDOW
-            and self.executor.task_view_active
-        ):
-            cooldown_required = 0.0
-
-        if cooldown_elapsed < cooldown_required:
-            self.status_text = f"Cooldown {cooldown_required - cooldown_elapsed:.1f}s"
-            logger.debug(
-                "Execution blocked by cooldown: action=%s remaining=%.2fs",
-                self.candidate_action.value,
-                cooldown_required - cooldown_elapsed,
+        self.flight_recorder: Optional[FlightRecorder] = None
+        self.flight_dump_reason: Optional[str] = None
+        if self.config.flight_recorder_seconds > 0.0:
+            if len(self.config.flight_recorder_hotkey) != 1:
+                raise ValueError("flight_recorder_hotkey must be a single key")
+            self.flight_recorder = FlightRecorder.from_config(
+                self.config, fps=effective_target_fps(self.config) or self.config.camera_fps
+            )
+        self.publisher: Optional[StatePublisher] = None
+        if self.config.publish_target:
+            self.publisher = StatePublisher.from_config(self.config)
+        self.metrics: Optional[GestureMetrics] = None
+        self.metrics_server: Optional[MetricsServer] = None
+        if self.config.metrics_port is not None:
+            self._start_metrics()
+
+    def _start_metrics(self) -> None:
+        self.metrics = GestureMetrics()
+        if self.pipeline is not None:
+            self.pipeline.inference_observer = self.metrics.inference_time
+            pipeline = self.pipeline
+            self.metrics.dropped_frames_source(
+                lambda: [((str(item.camera_index),), item.dropped_frames) for item in pipeline.stats()]
             )
-            return
-
-        logger.info("Executing action: %s", self.candidate_action.value)
-        ok = self.executor.execute(self.candidate_action)
-        if ok:
-            self.last_action_time = now
-            self.status_text = f"Executed: {action_label(self.candidate_action)}"
-            logger.info("Action executed successfully: %s", self.candidate_action.value)
         else:
-            self.status_text = self.executor.last_error or "Action failed"
-            logger.error("Action failed: %s", self.status_text)
-
-        self.consecutive_count = 0
-        self.candidate_action = None
-
-    def _handle_task_view_navigation(self, hand_info) -> None:
-        if not self.executor.task_view_active:
-            self.last_index_tip = None
-            self.switch_motion_accum = (0.0, 0.0)
-            return
-
-        if hand_info is None:
-            self.last_index_tip = None
-            self.switch_motion_accum = (0.0, 0.0)
-            return
-
-        if hand_info.finger_state != (0, 1, 0, 0, 0):
-            self.last_index_tip = None
-            self.switch_motion_accum = (0.0, 0.0)
-            return
-
-        current_tip = hand_info.index_tip
-        if self.last_index_tip is None:
-            self.last_index_tip = current_tip
-            return
-
-        # Freeze navigation while fist selection is being stabilized.
-        if self.candidate_action == GestureAction.SELECT_TASK_WINDOW:
-            self.last_index_tip = current_tip
-            return
-
-        frame_dx = current_tip[0] - self.last_index_tip[0]
-        frame_dy = current_tip[1] - self.last_index_tip[1]
-        if abs(frame_dx) < self.config.switch_nav_frame_deadzone:
-            frame_dx = 0.0
-        if abs(frame_dy) < self.config.switch_nav_frame_deadzone:
-            frame_dy = 0.0
-        accum_dx = self.switch_motion_accum[0] + frame_dx
-        accum_dy = self.switch_motion_accum[1] + frame_dy
-        self.switch_motion_accum = (accum_dx, accum_dy)
-        logger.debug(
-            "TaskView motion: frame_dx=%.4f frame_dy=%.4f accum_dx=%.4f accum_dy=%.4f",
-            frame_dx,
-            frame_dy,
-            accum_dx,
-            accum_dy,
-        )
-
+            cap = self.cap
+            self.metrics.dropped_frames_source(lambda: [((str(cap.camera_index),), cap.dropped_frames)])
+        self.metrics.pose_memo_source(self._memo_counts)
+        try:
+            self.metrics_server = MetricsServer.from_config(self.metrics.registry, self.config).start()
+        except OSError:
+            logger.exception("Could not serve metrics on %s:%s", self.config.metrics_host, self.config.metrics_port)
+
+    def _memo_counts(self) -> List[Tuple[Tuple[str], int]]:
+        classifier = self.recognizer.pose_classifier
+        if not isinstance(classifier, MemoizedPoseClassifier):
+            return []
+        return [(("hit",), classifier.hits), (("miss",), classifier.misses)]
+
+    def _on_capture_status(self, status: CaptureStatus) -> None:
+        previous = self.capture_state
+        self.capture_state = status.state
+        self.status_text = status.message
+        if status.state == STATE_RECOVERED:
+            # Only the camera was reopened; the MediaPipe graph is kept and
+            # just loses the stale optical-flow track.
+            self.vision.reset_tracking()
+        if self.publisher is not None and status.state != previous:
+            name = "camera_lost" if status.state == STATE_LOST else "camera_recovered"
+            self.publisher.publish_event(time.time(), name)
+
+    def _wait_for_source(self, window_name: str) -> bool:
+        # Called when no frame came back. While the camera is lost the window
+        # keeps showing the status and the loop sleeps in waitKey for the
+        # backoff (at most 100 ms at a time, so 'q' still quits promptly).
+        delay = 0.0
+        if self.cap is not None and getattr(self.cap, "lost", False):
+            delay = self.cap.retry_delay()
+            height, width = self.config.frame_height, self.config.frame_width
+            if self.status_image is None or self.status_image.shape[:2] != (height, width):
+                self.status_image = np.zeros((height, width, 3), dtype=np.uint8)
+            self.status_image[:] = 0
+            cv2.putText(self.status_image, self.status_text, (20, height // 2), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 200, 255), 2)
+            cv2.imshow(window_name, self.status_image)
+        elif self.pipeline is None:
+            return False
+        return cv2.waitKey(max(1, min(int(delay * 1000), 100))) & 0xFF == ord("q")
+
+    def _source_open(self) -> bool:
+        if self.pipeline is not None:
+            return self.pipeline.isOpened()
+        return self.cap.isOpened()
+
+    def _wait_until_ready(self) -> None:
+        if self.pipeline is not None:
+            self.pipeline.wait_until_ready()
+            self.pipeline.start()
+        else:
+            self.vision.wait_until_ready()
+
+    def _next_processed_frame(self):
+        if self.pipeline is not None:
+            if not self.pipeline.wait_for_result():
+                return None
+            result = self.pipeline.merged()
+            if result is None or result is self.last_result:
+                return None
+            self.last_result = result
+            return result.timestamp, result.image, result.hand_info
+        self.pacer.wait()
+        ok, frame = self.cap.read()
+        if not ok:
+            self.pacer.reset()
+            return None
+        # Recorded frames carry their own timing, so holds and cooldowns
+        # span the same footage in paced and fast mode.
+        frame_time = self.cap.timestamp if isinstance(self.cap, FileFrameSource) else time.time()
+        started = time.perf_counter()
+        image, hand_info = self.vision.process_frame(frame, frame_time)
+        if self.metrics is not None:
+            self.metrics.inference_time(self.cap.camera_index, time.perf_counter() - started)
+        return frame_time, image, hand_info
+
+    def _source_status(self) -> str:
+        if self.pipeline is None:
+            return ""
+        stats = self.pipeline.stats()
         now = time.time()
-        if now - self.last_switch_nav_time < self.config.switch_nav_cooldown_seconds:
-            self.last_index_tip = current_tip
-            return
-
-        threshold = self.config.switch_nav_min_delta
-        direction = None
-
-        if abs(accum_dx) >= abs(accum_dy) and abs(accum_dx) >= threshold:
-            direction = "right" if accum_dx > 0 else "left"
-        elif abs(accum_dy) > abs(accum_dx) and abs(accum_dy) >= threshold:
-            direction = "down" if accum_dy > 0 else "up"
-
-        if direction and self.executor.navigate_task_view(direction):
-            self.last_switch_nav_time = now
-            self.status_text = f"Task View move: {direction}"
-            self.switch_motion_accum = (0.0, 0.0)
-            logger.info("Task View navigation: direction=%s", direction)
-
-        self.last_index_tip = current_tip
+        if now - self.last_stats_time >= 5.0:
+            self.last_stats_time = now
+            for item in stats:
+                logger.info(
+                    "Camera %d: capture=%.1ffps processed=%.1ffps queue=%d dropped=%d priority=%d",
+                    item.camera_index,
+                    item.capture_fps,
+                    item.processed_fps,
+                    item.queue_depth,
+                    item.dropped_frames,
+                    item.priority,
+                )
+        return " | " + " ".join(
+            f"cam{item.camera_index}{'*' if item.source_id == self.pipeline.active_source else ''} "
+            f"{item.processed_fps:.0f}fps q{item.queue_depth}"
+            for item in stats
+        )
 
     def run(self) -> None:
-        if not self.cap.isOpened():
+        if not self._source_open():
             logger.error("Could not open webcam.")
             self._cleanup()
             return
 
         window_name = "Hand Gesture Recognition"
-        cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
-        cv2.setWindowProperty(window_name, cv2.WND_PROP_ASPECT_RATIO, cv2.WINDOW_FREERATIO)
+        with self.startup.phase("window create"):
+            cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
+            cv2.setWindowProperty(window_name, cv2.WND_PROP_ASPECT_RATIO, cv2.WINDOW_FREERATIO)
+        try:
+            self._wait_until_ready()
+        except RuntimeError:
+            logger.exception("Vision engine failed to start.")
+            self._cleanup()
+            return
+        # Every long-lived worker is running by now and keeps its own mask.
+        pin_ui_thread(self.config)
         logger.info("Hand Gesture Recognition started. Press 'q' to quit.")
-        while self.cap.isOpened():
-            ok, frame = self.cap.read()
-            if not ok:
-                logger.warning("Ignoring empty camera frame.")
+        while self._source_open():
+            processed = self._next_processed_frame()
+            if processed is None:
+                if self._wait_for_source(window_name):
+                    logger.info("Quit requested via keyboard.")
+                    break
                 continue
 
+            frame_time, image, hand_info = processed
             self.frame_index += 1
+            if self.vision is not None:
+                self.recognizer.track_hands(self.vision.hands, frame_time)
             self.executor.refresh_external_target()
-            image, hand_info = self.vision.process_frame(frame)
+            self.startup.frame_processed(hand_info is not None)
+            if self.metrics is not None:
+                self.metrics.frame(frame_time, hand_info is not None)
             finger_count = hand_info.finger_count if hand_info else 0
-            action = map_action(hand_info) if hand_info else None
-            if self.executor.task_view_active and action not in {
-                GestureAction.OPEN_TASK_VIEW,
-                GestureAction.SELECT_TASK_WINDOW,
-            }:
-                action = None
-            self._update_hand_steadiness(hand_info)
-            vote_snapshot = Counter(item for item in self.action_history if item is not None)
+            # Votes before this frame's, as the flight recorder shows them.
+            vote_snapshot = Counter(item for _, item in self.recognizer.stabilizer.action_history if item is not None)
+            event = self.recognizer.update(frame_time, hand_info)
+            stabilizer = self.recognizer.stabilizer
+            action = event.action
             logger.debug(
-                "Frame %d: finger_count=%d finger_state=%s mapped_action=%s steady_frames=%d vote_snapshot=%s task_view_active=%s",
+                "Frame %d: finger_count=%d finger_state=%s mapped_action=%s steady_seconds=%.3f vote_snapshot=%s task_view_active=%s",
                 self.frame_index,
                 finger_count,
                 hand_info.finger_state if hand_info else None,
                 action.value if action else None,
-                self.steady_frames,
+                stabilizer.steady_seconds,
                 {key.value: value for key, value in vote_snapshot.items()},
                 self.executor.task_view_active,
             )
-
-            self._update_stability(action)
-            self._try_execute_action()
-            self._handle_task_view_navigation(hand_info)
-
-            image, mode_text = apply_visual_effect(image, finger_count)
+            if event.status:
+                self.status_text = event.status
+            for result in event.results:
+                if self.metrics is not None:
+                    self.metrics.action(result.action, result.ok, result.error)
+                if result.action in DESTRUCTIVE_ACTIONS:
+                    # Dumped once this frame is in the flight recorder.
+                    prefix = f"macro {result.macro}: " if result.macro else ""
+                    self.flight_dump_reason = f"{prefix}{result.action.value} {'executed' if result.ok else 'failed'}"
+            if event.cooldown_blocked is not None and self.metrics is not None:
+                self.metrics.cooldown_blocked(event.cooldown_blocked)
+            decision = event.decisions[-1] if event.decisions else None
+            if self.session_recorder is not None:
+                self.session_recorder.write(frame_time, hand_info, decision)
+            if self.flight_recorder is not None:
+                self.flight_recorder.record(
+                    frame_time,
+                    hand_info,
+                    action,
+                    stabilizer.candidate_action,
+                    decision,
+                    vote_snapshot.items(),
+                    hold_seconds=stabilizer.hold_seconds,
+                    steady_seconds=stabilizer.steady_seconds,
+                    task_view_active=self.executor.task_view_active,
+                    target_window=self.executor.external_target,
+                    status=self.status_text,
+                    error=self.executor.last_error,
+                )
+                if self.flight_dump_reason is not None:
+                    self.flight_recorder.dump(self.flight_dump_reason)
+                    self.flight_dump_reason = None
+            if self.publisher is not None:
+                self.publisher.publish_frame(frame_time, hand_info)
+                for name in event.decisions:
+                    self.publisher.publish_event(frame_time, name)
+
+            record = None
+            if self.frame_recorder is not None:
+                record = frame_record(
+                    hand_info,
+                    decision,
+                    action=action.value if action else None,
+                    finger_count=finger_count,
+                    hold_ms=int(stabilizer.hold_seconds * 1000),
+                    steady_seconds=round(stabilizer.steady_seconds, 3),
+                    status=self.status_text,
+                )
+                if not self.config.video_record_annotated:
+                    self.frame_recorder.submit(frame_time, image, record)
+            image, mode_text = self.effects.apply(image, finger_count)
             draw_overlay(
                 image=image,
                 finger_count=finger_count,
                 mode_text=mode_text,
                 action_text=action_label(action),
-                stability_progress=self.consecutive_count,
-                stability_target=self.config.consecutive_frames_required,
-                status_text=f"{self.status_text} | Steady {self.steady_frames}/{self.config.steady_frames_required}",
+                stability_progress=int(stabilizer.hold_seconds * 1000),
+                stability_target=int(self.config.hold_seconds_required * 1000),
+                status_text=(
+                    f"{self.status_text} | Steady "
+                    f"{stabilizer.steady_seconds:.1f}/{self.config.steady_seconds_required:.1f}s"
+                    f"{self._source_status()}"
+                ),
             )
+            if record is not None and self.config.video_record_annotated:
+                self.frame_recorder.submit(frame_time, image, record)
 
             display_image = image
             try:
@@ -261,15 +344,65 @@ class GestureController:
             except cv2.error:
                 pass
             cv2.imshow(window_name, display_image)
-            if cv2.waitKey(1) & 0xFF == ord("q"):
+            key = cv2.waitKey(1) & 0xFF
+            if key == ord("q"):
                 logger.info("Quit requested via keyboard.")
                 break
+            if self.flight_recorder is not None and key == ord(self.config.flight_recorder_hotkey):
+                self.flight_recorder.dump("hotkey")
 
         self._cleanup()
 
     def _cleanup(self) -> None:
-        logger.info("Cleaning up camera, vision engine, and UI windows.")
-        if self.cap is not None:
+        if self.pipeline is not None:
+            logger.info("Cleaning up cameras, vision engines, and UI windows.")
+            for item in self.pipeline.stats():
+                logger.info("Camera %d: dropped %d frames behind inference", item.camera_index, item.dropped_frames)
+            for source in self.pipeline.sources:
+                if source.pacer is not None:
+                    source.pacer.log_stats(f"Camera {source.camera_index}")
+            self.pipeline.release()
+        else:
+            logger.info(
+                "Cleaning up camera, vision engine, and UI windows. Stale frames drained: %d, detector runs: %d, flow-tracked frames: %d",
+                self.cap.dropped_frames,
+                self.vision.detector_runs,
+                self.vision.tracked_frames,
+            )
+            self.pacer.log_stats("Frame loop")
+            if isinstance(self.cap, FileFrameSource):
+                self.cap.log_stats()
+            if isinstance(self.vision, TasksVisionEngine):
+                logger.info(
+                    "HandLandmarker: %d frames submitted, %d results, mean latency %.1f ms",
+                    self.vision.detector_runs,
+                    self.vision.results_received,
+                    self.vision.mean_latency_ms,
+                )
             self.cap.release()
-        self.vision.close()
+            self.vision.close()
+        classifier = self.recognizer.pose_classifier
+        if isinstance(classifier, MemoizedPoseClassifier):
+            logger.info("Pose template memo: hits=%d misses=%d", classifier.hits, classifier.misses)
+        if self.publisher is not None:
+            logger.info(
+                "Hand-state publisher closed: sent=%d dropped=%d throttled=%d",
+                self.publisher.sent,
+                self.publisher.dropped,
+                self.publisher.throttled,
+            )
+            self.publisher.close()
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+        if self.session_recorder is not None:
+            self.session_recorder.close()
+            logger.info(
+                "Session recording saved: %s (%d frames)",
+                self.session_recorder.path,
+                self.session_recorder.frames_written,
+            )
+        if self.frame_recorder is not None:
+            self.frame_recorder.close()
+        if self.flight_recorder is not None:
+            self.flight_recorder.close()
         cv2.destroyAllWindows()
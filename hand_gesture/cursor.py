@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+Point = Tuple[float, float]
+
+
+class ConstantVelocityKalman:
+    def __init__(self, process_noise: float = 100000.0, measurement_noise: float = 16.0):
+        # process_noise is the white-acceleration spectral density (px^2/s^3),
+        # measurement_noise the fingertip variance per frame (px^2).
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self.state: Optional[np.ndarray] = None
+        self.covariance = np.eye(4)
+        self.timestamp = 0.0
+
+    def reset(self) -> None:
+        self.state = None
+
+    def _transition(self, dt: float) -> Tuple[np.ndarray, np.ndarray]:
+        transition = np.eye(4)
+        transition[0, 2] = transition[1, 3] = dt
+        q = self.process_noise
+        block = np.array([[dt ** 3 / 3.0, dt ** 2 / 2.0], [dt ** 2 / 2.0, dt]]) * q
+        noise = np.zeros((4, 4))
+        noise[np.ix_([0, 2], [0, 2])] = block
+        noise[np.ix_([1, 3], [1, 3])] = block
+        return transition, noise
+
+    def update(self, point: Point, timestamp: float) -> None:
+        measurement = np.asarray(point, dtype=float)
+        if self.state is None:
+            self.state = np.array([measurement[0], measurement[1], 0.0, 0.0])
+            self.covariance = np.diag([self.measurement_noise, self.measurement_noise, 1e6, 1e6])
+            self.timestamp = timestamp
+            return
+        dt = max(timestamp - self.timestamp, 1e-4)
+        transition, noise = self._transition(dt)
+        state = transition @ self.state
+        covariance = transition @ self.covariance @ transition.T + noise
+        innovation = measurement - state[:2]
+        innovation_cov = covariance[:2, :2] + np.eye(2) * self.measurement_noise
+        gain = covariance[:, :2] @ np.linalg.inv(innovation_cov)
+        self.state = state + gain @ innovation
+        self.covariance = (np.eye(4) - gain @ np.eye(2, 4)) @ covariance
+        self.timestamp = timestamp
+
+    def predict(self, timestamp: float, velocity_scale: float = 1.0) -> Optional[Point]:
+        if self.state is None:
+            return None
+        dt = (timestamp - self.timestamp) * velocity_scale
+        return (
+            float(self.state[0] + self.state[2] * dt),
+            float(self.state[1] + self.state[3] * dt),
+        )
+
+    def speed(self) -> float:
+        if self.state is None:
+            return 0.0
+        return float(np.hypot(self.state[2], self.state[3]))
+
+
+class PredictiveCursor:
+    def __init__(
+        self,
+        move: Callable[[float, float], None],
+        rate_hz: float = 120.0,
+        lead_seconds: float = 0.05,
+        max_extrapolation_seconds: float = 0.12,
+        min_move_px: float = 0.5,
+        rest_speed_px: float = 80.0,
+        full_speed_px: float = 400.0,
+        process_noise: float = 100000.0,
+        measurement_noise: float = 16.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.move = move
+        self.interval = 1.0 / rate_hz
+        # Camera exposure, transfer and inference put the newest fingertip
+        # sample this far behind the hand; the cursor is drawn that far ahead.
+        self.lead_seconds = lead_seconds
+        self.max_extrapolation_seconds = max_extrapolation_seconds
+        self.min_move_px = min_move_px
+        # Below rest_speed_px (px/s) the velocity estimate is mostly noise and
+        # extrapolating it makes a resting cursor wander; prediction fades in
+        # up to full_speed_px.
+        self.rest_speed_px = rest_speed_px
+        self.full_speed_px = full_speed_px
+        self.clock = clock
+        self.filter = ConstantVelocityKalman(process_noise, measurement_noise)
+        self.moves = 0
+        self._lock = threading.Lock()
+        self._held = False
+        self._last_position: Optional[Point] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "PredictiveCursor":
+        self._thread = threading.Thread(target=self._run, name="cursor", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+    def update(self, point: Point, timestamp: float) -> None:
+        with self._lock:
+            self.filter.update(point, timestamp)
+
+    def hold(self, held: bool) -> None:
+        # While a click is being made the fingers shift; the cursor must not
+        # follow them off the target.
+        with self._lock:
+            if held and not self._held and self._last_position is not None:
+                self.filter.reset()
+                self.filter.update(self._last_position, self.clock())
+            self._held = held
+
+    def release(self) -> None:
+        with self._lock:
+            self.filter.reset()
+            self._held = False
+            self._last_position = None
+
+    def step(self, now: float) -> Optional[Point]:
+        with self._lock:
+            if self._held or self.filter.state is None:
+                return None
+            horizon = min(now - self.filter.timestamp + self.lead_seconds, self.max_extrapolation_seconds)
+            span = max(self.full_speed_px - self.rest_speed_px, 1e-9)
+            scale = min(max((self.filter.speed() - self.rest_speed_px) / span, 0.0), 1.0)
+            position = self.filter.predict(self.filter.timestamp + max(horizon, 0.0), scale)
+            last = self._last_position
+            if last is not None and abs(position[0] - last[0]) < self.min_move_px and abs(position[1] - last[1]) < self.min_move_px:
+                return None
+            self._last_position = position
+        self.move(position[0], position[1])
+        self.moves += 1
+        return position
+
+    def _run(self) -> None:
+        next_tick = time.perf_counter()
+        while not self._stop.is_set():
+            try:
+                self.step(self.clock())
+            except Exception:
+                logger.exception("Cursor update failed")
+            next_tick += self.interval
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                self._stop.wait(delay)
+            else:
+                next_tick = time.perf_counter()
@@ -0,0 +1,507 @@
+from __future__ import annotations
+
+import logging
+import math
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from hand_gesture.config import RuntimeConfig
+from hand_gesture.gestures import GestureAction, HandInfo
+
+logger = logging.getLogger(__name__)
+
+Direction = Tuple[float, float]
+
+_INF = float("inf")
+
+
+@dataclass(frozen=True)
+class MotionTemplate:
+    name: str
+    action: GestureAction
+    directions: Tuple[Direction, ...]
+    # Mean per-point cost (1 - cos of the angle error) accepted for a match.
+    threshold: float
+    # Minimum number of input steps the match has to span.
+    min_steps: int
+
+    @property
+    def max_cost(self) -> float:
+        return self.threshold * len(self.directions)
+
+
+def _unit(angle: float) -> Direction:
+    return (math.cos(angle), math.sin(angle))
+
+
+def swipe_template(
+    action: GestureAction,
+    angle_degrees: float,
+    points: int = 8,
+    threshold: float = 0.12,
+    min_steps: int = 5,
+    name: Optional[str] = None,
+) -> MotionTemplate:
+    direction = _unit(math.radians(angle_degrees))
+    return MotionTemplate(
+        name=name or f"{action.value}@{angle_degrees:g}",
+        action=action,
+        directions=(direction,) * points,
+        threshold=threshold,
+        min_steps=min_steps,
+    )
+
+
+def circle_template(
+    action: GestureAction,
+    clockwise: bool,
+    start_degrees: float,
+    points: int = 16,
+    sweep_degrees: float = 330.0,
+    threshold: float = 0.2,
+    min_steps: int = 10,
+    name: Optional[str] = None,
+) -> MotionTemplate:
+    # Image y grows downwards, so an increasing tangent angle is clockwise on screen.
+    sign = 1.0 if clockwise else -1.0
+    start = math.radians(start_degrees)
+    sweep = math.radians(sweep_degrees)
+    directions = tuple(_unit(start + sign * sweep * idx / (points - 1)) for idx in range(points))
+    return MotionTemplate(
+        name=name or f"{action.value}@{start_degrees:g}",
+        action=action,
+        directions=directions,
+        threshold=threshold,
+        min_steps=min_steps,
+    )
+
+
+def default_templates() -> List[MotionTemplate]:
+    templates = [
+        swipe_template(GestureAction.SWIPE_RIGHT, 0.0),
+        swipe_template(GestureAction.SWIPE_DOWN, 90.0),
+        swipe_template(GestureAction.SWIPE_LEFT, 180.0),
+        swipe_template(GestureAction.SWIPE_UP, 270.0),
+    ]
+    for start in (0.0, 90.0, 180.0, 270.0):
+        templates.append(circle_template(GestureAction.CIRCLE_CLOCKWISE, True, start))
+        templates.append(circle_template(GestureAction.CIRCLE_COUNTERCLOCKWISE, False, start))
+    return templates
+
+
+@dataclass(frozen=True)
+class MotionMatch:
+    template: MotionTemplate
+    cost: float
+    steps: int
+    end_step: int
+
+
+def _angle(direction: Direction) -> float:
+    return math.atan2(direction[1], direction[0]) % (2.0 * math.pi)
+
+
+def _wrap(angle: float) -> float:
+    return (angle + math.pi) % (2.0 * math.pi) - math.pi
+
+
+class _TemplateGroup:
+    # Templates of the same length whose directions stay within a narrow arc
+    # at every point. The arc gives a lower bound on each member's step cost
+    # (as LB_Keogh's envelope does for a set of series), so one column over
+    # the bounds stands in for all members: a member cell can only be live
+    # where the group's cell is, at no lower cost.
+    def __init__(self, index: int, template: MotionTemplate):
+        self.members: List[int] = [index]
+        self.bound = template.max_cost
+        self.min_steps = template.min_steps
+        self.threshold = template.threshold
+        self._reference = [_angle(direction) for direction in template.directions]
+        self._low = [0.0] * len(self._reference)
+        self._high = [0.0] * len(self._reference)
+        self.centers: List[Direction] = list(template.directions)
+        self.first_angle = self._reference[0]
+        self.first_width = 0.0
+        self._cos_width = [1.0] * len(self._reference)
+        self._sin_width = [0.0] * len(self._reference)
+
+    def try_add(self, index: int, template: MotionTemplate, max_width: float) -> bool:
+        if len(template.directions) != len(self._reference):
+            return False
+        offsets = [_wrap(_angle(direction) - ref) for direction, ref in zip(template.directions, self._reference)]
+        low = [min(a, b) for a, b in zip(self._low, offsets)]
+        high = [max(a, b) for a, b in zip(self._high, offsets)]
+        if any(hi - lo > 2.0 * max_width for lo, hi in zip(low, high)):
+            return False
+        self.members.append(index)
+        self.bound = max(self.bound, template.max_cost)
+        self.min_steps = min(self.min_steps, template.min_steps)
+        self.threshold = max(self.threshold, template.threshold)
+        self._low, self._high = low, high
+        centers = [ref + (lo + hi) / 2.0 for ref, lo, hi in zip(self._reference, low, high)]
+        widths = [(hi - lo) / 2.0 for lo, hi in zip(low, high)]
+        self.centers = [_unit(center) for center in centers]
+        self.first_angle = centers[0] % (2.0 * math.pi)
+        self.first_width = widths[0]
+        self._cos_width = [math.cos(width) for width in widths]
+        self._sin_width = [math.sin(width) for width in widths]
+        return True
+
+    def lower_bounds(self, ux: float, uy: float) -> List[float]:
+        # 1 - cos of the angle from the input to the nearest edge of each
+        # point's arc (0 inside it), less a little for rounding.
+        bounds = []
+        for (cx, cy), cos_w, sin_w in zip(self.centers, self._cos_width, self._sin_width):
+            cos_d = ux * cx + uy * cy
+            if cos_d >= cos_w:
+                bounds.append(0.0)
+            else:
+                bounds.append(max(0.0, 1.0 - (cos_d * cos_w + abs(ux * cy - uy * cx) * sin_w) - 1e-9))
+        return bounds
+
+
+def _group_templates(templates: List[MotionTemplate], max_width: float) -> List[_TemplateGroup]:
+    groups: List[_TemplateGroup] = []
+    for idx, template in enumerate(templates):
+        if max_width <= 0.0 or not any(group.try_add(idx, template, max_width) for group in groups):
+            groups.append(_TemplateGroup(idx, template))
+    return groups
+
+
+def _start_index(groups: List[_TemplateGroup], bins: int, activation_cost: float) -> List[Tuple[int, ...]]:
+    # For each direction bin, the groups whose first direction is close
+    # enough for an alignment to start from an input step in that bin.
+    reach = math.acos(max(-1.0, 1.0 - activation_cost)) + math.pi / bins
+    index: List[Tuple[int, ...]] = []
+    for bin_idx in range(bins):
+        center = (bin_idx + 0.5) * 2.0 * math.pi / bins
+        members = []
+        for idx, group in enumerate(groups):
+            delta = abs(group.first_angle - center) % (2.0 * math.pi)
+            if min(delta, 2.0 * math.pi - delta) <= reach + group.first_width:
+                members.append(idx)
+        index.append(tuple(members))
+    return index
+
+
+def _advance(
+    previous: Optional[Tuple[List[float], List[int]]],
+    step_costs: List[float],
+    step: int,
+    can_start: bool,
+    bound: float,
+) -> Tuple[List[float], List[int], bool]:
+    # One column of streaming subsequence DTW (SPRING). Every input step
+    # advances the alignment by zero, one or two template points, so a match
+    # always spans at least half the template. Cell costs only grow along a
+    # path, so cells above the acceptance bound can be dropped.
+    points = len(step_costs)
+    costs = [_INF] * points
+    starts = [0] * points
+    alive = False
+    if can_start and step_costs[0] <= bound:
+        costs[0] = step_costs[0]
+        starts[0] = step
+        alive = True
+    if previous is None:
+        return costs, starts, alive
+    prev_costs, prev_starts = previous
+    for j in range(1, points):
+        best_prev = prev_costs[j]
+        start = prev_starts[j]
+        if prev_costs[j - 1] < best_prev:
+            best_prev = prev_costs[j - 1]
+            start = prev_starts[j - 1]
+        if j > 1 and prev_costs[j - 2] < best_prev:
+            best_prev = prev_costs[j - 2]
+            start = prev_starts[j - 2]
+        if best_prev == _INF:
+            continue
+        cost = best_prev + step_costs[j]
+        if cost > bound:
+            continue
+        costs[j] = cost
+        starts[j] = start
+        alive = True
+    return costs, starts, alive
+
+
+class DynamicGestureEngine:
+    def __init__(
+        self,
+        templates: Optional[Iterable[MotionTemplate]] = None,
+        use_index_tip: bool = False,
+        step_palm_scales: float = 0.2,
+        idle_reset_seconds: float = 0.35,
+        cooldown_seconds: float = 0.8,
+        activation_cost: float = 0.3,
+        settle_seconds: float = 0.15,
+        pruning: bool = True,
+        direction_bins: int = 32,
+        group_degrees: float = 0.0,
+    ):
+        self.templates: List[MotionTemplate] = list(templates if templates is not None else default_templates())
+        self.use_index_tip = use_index_tip
+        self.step_palm_scales = step_palm_scales
+        self.idle_reset_seconds = idle_reset_seconds
+        self.cooldown_seconds = cooldown_seconds
+        self.activation_cost = activation_cost
+        self.settle_seconds = settle_seconds
+        self.pruning = pruning
+        self.direction_bins = direction_bins
+        self.steps_processed = 0
+        self.cells_updated = 0
+        self.last_match: Optional[MotionMatch] = None
+
+        # Near-duplicate templates (every point within group_degrees of the
+        # group's arc center) share one lower-bound column. Off by default:
+        # it lowers the mean per-step cost with large libraries, but a frame
+        # that has to replay the input for a group's members is slower than
+        # early abandoning alone.
+        width = math.radians(min(max(group_degrees, 0.0), 90.0)) if pruning else 0.0
+        self._groups = _group_templates(self.templates, width)
+        self._start_index = _start_index(self._groups, direction_bins, activation_cost)
+        # Only groups with a live alignment have a column; everything else
+        # is dormant and costs nothing until a step can start it. Member
+        # columns are kept for single-template groups, and for the members
+        # of a larger group once its bound could reach a match.
+        self._envelopes: Dict[int, Tuple[List[float], List[int], int]] = {}
+        self._columns: Dict[int, Tuple[List[float], List[int]]] = {}
+        self._materialized: Set[int] = set()
+        # Input directions since the oldest live envelope started, to bring
+        # a group's members up to date.
+        self._history: List[Direction] = []
+        self._history_start = 1
+        self._anchor: Optional[Tuple[float, float]] = None
+        self._last_step_time = 0.0
+        self._step_index = 0
+        self._last_fire_time = -_INF
+        self._pending: Optional[MotionMatch] = None
+
+    @classmethod
+    def from_config(cls, config: RuntimeConfig) -> "DynamicGestureEngine":
+        return cls(
+            use_index_tip=config.dynamic_gesture_point == "index_tip",
+            step_palm_scales=config.dynamic_step_palm_scales,
+            idle_reset_seconds=config.dynamic_idle_reset_seconds,
+            cooldown_seconds=config.dynamic_cooldown_seconds,
+            group_degrees=config.dynamic_group_degrees,
+        )
+
+    @property
+    def active_templates(self) -> int:
+        return len(self._columns) + len(self._envelopes)
+
+    @property
+    def groups(self) -> int:
+        return len(self._groups)
+
+    def _clear_alignments(self) -> None:
+        self._envelopes.clear()
+        self._columns.clear()
+        self._materialized.clear()
+        self._history.clear()
+        self._pending = None
+
+    def reset(self) -> None:
+        self._clear_alignments()
+        self._anchor = None
+
+    def update(self, hand_info: Optional[HandInfo], timestamp: float) -> Optional[GestureAction]:
+        if hand_info is None:
+            action = self._fire(timestamp) if self._pending is not None else None
+            self.reset()
+            return action
+        point = hand_info.index_tip if self.use_index_tip else hand_info.palm_center
+        if self._anchor is None or timestamp - self._last_step_time > self.idle_reset_seconds:
+            # Motion gestures have to be one continuous stroke.
+            action = self._fire(timestamp) if self._pending is not None else None
+            self._clear_alignments()
+            self._anchor = point
+            self._last_step_time = timestamp
+            return action
+
+        # Resampling by arc length in palm units makes the direction stream
+        # independent of frame rate, hand speed and distance to the camera.
+        scale = max(hand_info.palm_scale, 1e-6)
+        dx = (point[0] - self._anchor[0]) / scale
+        dy = (point[1] - self._anchor[1]) / scale
+        distance = math.hypot(dx, dy)
+        if distance >= self.step_palm_scales:
+            direction = (dx / distance, dy / distance)
+            self._anchor = point
+            self._last_step_time = timestamp
+            verify = timestamp - self._last_fire_time >= self.cooldown_seconds
+            for _ in range(min(int(distance / self.step_palm_scales), 8)):
+                match = self.push(direction, verify)
+                if match is not None:
+                    self._pending = _better(self._pending, match)
+
+        if self._pending is None:
+            return None
+        # A short template can match the opening of a longer one (a swipe is
+        # the first quarter of a circle), so hold the match while a longer
+        # alignment covering it is still on track, or until the hand stops.
+        if self._longer_candidate_alive(self._pending) and timestamp - self._last_step_time < self.settle_seconds:
+            return None
+        return self._fire(timestamp)
+
+    def _fire(self, timestamp: float) -> GestureAction:
+        match = self._pending
+        self._last_fire_time = timestamp
+        self._clear_alignments()
+        self.last_match = match
+        logger.info(
+            "Motion gesture matched: template=%s cost=%.3f steps=%d",
+            match.template.name,
+            match.cost,
+            match.steps,
+        )
+        return match.template.action
+
+    def _longer_candidate_alive(self, match: MotionMatch) -> bool:
+        points = len(match.template.directions)
+        latest_start = match.end_step - match.steps // 2
+        if self._member_on_track(self._columns, points, latest_start):
+            return True
+        for group_idx, (costs, _, first_step) in list(self._envelopes.items()):
+            group = self._groups[group_idx]
+            # Bound cells are no costlier than the members', and no member
+            # path starts before the group's column did: a group that fails
+            # either test has no member on track.
+            if group_idx in self._materialized or len(costs) <= points or first_step > latest_start:
+                continue
+            if not any(cost <= group.threshold * (j + 1) for j, cost in enumerate(costs)):
+                continue
+            self._materialize(group_idx, first_step)
+            columns = {idx: self._columns[idx] for idx in group.members if idx in self._columns}
+            if self._member_on_track(columns, points, latest_start):
+                return True
+        return False
+
+    def _member_on_track(self, columns: Dict[int, Tuple[List[float], List[int]]], points: int, latest_start: int) -> bool:
+        for idx, (costs, starts) in columns.items():
+            template = self.templates[idx]
+            if len(costs) <= points:
+                continue
+            for j, cost in enumerate(costs):
+                if cost <= template.threshold * (j + 1) and starts[j] <= latest_start:
+                    return True
+        return False
+
+    def push(self, direction: Direction, verify: bool = True) -> Optional[MotionMatch]:
+        self._step_index += 1
+        self.steps_processed += 1
+        step = self._step_index
+        ux, uy = direction
+        bin_idx = int(_angle(direction) / (2.0 * math.pi) * self.direction_bins) % self.direction_bins
+        candidates = set(self._envelopes)
+        candidates.update(self._start_index[bin_idx])
+        candidates.update(idx for idx, group in enumerate(self._groups) if len(group.members) == 1 and group.members[0] in self._columns)
+        if not self._envelopes:
+            self._history.clear()
+            self._history_start = step
+        self._history.append(direction)
+
+        best: Optional[MotionMatch] = None
+        reachable: List[Tuple[Tuple[int, float], int, int]] = []
+        for group_idx in candidates:
+            group = self._groups[group_idx]
+            if len(group.members) == 1:
+                idx = group.members[0]
+                if self._step_member(idx, direction, step) and verify:
+                    costs, starts = self._columns[idx]
+                    best = _better(best, _end_match(self.templates[idx], costs, starts, step))
+                continue
+            bounds = group.lower_bounds(ux, uy)
+            previous = self._envelopes.get(group_idx)
+            can_start = bounds[0] <= self.activation_cost
+            if previous is None and not can_start:
+                continue
+            # Early abandoning: bound cells above every member's acceptance
+            # cost can never become a match, so they are dropped and a group
+            # whose cells are all dropped goes dormant again.
+            costs, starts, alive = _advance(previous[:2] if previous else None, bounds, step, can_start, group.bound)
+            self.cells_updated += len(costs)
+            if not alive:
+                self._envelopes.pop(group_idx, None)
+                self._materialized.discard(group_idx)
+                for idx in group.members:
+                    self._columns.pop(idx, None)
+                continue
+            first_step = previous[2] if previous is not None else step
+            self._envelopes[group_idx] = (costs, starts, first_step)
+            if group_idx in self._materialized:
+                for idx in group.members:
+                    self._step_member(idx, direction, step)
+            # The bound on the last point is the cheapest any member can end
+            # at, and no member path is longer than the group's.
+            if verify and costs[-1] <= group.bound and step - first_step + 1 >= group.min_steps:
+                reachable.append(((-len(costs), costs[-1] / len(costs)), group_idx, first_step))
+
+        # Best first: a group whose bound cannot beat the pending match or a
+        # member already verified is skipped (its members are brought up to
+        # date later if they are ever needed), so a cluster of near-duplicate
+        # templates that all fit a stroke costs one exact check or a few.
+        for key, group_idx, first_step in sorted(reachable):
+            current = _better(self._pending, best)
+            if current is not None and (-len(current.template.directions), current.cost) <= key:
+                break
+            self._materialize(group_idx, first_step)
+            for idx in self._groups[group_idx].members:
+                column = self._columns.get(idx)
+                if column is not None:
+                    best = _better(best, _end_match(self.templates[idx], column[0], column[1], step))
+        return best
+
+    def _step_member(self, idx: int, direction: Direction, step: int) -> bool:
+        template = self.templates[idx]
+        ux, uy = direction
+        step_costs = [1.0 - (ux * dx + uy * dy) for dx, dy in template.directions]
+        previous = self._columns.get(idx)
+        can_start = step_costs[0] <= self.activation_cost
+        if previous is None and not can_start:
+            return False
+        bound = template.max_cost if self.pruning else _INF
+        costs, starts, alive = _advance(previous, step_costs, step, can_start, bound)
+        self.cells_updated += len(costs)
+        if not alive:
+            self._columns.pop(idx, None)
+            return False
+        self._columns[idx] = (costs, starts)
+        return True
+
+    def _materialize(self, group_idx: int, first_step: int) -> None:
+        # Replays the input since the group's column started for each member;
+        # from then on they are updated every step with the group. A member
+        # cannot have had a live cell before the group did, so this gives
+        # the same columns as updating them all along.
+        if group_idx in self._materialized:
+            return
+        self._materialized.add(group_idx)
+        history = self._history[first_step - self._history_start :]
+        for idx in self._groups[group_idx].members:
+            for offset, direction in enumerate(history):
+                self._step_member(idx, direction, first_step + offset)
+
+
+def _end_match(template: MotionTemplate, costs: List[float], starts: List[int], step: int) -> Optional[MotionMatch]:
+    end_cost = costs[-1]
+    if end_cost == _INF:
+        return None
+    mean_cost = end_cost / len(costs)
+    span = step - starts[-1] + 1
+    if mean_cost <= template.threshold and span >= template.min_steps:
+        return MotionMatch(template=template, cost=mean_cost, steps=span, end_step=step)
+    return None
+
+
+def _better(current: Optional[MotionMatch], candidate: Optional[MotionMatch]) -> Optional[MotionMatch]:
+    if candidate is None:
+        return current
+    if current is None:
+        return candidate
+    # Overlapping matches resolve to the longer template, then the closer fit.
+    candidate_key = (-len(candidate.template.directions), candidate.cost)
+    current_key = (-len(current.template.directions), current.cost)
+    return candidate if candidate_key < current_key else current
@@ -1,24 +1,134 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
 import cv2
+import numpy as np
+
+# Output-channel recipes for hue modes: "max" and "min" copy the per-pixel
+# channel extreme, a float blends them as weight * max + (1 - weight) * min.
+ChannelRecipe = Tuple[object, object, object]
+
+
+@dataclass(frozen=True)
+class EffectMode:
+    label: str
+    kind: str = "none"
+    matrix: Optional[np.ndarray] = None
+    recipe: Optional[ChannelRecipe] = None
+
+
+def tint_mode(label: str, color: Tuple[int, int, int], weight: float) -> EffectMode:
+    # Blending a solid color over the frame is a per-channel scale and offset.
+    matrix = np.zeros((3, 4), dtype=np.float32)
+    for channel, component in enumerate(color):
+        matrix[channel, channel] = 1.0 - weight
+        matrix[channel, 3] = component * weight
+    return EffectMode(label, "matrix", matrix=matrix)
+
+
+def grayscale_mode(label: str) -> EffectMode:
+    # BT.601 luma, as cv2.COLOR_BGR2GRAY, written to all three channels.
+    matrix = np.tile(np.array([0.114, 0.587, 0.299], dtype=np.float32), (3, 1))
+    return EffectMode(label, "matrix", matrix=matrix)
+
+
+def hue_mode(label: str, hue: int) -> EffectMode:
+    # Replacing the HSV hue with a constant keeps V = max(B, G, R) and
+    # S = (max - min) / max, so every output channel is max, min or a fixed
+    # blend of the two; the HSV round trip is not needed.
+    degrees = (hue % 180) * 2.0
+    sector = int(degrees // 60.0) % 6
+    f = degrees / 60.0 - int(degrees // 60.0)
+    rising = f
+    falling = 1.0 - f
+    rgb = {
+        0: ("max", rising, "min"),
+        1: (falling, "max", "min"),
+        2: ("min", "max", rising),
+        3: ("min", falling, "max"),
+        4: (rising, "min", "max"),
+        5: ("max", "min", falling),
+    }[sector]
+    return EffectMode(label, "hue", recipe=(rgb[2], rgb[1], rgb[0]))
+
+
+NORMAL = EffectMode("Normal")
+
+
+def finger_state_modes() -> Dict[int, EffectMode]:
+    return {
+        1: grayscale_mode("Greyscale"),
+        2: hue_mode("Purple", 140),
+        3: hue_mode("Orange", 10),
+        4: hue_mode("Yellow", 25),
+    }
+
+
+def overlay_modes() -> Dict[int, EffectMode]:
+    wide = tint_mode("Wide", (210, 210, 255), 0.08)
+    return {
+        0: tint_mode("Idle", (200, 200, 200), 0.08),
+        1: tint_mode("Precision", (255, 220, 160), 0.08),
+        2: tint_mode("Cut", (180, 255, 220), 0.08),
+        3: tint_mode("Utility", (170, 235, 255), 0.08),
+        4: wide,
+        5: wide,
+    }
+
+
+class EffectEngine:
+    def __init__(self, modes: Dict[int, EffectMode], default: EffectMode = NORMAL):
+        self.modes = dict(modes)
+        self.default = default
+        self._shape: Optional[tuple] = None
+
+    def _allocate(self, shape: tuple) -> None:
+        height, width = shape[:2]
+        self._output = np.empty((height, width, 3), dtype=np.uint8)
+        self._planes = [np.empty((height, width), dtype=np.uint8) for _ in range(3)]
+        self._high = np.empty((height, width), dtype=np.uint8)
+        self._low = np.empty((height, width), dtype=np.uint8)
+        self._shape = shape
+
+    def mode_for(self, key: int) -> EffectMode:
+        return self.modes.get(key, self.default)
+
+    def apply(self, image: np.ndarray, key: int) -> Tuple[np.ndarray, str]:
+        # Results go to a buffer reused for every frame of the same size, so
+        # the returned image is only valid until the next call.
+        mode = self.mode_for(key)
+        if mode.kind == "none":
+            return image, mode.label
+        if image.shape != self._shape:
+            self._allocate(image.shape)
+        if mode.kind == "matrix":
+            cv2.transform(image, mode.matrix, dst=self._output)
+            return self._output, mode.label
+        if mode.kind == "hue":
+            blue, green, red = cv2.split(image, self._planes)
+            cv2.max(blue, green, dst=self._high)
+            cv2.max(self._high, red, dst=self._high)
+            cv2.min(blue, green, dst=self._low)
+            cv2.min(self._low, red, dst=self._low)
+            channels = []
+            for plane, source in zip(self._planes, mode.recipe):
+                if source == "max":
+                    channels.append(self._high)
+                elif source == "min":
+                    channels.append(self._low)
+                else:
+                    cv2.addWeighted(self._high, source, self._low, 1.0 - source, 0.0, dst=plane)
+                    channels.append(plane)
+            cv2.merge(channels, dst=self._output)
+            return self._output, mode.label
+        raise ValueError(f"Unknown effect kind {mode.kind!r}")
+
+
+_OVERLAY_MODES = overlay_modes()
+_OVERLAY_ENGINE = EffectEngine(_OVERLAY_MODES, default=_OVERLAY_MODES[0])
 
 
 def apply_visual_effect(image, finger_count: int):
-    overlay = image.copy()
-    if finger_count == 1:
-        color = (255, 220, 160)
-        mode = "Precision"
-    elif finger_count == 2:
-        color = (180, 255, 220)
-        mode = "Cut"
-    elif finger_count == 3:
-        color = (170, 235, 255)
-        mode = "Utility"
-    elif finger_count >= 4:
-        color = (210, 210, 255)
-        mode = "Wide"
-    else:
-        color = (200, 200, 200)
-        mode = "Idle"
-
-    cv2.rectangle(overlay, (0, 0), (image.shape[1], image.shape[0]), color, -1)
-    image = cv2.addWeighted(overlay, 0.08, image, 0.92, 0)
-    return image, mode
+    return _OVERLAY_ENGINE.apply(image, finger_count)
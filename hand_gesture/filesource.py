@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import glob
+import logging
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from hand_gesture.config import RuntimeConfig
+from hand_gesture.threads import pin_current_thread
+
+logger = logging.getLogger(__name__)
+
+SOURCE_MODES = ("paced", "fast")
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp")
+
+
+@dataclass(frozen=True)
+class SourceStats:
+    frames: int
+    dropped_frames: int
+    seconds: float
+    fps: float
+    decoded: int
+    decode_fps: float
+    wait_ms_per_frame: float
+
+
+def expand_source(spec: str) -> List[str]:
+    if glob.has_magic(spec):
+        return sorted(glob.glob(spec))
+    return [spec] if os.path.exists(spec) else []
+
+
+class FileFrameSource:
+    # Stands in for CameraCapture with a video file or an image sequence (a
+    # glob, sorted by name); a glob matching several videos plays them one
+    # after another. A background thread decodes up to read_ahead
+    # frames ahead. "paced" delivers frames at their original timestamps and,
+    # like a camera with stale-frame draining, skips frames the loop is too
+    # slow for; "fast" delivers every frame as soon as it is decoded.
+    # timestamp is the frame's time on a clock that starts at the first
+    # read, so time-based thresholds behave the same in both modes.
+    def __init__(
+        self,
+        path: str,
+        mode: str = "paced",
+        fps: float = 30.0,
+        read_ahead: int = 8,
+        loop: bool = False,
+        cpus: Sequence[int] = (),
+        clock: Callable[[], float] = time.perf_counter,
+        sleep: Callable[[float], object] = time.sleep,
+    ):
+        if mode not in SOURCE_MODES:
+            raise ValueError(f"Unknown frame_source_mode {mode!r}; expected one of {', '.join(SOURCE_MODES)}")
+        self.path = path
+        self.mode = mode
+        self.fps = fps
+        self.loop = loop
+        self.cpus = tuple(cpus)
+        self.clock = clock
+        self.sleep = sleep
+        self.paths = expand_source(path)
+        images = [item.lower().endswith(IMAGE_EXTENSIONS) for item in self.paths]
+        if any(images) and not all(images):
+            videos = [item for item, is_image in zip(self.paths, images) if not is_image]
+            raise ValueError(f"Frame source {path} mixes images and videos ({', '.join(videos[:3])}); use one kind")
+        self.images = any(images)
+        # Used as the camera label in metrics and logs.
+        self.camera_index = -1
+        self.frames = 0
+        self.dropped_frames = 0
+        self.timestamp = 0.0
+        self._queue: "queue.Queue[Optional[Tuple[float, np.ndarray]]]" = queue.Queue(maxsize=max(1, read_ahead))
+        self._stop = threading.Event()
+        self._finished = not self.paths
+        self._decoded = 0
+        self._decode_seconds = 0.0
+        self._wait_seconds = 0.0
+        self._origin: Optional[Tuple[float, float, float]] = None
+        self._last_read = 0.0
+        self._thread: Optional[threading.Thread] = None
+        if not self.paths:
+            logger.error("Frame source %s matched no files", path)
+            return
+        self._thread = threading.Thread(target=self._decode_loop, name="frame-decoder", daemon=True)
+        self._thread.start()
+        logger.info(
+            "Frame source: %s (%s, %d file%s) mode=%s read_ahead=%d loop=%s",
+            path,
+            "images" if self.images else "video",
+            len(self.paths),
+            "" if len(self.paths) == 1 else "s",
+            mode,
+            self._queue.maxsize,
+            loop,
+        )
+
+    @classmethod
+    def from_config(cls, config: RuntimeConfig) -> "FileFrameSource":
+        return cls(
+            config.frame_source,
+            mode=config.frame_source_mode,
+            fps=config.frame_source_fps,
+            read_ahead=config.frame_source_read_ahead,
+            loop=config.frame_source_loop,
+            cpus=config.capture_cpus,
+        )
+
+    def isOpened(self) -> bool:
+        return not self._finished
+
+    def _decoded_frames(self) -> Iterator[Tuple[float, np.ndarray]]:
+        # (seconds from the start of the file or sequence, BGR frame)
+        if self.images:
+            for index, path in enumerate(self.paths):
+                frame = cv2.imread(path, cv2.IMREAD_COLOR)
+                if frame is None:
+                    logger.warning("Skipping unreadable image %s", path)
+                    continue
+                yield index / self.fps, frame
+            return
+        offset = 0.0
+        for path in self.paths:
+            last = None
+            for media_time, frame in self._video_frames(path):
+                last = media_time
+                yield offset + media_time, frame
+            if last is not None:
+                # The next video starts one frame after this one ends.
+                offset += last + 1.0 / self.fps
+
+    def _video_frames(self, path: str) -> Iterator[Tuple[float, np.ndarray]]:
+        cap = cv2.VideoCapture(path)
+        if not cap.isOpened():
+            logger.error("Could not open video %s", path)
+            return
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        if fps > 0:
+            self.fps = fps
+        try:
+            index = 0
+            while True:
+                ok, frame = cap.read()
+                if not ok:
+                    return
+                # Container timestamps handle variable frame rates; some
+                # backends report 0 throughout, then the nominal rate is used.
+                position = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+                yield (position if position > 0 or index == 0 else index / self.fps), frame
+                index += 1
+        finally:
+            cap.release()
+
+    def _put(self, item: Optional[Tuple[float, np.ndarray]]) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _decode_loop(self) -> None:
+        # The decoder is this source's capture thread.
+        pin_current_thread(self.cpus, "capture")
+        # A decode error (a corrupt file, say) ends the source like the end
+        # of the file instead of leaving read() waiting for frames.
+        try:
+            offset = 0.0
+            while not self._stop.is_set():
+                last = None
+                started = time.perf_counter()
+                for media_time, frame in self._decoded_frames():
+                    self._decode_seconds += time.perf_counter() - started
+                    self._decoded += 1
+                    if not self._put((offset + media_time, frame)):
+                        return
+                    last = media_time
+                    started = time.perf_counter()
+                if not self.loop or last is None:
+                    break
+                offset += last + 1.0 / self.fps
+        except Exception:
+            logger.exception("Frame source %s: decoding failed after %d frames", self.path, self._decoded)
+        finally:
+            self._put(None)
+
+    def _next(self) -> Optional[Tuple[float, np.ndarray]]:
+        started = self.clock()
+        while True:
+            try:
+                item = self._queue.get(timeout=0.1)
+                break
+            except queue.Empty:
+                # The decoder always queues a final None; a dead thread
+                # with nothing queued means it could not.
+                if self._thread is None or not self._thread.is_alive():
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        item = None
+                    break
+        self._wait_seconds += self.clock() - started
+        if item is None:
+            self._finished = True
+        return item
+
+    def read(self):
+        if self._finished:
+            return False, None
+        item = self._next()
+        if item is None:
+            return False, None
+        media_time, frame = item
+        if self._origin is None:
+            self._origin = (self.clock(), time.time(), media_time)
+        start_clock, start_wall, start_media = self._origin
+        if self.mode == "paced":
+            now = self.clock()
+            # More than a frame behind with newer frames decoded: skip ahead.
+            while now - (start_clock + media_time - start_media) > 1.0 / self.fps and not self._queue.empty():
+                item = self._next()
+                if item is None:
+                    return False, None
+                self.dropped_frames += 1
+                media_time, frame = item
+            delay = start_clock + media_time - start_media - self.clock()
+            if delay > 0:
+                self.sleep(delay)
+        self.timestamp = start_wall + media_time - start_media
+        self.frames += 1
+        self._last_read = self.clock()
+        return True, frame
+
+    def stats(self) -> SourceStats:
+        seconds = self._last_read - self._origin[0] if self._origin is not None else 0.0
+        return SourceStats(
+            frames=self.frames,
+            dropped_frames=self.dropped_frames,
+            seconds=seconds,
+            fps=(self.frames - 1) / seconds if seconds > 0 else 0.0,
+            decoded=self._decoded,
+            decode_fps=self._decoded / self._decode_seconds if self._decode_seconds > 0 else 0.0,
+            wait_ms_per_frame=self._wait_seconds / max(self.frames, 1) * 1000.0,
+        )
+
+    def log_stats(self) -> None:
+        stats = self.stats()
+        logger.info(
+            "Frame source %s (%s): %d frames in %.2fs = %.1f fps, dropped %d, decoder %.1f fps, waited for decode %.2f ms/frame",
+            self.path,
+            self.mode,
+            stats.frames,
+            stats.seconds,
+            stats.fps,
+            stats.dropped_frames,
+            stats.decode_fps,
+            stats.wait_ms_per_frame,
+        )
+
+    def release(self) -> None:
+        self._stop.set()
+        self._finished = True
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
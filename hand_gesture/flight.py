@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import struct
+import threading
+import time
+from dataclasses import asdict, dataclass
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from hand_gesture.config import RuntimeConfig
+from hand_gesture.gestures import GestureAction, HandInfo
+from hand_gesture.threads import unpin_current_thread
+
+logger = logging.getLogger(__name__)
+
+FLIGHT_SUFFIX = ".npz"
+LANDMARK_COUNT = 21
+HAND_LABELS = (None, "Left", "Right")
+# index_tip, palm_center, bounding_box_area, palm_scale, finger_spread, then
+# the landmarks, packed into one float64 row per frame.
+_HAND_VALUES = 7
+_HAND_ROW = struct.Struct(f"{_HAND_VALUES + LANDMARK_COUNT * 2}d")
+_ACTIONS = tuple(GestureAction)
+_ACTION_CODES = {action: code for code, action in enumerate(_ACTIONS)}
+
+
+@dataclass(frozen=True)
+class FlightFrame:
+    timestamp: float
+    hand_info: Optional[HandInfo]
+    action: Optional[str]
+    candidate: Optional[str]
+    decision: Optional[str]
+    votes: Dict[str, int]
+    hold_seconds: float
+    steady_seconds: float
+    task_view_active: bool
+    target_window: Optional[int]
+    status: str
+    error: Optional[str]
+
+
+@dataclass(frozen=True)
+class FlightDump:
+    path: str
+    reason: str
+    created: float
+    config: Dict[str, Any]
+    frames: List[FlightFrame]
+
+
+def _action_code(action: Optional[GestureAction]) -> int:
+    return -1 if action is None else _ACTION_CODES[action]
+
+
+class FlightRecorder:
+    # Always-on ring buffer of the last `seconds` of decision state, kept in
+    # preallocated arrays so recording a frame is a handful of slot writes
+    # and no allocation. dump() snapshots the ring and writes it on a
+    # background thread; the controller dumps after every destructive action
+    # (fired or failed) and on the flight-recorder hotkey.
+    def __init__(self, seconds: float, fps: float, directory: str, config: Optional[RuntimeConfig] = None):
+        self.seconds = seconds
+        self.capacity = max(2, int(math.ceil(seconds * max(fps, 1.0))) + 1)
+        self.directory = directory
+        self.config = config
+        self.frames_recorded = 0
+        self.dumps_written = 0
+        capacity = self.capacity
+        self._time = np.zeros(capacity, dtype=np.float64)
+        self._has_hand = np.zeros(capacity, dtype=np.bool_)
+        self._finger_state = np.zeros((capacity, 5), dtype=np.int8)
+        self._hand = np.zeros((capacity, _HAND_VALUES + LANDMARK_COUNT * 2), dtype=np.float64)
+        self._hand_buffer = memoryview(self._hand).cast("B")
+        self._thumb_vertical = np.zeros(capacity, dtype=np.bool_)
+        self._hand_label = np.zeros(capacity, dtype=np.int8)
+        self._landmark_count = np.zeros(capacity, dtype=np.int8)
+        self._action = np.full(capacity, -1, dtype=np.int16)
+        self._candidate = np.full(capacity, -1, dtype=np.int16)
+        self._decision = np.full(capacity, -1, dtype=np.int16)
+        self._votes = np.zeros((capacity, len(_ACTIONS)), dtype=np.int16)
+        self._timers = np.zeros((capacity, 2), dtype=np.float32)
+        self._task_view = np.zeros(capacity, dtype=np.bool_)
+        self._target_window = np.zeros(capacity, dtype=np.int64)
+        self._status = np.zeros(capacity, dtype=np.int16)
+        self._error = np.full(capacity, -1, dtype=np.int16)
+        # Status, error and decision strings change rarely; each distinct one
+        # is stored once and frames hold its index.
+        self._strings: List[str] = []
+        self._string_codes: Dict[str, int] = {}
+        self._pending: List[threading.Thread] = []
+
+    @classmethod
+    def from_config(cls, config: RuntimeConfig, fps: float) -> "FlightRecorder":
+        return cls(config.flight_recorder_seconds, fps=fps, directory=config.flight_recorder_dir, config=config)
+
+    def _intern(self, text: Optional[str]) -> int:
+        if text is None:
+            return -1
+        code = self._string_codes.get(text)
+        if code is None:
+            if len(self._strings) >= np.iinfo(np.int16).max:
+                return -1
+            code = len(self._strings)
+            self._strings.append(text)
+            self._string_codes[text] = code
+        return code
+
+    def record(
+        self,
+        timestamp: float,
+        hand_info: Optional[HandInfo],
+        action: Optional[GestureAction],
+        candidate: Optional[GestureAction],
+        decision: Optional[str],
+        votes: Iterable[Tuple[GestureAction, int]],
+        hold_seconds: float,
+        steady_seconds: float,
+        task_view_active: bool,
+        target_window: Optional[int],
+        status: str,
+        error: Optional[str] = None,
+    ) -> None:
+        slot = self.frames_recorded % self.capacity
+        self._time[slot] = timestamp
+        self._has_hand[slot] = hand_info is not None
+        if hand_info is not None:
+            self._finger_state[slot] = hand_info.finger_state
+            values = (
+                *hand_info.index_tip,
+                *hand_info.palm_center,
+                hand_info.bounding_box_area,
+                hand_info.palm_scale,
+                hand_info.finger_spread,
+            )
+            count = len(hand_info.landmarks)
+            if count == LANDMARK_COUNT:
+                # One struct write instead of converting 21 tuples.
+                _HAND_ROW.pack_into(self._hand_buffer, slot * _HAND_ROW.size, *values, *chain.from_iterable(hand_info.landmarks))
+            else:
+                count = min(count, LANDMARK_COUNT)
+                row = self._hand[slot]
+                row[:_HAND_VALUES] = values
+                if count:
+                    row[_HAND_VALUES : _HAND_VALUES + count * 2] = list(chain.from_iterable(hand_info.landmarks[:count]))
+            self._landmark_count[slot] = count
+            self._thumb_vertical[slot] = hand_info.thumb_is_vertical
+            self._hand_label[slot] = HAND_LABELS.index(hand_info.hand_label) if hand_info.hand_label in HAND_LABELS else 0
+        self._action[slot] = _action_code(action)
+        self._candidate[slot] = _action_code(candidate)
+        # Decisions are action values or navigate_<direction>; keep both as
+        # interned strings.
+        self._decision[slot] = self._intern(decision)
+        row = self._votes[slot]
+        row[:] = 0
+        for voted, count in votes:
+            row[_ACTION_CODES[voted]] = count
+        self._timers[slot, 0] = hold_seconds
+        self._timers[slot, 1] = steady_seconds
+        self._task_view[slot] = task_view_active
+        self._target_window[slot] = target_window or 0
+        self._status[slot] = self._intern(status)
+        self._error[slot] = self._intern(error)
+        self.frames_recorded += 1
+
+    def _snapshot(self) -> Dict[str, np.ndarray]:
+        # Oldest-first copy of the filled slots within the last `seconds`.
+        count = min(self.frames_recorded, self.capacity)
+        start = (self.frames_recorded - count) % self.capacity
+        order = (np.arange(count) + start) % self.capacity
+        times = self._time[order]
+        if count:
+            order = order[times >= times[-1] - self.seconds]
+        hand = self._hand[order]
+        return {
+            "time": self._time[order],
+            "has_hand": self._has_hand[order],
+            "finger_state": self._finger_state[order],
+            "index_tip": hand[:, 0:2],
+            "palm_center": hand[:, 2:4],
+            "hand_scalars": hand[:, 4:_HAND_VALUES],
+            "thumb_vertical": self._thumb_vertical[order],
+            "hand_label": self._hand_label[order],
+            "landmark_count": self._landmark_count[order],
+            "landmarks": hand[:, _HAND_VALUES:].reshape(-1, LANDMARK_COUNT, 2),
+            "action": self._action[order],
+            "candidate": self._candidate[order],
+            "decision": self._decision[order],
+            "votes": self._votes[order],
+            "timers": self._timers[order],
+            "task_view": self._task_view[order],
+            "target_window": self._target_window[order],
+            "status": self._status[order],
+            "error": self._error[order],
+        }
+
+    def dump(self, reason: str, path: Optional[str] = None) -> str:
+        created = time.time()
+        if path is None:
+            stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(created))
+            slug = "".join(char if char.isalnum() else "_" for char in reason)[:40]
+            path = os.path.join(self.directory, f"flight-{stamp}-{int(created * 1000) % 1000:03d}-{slug}{FLIGHT_SUFFIX}")
+        arrays = self._snapshot()
+        meta = {
+            "reason": reason,
+            "created": created,
+            "actions": [action.value for action in _ACTIONS],
+            "hand_labels": list(HAND_LABELS),
+            "strings": list(self._strings),
+            "config": asdict(self.config) if self.config is not None else {},
+        }
+        thread = threading.Thread(target=self._write, args=(path, arrays, meta), name="flight-dump", daemon=True)
+        self._pending = [item for item in self._pending if item.is_alive()]
+        self._pending.append(thread)
+        thread.start()
+        return path
+
+    def _write(self, path: str, arrays: Dict[str, np.ndarray], meta: Dict[str, Any]) -> None:
+        # Started from the UI thread; compression stays off ui_cpus.
+        unpin_current_thread()
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(path, "wb") as handle:
+                np.savez_compressed(handle, meta=np.array(json.dumps(meta)), **arrays)
+        except OSError:
+            logger.exception("Could not write flight recorder dump %s", path)
+            return
+        self.dumps_written += 1
+        logger.info("Flight recorder dump (%s): %s, %d frames", meta["reason"], path, len(arrays["time"]))
+
+    def close(self) -> None:
+        for thread in self._pending:
+            thread.join()
+        self._pending = []
+
+
+def _hand_info(data: Dict[str, np.ndarray], row: int, labels: List[Optional[str]]) -> HandInfo:
+    count = int(data["landmark_count"][row])
+    scalars = data["hand_scalars"][row]
+    state = tuple(int(value) for value in data["finger_state"][row])
+    return HandInfo(
+        finger_state=state,
+        finger_count=sum(state),
+        index_tip=tuple(float(value) for value in data["index_tip"][row]),
+        palm_center=tuple(float(value) for value in data["palm_center"][row]),
+        bounding_box_area=float(scalars[0]),
+        palm_scale=float(scalars[1]),
+        hand_label=labels[int(data["hand_label"][row])],
+        finger_spread=float(scalars[2]),
+        thumb_is_vertical=bool(data["thumb_vertical"][row]),
+        landmarks=tuple((float(x), float(y)) for x, y in data["landmarks"][row, :count]),
+    )
+
+
+def load_flight(path: str) -> FlightDump:
+    try:
+        with np.load(path, allow_pickle=False) as archive:
+            data = {key: archive[key] for key in archive.files}
+        meta = json.loads(str(data.pop("meta")))
+    except (OSError, KeyError, ValueError) as ex:
+        raise ValueError(f"{path}: invalid flight recorder dump: {ex}") from ex
+    # Codes are resolved with the tables saved in the dump, so older dumps
+    # stay readable if GestureAction grows.
+    actions: List[str] = meta["actions"]
+    strings: List[str] = meta["strings"]
+    labels: List[Optional[str]] = meta["hand_labels"]
+
+    def name(code: int, table: List[str]) -> Optional[str]:
+        return None if code < 0 else table[code]
+
+    frames: List[FlightFrame] = []
+    for row in range(len(data["time"])):
+        frames.append(
+            FlightFrame(
+                timestamp=float(data["time"][row]),
+                hand_info=_hand_info(data, row, labels) if data["has_hand"][row] else None,
+                action=name(int(data["action"][row]), actions),
+                candidate=name(int(data["candidate"][row]), actions),
+                decision=name(int(data["decision"][row]), strings),
+                votes={actions[code]: int(count) for code, count in enumerate(data["votes"][row]) if count},
+                hold_seconds=float(data["timers"][row, 0]),
+                steady_seconds=float(data["timers"][row, 1]),
+                task_view_active=bool(data["task_view"][row]),
+                target_window=int(data["target_window"][row]) or None,
+                status=name(int(data["status"][row]), strings) or "",
+                error=name(int(data["error"][row]), strings),
+            )
+        )
+    return FlightDump(path=path, reason=meta["reason"], created=meta["created"], config=meta["config"], frames=frames)
@@ -17,6 +17,33 @@ class GestureAction(str, Enum):
     MINIMIZE_TARGET_APP = "minimize_target_app"
     SHOW_DESKTOP = "show_desktop"
     CLOSE_ALL_APPS = "close_all_apps"
+    SWIPE_LEFT = "swipe_left"
+    SWIPE_RIGHT = "swipe_right"
+    SWIPE_UP = "swipe_up"
+    SWIPE_DOWN = "swipe_down"
+    CIRCLE_CLOCKWISE = "circle_clockwise"
+    CIRCLE_COUNTERCLOCKWISE = "circle_counterclockwise"
+
+
+MOTION_ACTIONS = frozenset(
+    {
+        GestureAction.SWIPE_LEFT,
+        GestureAction.SWIPE_RIGHT,
+        GestureAction.SWIPE_UP,
+        GestureAction.SWIPE_DOWN,
+        GestureAction.CIRCLE_CLOCKWISE,
+        GestureAction.CIRCLE_COUNTERCLOCKWISE,
+    }
+)
+
+# Actions that close windows; the flight recorder dumps after each one.
+DESTRUCTIVE_ACTIONS = frozenset(
+    {
+        GestureAction.CLOSE_CURRENT_APP,
+        GestureAction.CUT_TARGET_APP,
+        GestureAction.CLOSE_ALL_APPS,
+    }
+)
 
 
 @dataclass(frozen=True)
@@ -30,6 +57,7 @@ class HandInfo:
     hand_label: Optional[str]
     finger_spread: float
     thumb_is_vertical: bool
+    landmarks: Tuple[Tuple[float, float], ...] = ()
 
 
 def _thumb_open(landmarks, hand_label: Optional[str]) -> int:
@@ -96,10 +124,22 @@ def extract_hand_info(hand_landmarks, hand_label: Optional[str]) -> HandInfo:
         hand_label=hand_label,
         finger_spread=_pair_distance(index_tip, middle_tip) / palm_scale,
         thumb_is_vertical=thumb_is_vertical,
+        landmarks=tuple((point.x, point.y) for point in lm),
     )
 
 
-def map_action(hand_info: HandInfo) -> Optional[GestureAction]:
+def map_action(
+    hand_info: HandInfo,
+    motion_action: Optional[GestureAction] = None,
+    pose_classifier=None,
+) -> Optional[GestureAction]:
+    # A completed motion gesture outranks whatever pose the hand ends in.
+    if motion_action is not None:
+        return motion_action
+    if pose_classifier is not None:
+        action = pose_classifier.classify(hand_info)
+        if action is not None or not pose_classifier.fallback:
+            return action
     finger_state = hand_info.finger_state
     thumb, index, middle, ring, pinky = finger_state
 
@@ -135,4 +175,16 @@ def action_label(action: Optional[GestureAction]) -> str:
         return "Show Desktop (Thumbs Up)"
     if action == GestureAction.CLOSE_ALL_APPS:
         return "Close All Apps (Rock Sign)"
+    if action == GestureAction.SWIPE_LEFT:
+        return "Previous Window (Swipe Left)"
+    if action == GestureAction.SWIPE_RIGHT:
+        return "Next Window (Swipe Right)"
+    if action == GestureAction.SWIPE_UP:
+        return "Open Task View (Swipe Up)"
+    if action == GestureAction.SWIPE_DOWN:
+        return "Minimize Target App (Swipe Down)"
+    if action == GestureAction.CIRCLE_CLOCKWISE:
+        return "Show Desktop (Circle CW)"
+    if action == GestureAction.CIRCLE_COUNTERCLOCKWISE:
+        return "Show Desktop (Circle CCW)"
     return "None"
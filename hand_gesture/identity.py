@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from hand_gesture.config import RuntimeConfig
+from hand_gesture.gestures import HandInfo
+
+logger = logging.getLogger(__name__)
+
+
+def hand_score(hand_info: HandInfo) -> float:
+    # Bigger (closer) and more central hands win, as in the old per-frame pick.
+    center_offset = abs(hand_info.palm_center[0] - 0.5) + abs(hand_info.palm_center[1] - 0.5)
+    return hand_info.bounding_box_area - (center_offset * 0.08)
+
+
+@dataclass
+class HandTrack:
+    hand_id: int
+    hand_info: HandInfo
+    confidence: float
+    first_seen: float
+    last_seen: float
+    score: float = 0.0
+
+
+class HandTracker:
+    # Gives each detected hand a stable ID by matching palm centers (in palm
+    # scales) and handedness against the previous frame, then keeps one hand
+    # active. Another hand only takes over once it has outscored the active
+    # one by switch_margin for switch_seconds, or when the active hand has
+    # been gone for lost_seconds.
+    def __init__(
+        self,
+        match_distance: float = 1.5,
+        label_mismatch_penalty: float = 0.75,
+        lost_seconds: float = 0.5,
+        switch_margin: float = 0.25,
+        switch_seconds: float = 0.4,
+    ):
+        self.match_distance = match_distance
+        self.label_mismatch_penalty = label_mismatch_penalty
+        self.lost_seconds = lost_seconds
+        self.switch_margin = switch_margin
+        self.switch_seconds = switch_seconds
+        self.tracks: Dict[int, HandTrack] = {}
+        self.active_id: Optional[int] = None
+        self.switches = 0
+        self.now = 0.0
+        self._next_id = 0
+        self._challenger: Optional[int] = None
+        self._challenger_since = 0.0
+
+    @classmethod
+    def from_config(cls, config: RuntimeConfig) -> "HandTracker":
+        return cls(
+            match_distance=config.hand_match_distance,
+            lost_seconds=config.hand_lost_seconds,
+            switch_margin=config.hand_switch_margin,
+            switch_seconds=config.hand_switch_seconds,
+        )
+
+    @property
+    def active(self) -> Optional[HandTrack]:
+        track = self.tracks.get(self.active_id) if self.active_id is not None else None
+        if track is None or track.last_seen != self.now:
+            return None
+        return track
+
+    def visible(self) -> List[HandTrack]:
+        return [track for track in self.tracks.values() if track.last_seen == self.now]
+
+    def reset(self) -> None:
+        self.tracks.clear()
+        self.active_id = None
+        self._challenger = None
+
+    def _cost(self, track: HandTrack, hand_info: HandInfo) -> float:
+        previous = track.hand_info
+        scale = max(previous.palm_scale, hand_info.palm_scale, 1e-6)
+        dx = hand_info.palm_center[0] - previous.palm_center[0]
+        dy = hand_info.palm_center[1] - previous.palm_center[1]
+        cost = (dx * dx + dy * dy) ** 0.5 / scale
+        if previous.hand_label != hand_info.hand_label:
+            cost += self.label_mismatch_penalty
+        return cost
+
+    def update(
+        self, candidates: Sequence[Tuple[HandInfo, float]], timestamp: float, detected: bool = True
+    ) -> Optional[HandTrack]:
+        # detected=False: the candidates come from tracking the active hand
+        # alone (optical flow), not from a detector pass over the frame.
+        self.now = timestamp
+        # Greedy matching, cheapest pairs first; with two hands this is as
+        # good as an optimal assignment.
+        pairs = sorted(
+            (self._cost(track, hand_info), track_id, index)
+            for track_id, track in self.tracks.items()
+            for index, (hand_info, _) in enumerate(candidates)
+        )
+        matched_tracks = set()
+        matched_candidates = set()
+        for cost, track_id, index in pairs:
+            if cost > self.match_distance:
+                break
+            if track_id in matched_tracks or index in matched_candidates:
+                continue
+            matched_tracks.add(track_id)
+            matched_candidates.add(index)
+            track = self.tracks[track_id]
+            track.hand_info, track.confidence = candidates[index]
+            track.last_seen = timestamp
+        for index, (hand_info, confidence) in enumerate(candidates):
+            if index in matched_candidates:
+                continue
+            self.tracks[self._next_id] = HandTrack(self._next_id, hand_info, confidence, timestamp, timestamp)
+            self._next_id += 1
+        for track_id in [track_id for track_id, track in self.tracks.items() if timestamp - track.last_seen > self.lost_seconds]:
+            del self.tracks[track_id]
+        for track in self.visible():
+            track.score = hand_score(track.hand_info)
+        self._select(timestamp, detected)
+        return self.active
+
+    def _select(self, timestamp: float, detected: bool = True) -> None:
+        visible = self.visible()
+        if not visible:
+            self._challenger = None
+            if self.active_id not in self.tracks:
+                self.active_id = None
+            return
+        best = max(visible, key=lambda track: track.score)
+        if self.active_id not in self.tracks:
+            # The active hand is gone for good (or there was none).
+            self._activate(best.hand_id)
+            return
+        if not detected:
+            # The other hands were not looked for; a challenger keeps its
+            # timer until the next detector frame re-evaluates it.
+            return
+        current = self.tracks[self.active_id]
+        if current.last_seen != timestamp or best.hand_id == current.hand_id:
+            # A brief dropout of the active hand does not hand over control.
+            self._challenger = None
+            return
+        if best.score <= current.score + self.switch_margin * current.hand_info.bounding_box_area:
+            self._challenger = None
+            return
+        if self._challenger != best.hand_id:
+            self._challenger = best.hand_id
+            self._challenger_since = timestamp
+        if timestamp - self._challenger_since >= self.switch_seconds:
+            self._activate(best.hand_id)
+
+    def _activate(self, hand_id: int) -> None:
+        if self.active_id is not None and hand_id != self.active_id:
+            self.switches += 1
+            logger.info("Active hand: %d -> %d", self.active_id, hand_id)
+        self.active_id = hand_id
+        self._challenger = None
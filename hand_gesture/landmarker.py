@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+
+from hand_gesture.config import RuntimeConfig
+from hand_gesture.gestures import HandInfo, extract_hand_info
+from hand_gesture.identity import HandTracker
+from hand_gesture.skeleton import SkeletonRenderer
+from hand_gesture.startup import BackgroundTask, StartupTimer
+from hand_gesture.threads import pin_current_thread
+from hand_gesture.vision import VisionEngine
+
+VISION_BACKENDS = ("solutions", "tasks")
+
+
+class TasksVisionEngine:
+    # Drop-in for VisionEngine built on the MediaPipe Tasks HandLandmarker in
+    # LIVE_STREAM mode. process_frame queues the frame with MediaPipe and
+    # returns at once with the newest result its callback has delivered, so
+    # inference overlaps with capture and drawing. The returned hand is
+    # therefore one inference behind the frame. MediaPipe queues every frame
+    # it is given, so frames that arrive while max_in_flight are still being
+    # processed are not submitted; latency stays bounded when the loop runs
+    # faster than the model.
+    def __init__(
+        self,
+        model_path: str,
+        max_num_hands: int,
+        min_detection_confidence: float,
+        min_tracking_confidence: float,
+        startup: Optional[StartupTimer] = None,
+        warm_up_size: tuple[int, int] = (640, 480),
+        hand_tracker: Optional[HandTracker] = None,
+        inference_cpus: Sequence[int] = (),
+        max_in_flight: int = 2,
+        skeleton_style: str = "full",
+    ):
+        self.model_path = model_path
+        self._max_num_hands = max_num_hands
+        self._min_detection_confidence = min_detection_confidence
+        self._min_tracking_confidence = min_tracking_confidence
+        self._warm_up_size = warm_up_size
+        self._inference_cpus = tuple(inference_cpus)
+        self._max_in_flight = max(1, max_in_flight)
+        self._skeleton = SkeletonRenderer.from_name(skeleton_style)
+        self._landmarker = None
+        self._mp = None
+        self._loader = BackgroundTask("vision warm-up", self._build, startup)
+        self.hands = hand_tracker or HandTracker()
+        self.detector_runs = 0
+        self.tracked_frames = 0
+        self.results_received = 0
+        self.skipped_frames = 0
+        self._lock = threading.Lock()
+        self._warmed = threading.Event()
+        # Latest callback result: (frame timestamp in seconds, candidates).
+        self._latest: Optional[Tuple[float, List[Tuple[HandInfo, float]]]] = None
+        self._latest_version = 0
+        self._consumed_version = 0
+        self._last_timestamp_ms = -1
+        self._submitted: Dict[int, Tuple[float, float]] = {}
+        self._latency_seconds = 0.0
+        self._last_points: List[np.ndarray] = []
+
+    @classmethod
+    def from_config(
+        cls,
+        config: RuntimeConfig,
+        startup: Optional[StartupTimer] = None,
+        warm_up_size: Optional[tuple[int, int]] = None,
+    ) -> "TasksVisionEngine":
+        return cls(
+            config.hand_landmarker_model_path,
+            max_num_hands=config.max_num_hands,
+            min_detection_confidence=config.min_detection_confidence,
+            min_tracking_confidence=config.min_tracking_confidence,
+            startup=startup,
+            warm_up_size=warm_up_size or (config.frame_width, config.frame_height),
+            hand_tracker=HandTracker.from_config(config),
+            inference_cpus=config.inference_cpus,
+            skeleton_style=config.skeleton_style,
+        )
+
+    @property
+    def mean_latency_ms(self) -> float:
+        # Frame handed to MediaPipe -> result callback.
+        return self._latency_seconds / max(self.results_received, 1) * 1000.0
+
+    def start_warm_up(self) -> None:
+        self._loader.start()
+
+    def wait_until_ready(self) -> None:
+        if self._landmarker is None:
+            self._landmarker = self._loader.result()
+
+    def _build(self):
+        pin_current_thread(self._inference_cpus, "inference")
+        if not os.path.isfile(self.model_path):
+            raise FileNotFoundError(
+                f"HandLandmarker model not found at {self.model_path}; download hand_landmarker.task "
+                "from the MediaPipe model page and set hand_landmarker_model_path"
+            )
+        import mediapipe as mp
+        from mediapipe.tasks.python import BaseOptions, vision
+
+        self._mp = mp
+        options = vision.HandLandmarkerOptions(
+            base_options=BaseOptions(model_asset_path=self.model_path),
+            running_mode=vision.RunningMode.LIVE_STREAM,
+            num_hands=self._max_num_hands,
+            min_hand_detection_confidence=self._min_detection_confidence,
+            min_hand_presence_confidence=self._min_tracking_confidence,
+            min_tracking_confidence=self._min_tracking_confidence,
+            result_callback=self._on_result,
+        )
+        landmarker = vision.HandLandmarker.create_from_options(options)
+        # The first inference allocates the graph; do it here, not on frame one.
+        width, height = self._warm_up_size
+        dummy = np.zeros((height, width, 3), dtype=np.uint8)
+        landmarker.detect_async(mp.Image(image_format=mp.ImageFormat.SRGB, data=dummy), 0)
+        self._last_timestamp_ms = 0
+        self._warmed.wait(10.0)
+        return landmarker
+
+    def _on_result(self, result, image, timestamp_ms: int) -> None:
+        # Runs on a MediaPipe thread; HandInfo is built here, off the loop.
+        received = time.perf_counter()
+        if not self._warmed.is_set():
+            self._warmed.set()
+            return
+        candidates = []
+        for idx, landmarks in enumerate(result.hand_landmarks):
+            hand_label = None
+            hand_confidence = 1.0
+            if len(result.handedness) > idx and result.handedness[idx]:
+                hand_label = result.handedness[idx][0].category_name
+                hand_confidence = result.handedness[idx][0].score
+            candidates.append((extract_hand_info(SimpleNamespace(landmark=landmarks), hand_label), hand_confidence))
+        with self._lock:
+            submitted = self._submitted.pop(timestamp_ms, None)
+            # Frames MediaPipe skipped never call back.
+            for stale in [stamp for stamp in self._submitted if stamp < timestamp_ms]:
+                del self._submitted[stale]
+            if submitted is not None:
+                self._latency_seconds += received - submitted[0]
+                frame_time = submitted[1]
+            else:
+                frame_time = timestamp_ms / 1000.0
+            self.results_received += 1
+            self._latest = (frame_time, candidates)
+            self._latest_version += 1
+
+    def close(self) -> None:
+        if self._landmarker is None and self._loader.done:
+            try:
+                self._landmarker = self._loader.result()
+            except RuntimeError:
+                return
+        if self._landmarker is not None:
+            self._landmarker.close()
+
+    def reset_tracking(self) -> None:
+        self.hands.reset()
+        self._last_points = []
+
+    def process_frame(self, frame, timestamp: Optional[float] = None) -> tuple:
+        self.wait_until_ready()
+        timestamp = time.time() if timestamp is None else timestamp
+        frame = cv2.flip(frame, 1)
+        now = time.perf_counter()
+        with self._lock:
+            # A submission that never called back within a second is gone.
+            for stale in [stamp for stamp, (sent, _) in self._submitted.items() if now - sent > 1.0]:
+                del self._submitted[stale]
+            submit = len(self._submitted) < self._max_in_flight
+            latest = self._latest if self._latest_version != self._consumed_version else None
+            self._consumed_version = self._latest_version
+        if submit:
+            rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            # LIVE_STREAM needs strictly increasing timestamps.
+            timestamp_ms = max(int(timestamp * 1000.0), self._last_timestamp_ms + 1)
+            self._last_timestamp_ms = timestamp_ms
+            with self._lock:
+                self._submitted[timestamp_ms] = (now, timestamp)
+            self._landmarker.detect_async(self._mp.Image(image_format=self._mp.ImageFormat.SRGB, data=rgb_image), timestamp_ms)
+            self.detector_runs += 1
+        else:
+            self.skipped_frames += 1
+
+        if latest is not None:
+            result_time, candidates = latest
+            self.hands.update(candidates, result_time)
+            height, width = frame.shape[:2]
+            self._last_points = [
+                SkeletonRenderer.to_pixels(track.hand_info.landmarks, width, height)
+                for track in self.hands.visible()
+                if track.hand_info.landmarks
+            ]
+        for points in self._last_points:
+            self._skeleton.draw_pixels(frame, points)
+        active = self.hands.active
+        return frame, active.hand_info if active is not None else None
+
+
+def create_vision_engine(
+    config: RuntimeConfig,
+    startup: Optional[StartupTimer] = None,
+    warm_up_size: Optional[tuple[int, int]] = None,
+) -> Union[VisionEngine, TasksVisionEngine]:
+    if config.vision_backend not in VISION_BACKENDS:
+        raise ValueError(f"Unknown vision_backend {config.vision_backend!r}; expected one of {', '.join(VISION_BACKENDS)}")
+    if config.vision_backend == "tasks":
+        return TasksVisionEngine.from_config(config, startup, warm_up_size)
+    return VisionEngine(
+        max_num_hands=config.max_num_hands,
+        min_detection_confidence=config.min_detection_confidence,
+        min_tracking_confidence=config.min_tracking_confidence,
+        startup=startup,
+        warm_up_size=warm_up_size or (config.frame_width, config.frame_height),
+        detection_interval=config.detection_interval,
+        flow_max_fb_error=config.flow_max_fb_error,
+        flow_min_valid_fraction=config.flow_min_valid_fraction,
+        hand_tracker=HandTracker.from_config(config),
+        inference_cpus=config.inference_cpus,
+        skeleton_style=config.skeleton_style,
+    )
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import json
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from hand_gesture.config import RuntimeConfig
+from hand_gesture.gestures import GestureAction
+from hand_gesture.publisher import EVENT_NAME_BYTES
+from hand_gesture.stability import GestureStabilizer
+
+logger = logging.getLogger(__name__)
+
+_ACTIONS = tuple(GestureAction)
+_SYMBOLS = {action: symbol for symbol, action in enumerate(_ACTIONS)}
+
+
+@dataclass(frozen=True)
+class MacroSpec:
+    name: str
+    sequence: Tuple[GestureAction, ...]
+    # Executed in order when the sequence completes; may be empty when only
+    # the published "macro_<name>" event is wanted.
+    actions: Tuple[GestureAction, ...] = ()
+    # Longest pause allowed between two consecutive steps.
+    max_gap_seconds: float = 1.5
+    # Optional limit from the first step to the last.
+    within_seconds: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class MacroMatch:
+    spec: MacroSpec
+    started: float
+    timestamp: float
+
+
+def _action(value: Any, where: str) -> GestureAction:
+    try:
+        return GestureAction(value)
+    except ValueError:
+        raise ValueError(f"{where}: unknown gesture {value!r}") from None
+
+
+def macro_from_dict(data: Mapping[str, Any], default_gap_seconds: float = 1.5) -> MacroSpec:
+    name = data.get("name")
+    if not name:
+        raise ValueError(f"Macro without a name: {dict(data)!r}")
+    sequence = tuple(_action(value, f"macro {name!r}") for value in data.get("sequence", ()))
+    if not sequence:
+        raise ValueError(f"macro {name!r}: empty sequence")
+    event = f"macro_{name}"
+    if len(event.encode("utf-8")) > EVENT_NAME_BYTES:
+        logger.warning(
+            "macro %r: its published event %r is longer than %d bytes and reaches subscribers truncated",
+            name,
+            event,
+            EVENT_NAME_BYTES,
+        )
+    within = data.get("within_seconds")
+    return MacroSpec(
+        name=name,
+        sequence=sequence,
+        actions=tuple(_action(value, f"macro {name!r}") for value in data.get("actions", ())),
+        max_gap_seconds=float(data.get("max_gap_seconds", default_gap_seconds)),
+        within_seconds=float(within) if within is not None else None,
+    )
+
+
+def load_macros(path: str, default_gap_seconds: float = 1.5) -> List[MacroSpec]:
+    with open(path, "r", encoding="utf-8") as handle:
+        data = json.load(handle)
+    if not isinstance(data, list):
+        raise ValueError(f"{path}: expected a JSON list of macros")
+    return [macro_from_dict(item, default_gap_seconds) for item in data]
+
+
+class MacroAutomaton:
+    # Aho-Corasick automaton over GestureAction symbols, compiled to a dense
+    # transition table: one lookup per event whatever the number of macros.
+    # Each state lists the macros that end there (its own and those reached
+    # through failure links), longest first.
+    def __init__(self, macros: Sequence[MacroSpec]):
+        self.macros = tuple(macros)
+        width = len(_ACTIONS)
+        children: List[Dict[int, int]] = [{}]
+        depth = [0]
+        terminal: List[Optional[int]] = [None]
+        for index, spec in enumerate(self.macros):
+            state = 0
+            for action in spec.sequence:
+                symbol = _SYMBOLS[action]
+                nxt = children[state].get(symbol)
+                if nxt is None:
+                    nxt = len(children)
+                    children[state][symbol] = nxt
+                    children.append({})
+                    depth.append(depth[state] + 1)
+                    terminal.append(None)
+                state = nxt
+            if terminal[state] is not None:
+                raise ValueError(
+                    f"Macros {self.macros[terminal[state]].name!r} and {spec.name!r} have the same sequence"
+                )
+            terminal[state] = index
+
+        count = len(children)
+        goto = [0] * (count * width)
+        fail = [0] * count
+        outputs: List[Tuple[int, ...]] = [()] * count
+        queue = deque([0])
+        # Breadth-first, so a state's failure target is finished before it.
+        while queue:
+            state = queue.popleft()
+            own = (terminal[state],) if terminal[state] is not None else ()
+            outputs[state] = own + outputs[fail[state]] if state else own
+            base = state * width
+            fallback = fail[state] * width
+            for symbol in range(width):
+                nxt = children[state].get(symbol)
+                if nxt is None:
+                    goto[base + symbol] = goto[fallback + symbol] if state else 0
+                    continue
+                goto[base + symbol] = nxt
+                fail[nxt] = goto[fallback + symbol] if state else 0
+                queue.append(nxt)
+        self.states = count
+        self.depth = tuple(depth)
+        self._width = width
+        self._goto = goto
+        self._outputs = outputs
+        self.max_length = max(depth)
+
+    def step(self, state: int, action: GestureAction) -> int:
+        return self._goto[state * self._width + _SYMBOLS[action]]
+
+    def outputs(self, state: int) -> Tuple[int, ...]:
+        return self._outputs[state]
+
+
+class MacroRecognizer:
+    # Runs the automaton over the stream of stabilized gestures: one event
+    # per stabilizer candidate run, once it holds the vote-window majority,
+    # plus completed motion gestures. A pause longer than every macro's gap
+    # restarts matching; after a macro fires, matching starts over.
+    def __init__(self, macros: Sequence[MacroSpec]):
+        self.automaton = MacroAutomaton(macros)
+        self.max_gap_seconds = max((spec.max_gap_seconds for spec in self.automaton.macros), default=0.0)
+        self.events = 0
+        self.matches = 0
+        self._state = 0
+        self._times: deque[float] = deque(maxlen=max(self.automaton.max_length, 1))
+        self._last_run: Optional[Tuple[GestureAction, float]] = None
+
+    @classmethod
+    def from_config(cls, config: RuntimeConfig) -> "MacroRecognizer":
+        macros = load_macros(config.macros_path, config.macro_max_gap_seconds)
+        recognizer = cls(macros)
+        logger.info(
+            "Loaded %d gesture macros from %s (%d automaton states)",
+            len(macros),
+            config.macros_path,
+            recognizer.automaton.states,
+        )
+        return recognizer
+
+    @property
+    def progress(self) -> int:
+        # Steps of the longest macro prefix matched so far.
+        return self.automaton.depth[self._state]
+
+    def reset(self) -> None:
+        self._state = 0
+        self._times.clear()
+
+    def observe(self, stabilizer: GestureStabilizer) -> Optional[MacroMatch]:
+        action = stabilizer.candidate_action
+        if action is None:
+            return None
+        run = (action, stabilizer.candidate_since)
+        if run == self._last_run or not stabilizer.candidate_confirmed():
+            return None
+        self._last_run = run
+        return self.feed(action, stabilizer.now)
+
+    def feed(self, action: GestureAction, timestamp: float) -> Optional[MacroMatch]:
+        self.events += 1
+        times = self._times
+        if times and timestamp - times[-1] > self.max_gap_seconds:
+            self.reset()
+        self._state = self.automaton.step(self._state, action)
+        times.append(timestamp)
+        for index in self.automaton.outputs(self._state):
+            spec = self.automaton.macros[index]
+            if self._timing_ok(spec):
+                match = MacroMatch(spec=spec, started=times[-len(spec.sequence)], timestamp=timestamp)
+                self.matches += 1
+                self.reset()
+                return match
+        return None
+
+    def _timing_ok(self, spec: MacroSpec) -> bool:
+        length = len(spec.sequence)
+        if len(self._times) < length:
+            return False
+        times = list(self._times)[-length:]
+        if spec.within_seconds is not None and times[-1] - times[0] > spec.within_seconds:
+            return False
+        return all(later - earlier <= spec.max_gap_seconds for earlier, later in zip(times, times[1:]))
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from hand_gesture.gestures import FingerState, GestureAction, HandInfo
+from hand_gesture.pose_templates import LANDMARK_COUNT, PoseTemplateClassifier, pose_vector
+
+
+class MemoizedPoseClassifier:
+    # Stands in for PoseTemplateClassifier in map_action. While a hand holds
+    # a pose, the nearest-template search is skipped: the last answer is
+    # reused as long as the finger state is unchanged and no landmark of the
+    # normalized pose (centred, scaled by palm size, rotated upright) has
+    # moved more than tolerance palm scales from the last searched pose.
+    # Moving or turning the whole hand does not count as a change. Entries
+    # are kept per handedness so two tracked hands do not evict each other.
+    def __init__(self, classifier: PoseTemplateClassifier, tolerance: float = 0.1):
+        self.classifier = classifier
+        self.tolerance = tolerance
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[Optional[str], Tuple[FingerState, np.ndarray, Optional[GestureAction]]] = {}
+
+    @property
+    def fallback(self) -> bool:
+        return self.classifier.fallback
+
+    @property
+    def last_distance(self) -> float:
+        return self.classifier.last_distance
+
+    def classify(self, hand_info: HandInfo) -> Optional[GestureAction]:
+        vector = pose_vector(hand_info)
+        if vector is None:
+            return None
+        entry = self._entries.get(hand_info.hand_label)
+        if entry is not None and entry[0] == hand_info.finger_state:
+            diff = (vector - entry[1]).reshape(LANDMARK_COUNT, 2)
+            if float(np.einsum("ij,ij->i", diff, diff).max()) < self.tolerance * self.tolerance:
+                self.hits += 1
+                return entry[2]
+        self.misses += 1
+        action = self.classifier.classify_vector(vector)
+        self._entries[hand_info.hand_label] = (hand_info.finger_state, vector, action)
+        return action
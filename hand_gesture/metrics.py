@@ -0,0 +1,323 @@
+from __future__ import annotations
+
+import bisect
+import logging
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from hand_gesture.config import RuntimeConfig
+from hand_gesture.gestures import GestureAction
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.005, 0.01, 0.015, 0.02, 0.03, 0.05, 0.075, 0.1, 0.15, 0.25, 0.5, 1.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+class _Value:
+    # One labelled series. Writers take an uncontended lock for a few
+    # bytecodes; the scrape thread only copies the number out.
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class _HistogramValue:
+    __slots__ = ("bounds", "counts", "sum", "count", "_lock")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self) -> Tuple[List[int], float, int]:
+        with self._lock:
+            return list(self.counts), self.sum, self.count
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[LabelValues, object] = {}
+        self._create_lock = threading.Lock()
+
+    def _new_child(self):
+        return _Value()
+
+    def labels(self, *values: str):
+        # Children are cached, so the hot path is one dict lookup; callers on
+        # a frame loop can also keep the returned child.
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            with self._create_lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _items(self) -> List[Tuple[LabelValues, object]]:
+        return list(self._children.items())
+
+    def render(self, lines: List[str]) -> None:
+        lines.append(f"# HELP {self.name} {self.help}")
+        lines.append(f"# TYPE {self.name} {self.kind}")
+        for values, child in sorted(self._items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}")
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.bounds = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.bounds)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def render(self, lines: List[str]) -> None:
+        lines.append(f"# HELP {self.name} {self.help}")
+        lines.append(f"# TYPE {self.name} {self.kind}")
+        for values, child in sorted(self._items()):
+            counts, total, count = child.snapshot()
+            cumulative = 0
+            for bound, bucket_count in zip(self.bounds + (math.inf,), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, values, f'le="{"+Inf" if math.isinf(bound) else repr(float(bound))}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+
+
+class _CallbackMetric(_Metric):
+    # Read at scrape time from state the pipeline already keeps, such as the
+    # camera's dropped-frame counter, so the frame loop does no extra work.
+    def __init__(self, name: str, help_text: str, kind: str, labelnames: Sequence[str], collect: Callable[[], Iterable[Tuple[LabelValues, float]]]):
+        super().__init__(name, help_text, labelnames)
+        self.kind = kind
+        self._collect = collect
+
+    def render(self, lines: List[str]) -> None:
+        lines.append(f"# HELP {self.name} {self.help}")
+        lines.append(f"# TYPE {self.name} {self.kind}")
+        try:
+            samples = sorted((tuple(values), value) for values, value in self._collect())
+        except Exception:
+            logger.exception("Metrics callback failed: %s", self.name)
+            return
+        for values, value in samples:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(float(value))}")
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def callback(self, name: str, help_text: str, kind: str, labelnames: Sequence[str], collect) -> None:
+        self._register(_CallbackMetric(name, help_text, kind, labelnames, collect))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            metric.render(lines)
+        return "\n".join(lines) + "\n"
+
+
+class GestureMetrics:
+    def __init__(self, registry: Optional[MetricsRegistry] = None, smoothing: float = 0.05):
+        self.registry = registry or MetricsRegistry()
+        self.smoothing = smoothing
+        r = self.registry
+        self.frames = r.counter("hand_gesture_frames_total", "Frames processed by the recognition loop.").labels()
+        self.hand_frames = r.counter("hand_gesture_hand_frames_total", "Processed frames in which a hand was found.").labels()
+        self.fps = r.gauge("hand_gesture_fps", "Processed frames per second, exponentially smoothed.").labels()
+        self.hand_ratio = r.gauge("hand_gesture_hand_present_ratio", "Share of recent frames with a hand, exponentially smoothed.").labels()
+        self.inference = r.histogram("hand_gesture_inference_seconds", "Time spent in hand detection or tracking per frame.", ("camera",))
+        self.actions = r.counter("hand_gesture_actions_total", "Gesture actions by outcome.", ("action", "result"))
+        self.cooldown_blocks = r.counter("hand_gesture_cooldown_blocks_total", "Ready actions held back by the cooldown.", ("action",))
+        self.executor_errors = r.counter("hand_gesture_executor_errors_total", "Action executor failures that reported an error.").labels()
+        self._last_frame_time: Optional[float] = None
+        self._fps_value = 0.0
+        self._ratio_value: Optional[float] = None
+        # Pre-create every action series so they export as 0 before first use.
+        for action in GestureAction:
+            self.actions.labels(action.value, "executed")
+            self.actions.labels(action.value, "failed")
+            self.cooldown_blocks.labels(action.value)
+
+    def frame(self, timestamp: float, hand_present: bool) -> None:
+        # Called only from the frame loop, so the smoothing state is unshared.
+        self.frames.inc()
+        if hand_present:
+            self.hand_frames.inc()
+        if self._last_frame_time is not None and timestamp > self._last_frame_time:
+            rate = 1.0 / (timestamp - self._last_frame_time)
+            self._fps_value = rate if self._fps_value == 0.0 else self._fps_value + (rate - self._fps_value) * self.smoothing
+            self.fps.set(self._fps_value)
+        self._last_frame_time = timestamp
+        present = 1.0 if hand_present else 0.0
+        if self._ratio_value is None:
+            self._ratio_value = present
+        else:
+            self._ratio_value += (present - self._ratio_value) * self.smoothing
+        self.hand_ratio.set(self._ratio_value)
+
+    def inference_time(self, camera: int, seconds: float) -> None:
+        self.inference.labels(camera).observe(seconds)
+
+    def action(self, action: GestureAction, ok: bool, error: Optional[str] = None) -> None:
+        self.actions.labels(action.value, "executed" if ok else "failed").inc()
+        if not ok and error:
+            self.executor_errors.inc()
+
+    def cooldown_blocked(self, action: GestureAction) -> None:
+        self.cooldown_blocks.labels(action.value).inc()
+
+    def pose_memo_source(self, collect: Callable[[], Iterable[Tuple[LabelValues, float]]]) -> None:
+        self.registry.callback(
+            "hand_gesture_pose_memo_total",
+            "Pose-template lookups reused from a held pose (hit) or searched (miss).",
+            "counter",
+            ("result",),
+            collect,
+        )
+
+    def dropped_frames_source(self, collect: Callable[[], Iterable[Tuple[LabelValues, float]]]) -> None:
+        self.registry.callback(
+            "hand_gesture_dropped_frames_total",
+            "Camera frames dropped: stale frames drained or frames queued behind inference.",
+            "counter",
+            ("camera",),
+            collect,
+        )
+
+
+class _Handler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry
+
+    def do_GET(self) -> None:
+        if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug("metrics %s - %s", self.address_string(), format % args)
+
+
+class MetricsServer:
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9108):
+        handler = type("MetricsHandler", (_Handler,), {"registry": registry})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        host, port = self._server.server_address[:2]
+        return host, port
+
+    @classmethod
+    def from_config(cls, registry: MetricsRegistry, config: RuntimeConfig) -> "MetricsServer":
+        return cls(registry, host=config.metrics_host, port=config.metrics_port)
+
+    def start(self) -> "MetricsServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True)
+        self._thread.start()
+        host, port = self.address
+        logger.info("Serving metrics at http://%s:%d/metrics", host, port)
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join(timeout=1.0)
+        self._server.server_close()
@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from hand_gesture.camera import CameraCapture
+from hand_gesture.config import RuntimeConfig
+from hand_gesture.gestures import HandInfo
+from hand_gesture.landmarker import create_vision_engine
+from hand_gesture.pacing import FramePacer, effective_target_fps
+from hand_gesture.startup import StartupTimer
+from hand_gesture.supervisor import CaptureSupervisor
+from hand_gesture.threads import pin_current_thread
+from hand_gesture.vision import VisionEngine
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SourceStats:
+    source_id: int
+    camera_index: int
+    priority: int
+    capture_fps: float
+    processed_fps: float
+    queue_depth: int
+    dropped_frames: int
+
+
+@dataclass(frozen=True)
+class SourceResult:
+    source_id: int
+    timestamp: float
+    image: Any
+    hand_info: Optional[HandInfo]
+
+
+class _RateMeter:
+    def __init__(self, window_seconds: float = 2.0):
+        self.window_seconds = window_seconds
+        self._events: deque[float] = deque()
+
+    def tick(self, now: float) -> None:
+        self._events.append(now)
+        while self._events and now - self._events[0] > self.window_seconds:
+            self._events.popleft()
+
+    def rate(self, now: float) -> float:
+        while self._events and now - self._events[0] > self.window_seconds:
+            self._events.popleft()
+        if len(self._events) < 2:
+            return 0.0
+        return (len(self._events) - 1) / max(self._events[-1] - self._events[0], 1e-6)
+
+
+class _Source:
+    def __init__(self, source_id: int, camera_index: int, capture, engine: VisionEngine, priority: int, queue_size: int):
+        self.source_id = source_id
+        self.camera_index = camera_index
+        self.capture = capture
+        # Each source keeps its own engine: MediaPipe's tracking state belongs
+        # to one continuous stream, so engines are never shared between cameras.
+        self.engine = engine
+        self.priority = priority
+        self.pending: deque[tuple[float, Any]] = deque(maxlen=max(1, queue_size))
+        self.busy = False
+        self.last_served = 0.0
+        self.dropped_frames = 0
+        self.captured = _RateMeter()
+        self.processed = _RateMeter()
+        self.result: Optional[SourceResult] = None
+        self.thread: Optional[threading.Thread] = None
+        self.pacer: Optional[FramePacer] = None
+
+
+class MultiCameraPipeline:
+    def __init__(
+        self,
+        sources: Sequence[tuple[int, Any, VisionEngine, int]],
+        workers: int = 0,
+        queue_size: int = 2,
+        stale_seconds: float = 0.5,
+        target_fps: float = 0.0,
+        capture_cpus: Sequence[int] = (),
+        inference_cpus: Sequence[int] = (),
+    ):
+        self.stale_seconds = stale_seconds
+        self.target_fps = target_fps
+        self.capture_cpus = tuple(capture_cpus)
+        self.inference_cpus = tuple(inference_cpus)
+        self.worker_count = workers or len(sources)
+        self.sources: List[_Source] = [
+            _Source(source_id, camera_index, capture, engine, priority, queue_size)
+            for source_id, (camera_index, capture, engine, priority) in enumerate(sources)
+        ]
+        self.active_source: Optional[int] = None
+        self._condition = threading.Condition()
+        self._result_version = 0
+        self._consumed_version = 0
+        self._stop = threading.Event()
+        self._workers: List[threading.Thread] = []
+        # Called from worker threads with (camera_index, seconds) per frame.
+        self.inference_observer: Optional[Callable[[int, float], None]] = None
+
+    @classmethod
+    def from_config(
+        cls,
+        camera_indices: Sequence[int],
+        config: RuntimeConfig,
+        startup: Optional[StartupTimer] = None,
+    ) -> "MultiCameraPipeline":
+        priorities = list(config.source_priorities) or [0] * len(camera_indices)
+        if len(priorities) != len(camera_indices):
+            raise ValueError("source_priorities must have one entry per camera index")
+        sources = []
+        for source_id, (camera_index, priority) in enumerate(zip(camera_indices, priorities)):
+            engine = create_vision_engine(config, startup if source_id == 0 else None)
+            engine.start_warm_up()
+            capture = CameraCapture(
+                camera_index=camera_index,
+                width=config.frame_width,
+                height=config.frame_height,
+                fps=config.camera_fps,
+                buffer_size=config.camera_buffer_size,
+                backends=config.camera_backends,
+                fourccs=config.camera_fourccs,
+                drain_stale_frames=config.drain_stale_frames,
+                max_drain_frames=config.max_drain_frames,
+            )
+            capture = CaptureSupervisor.from_config(capture, config)
+            sources.append((camera_index, capture, engine, priority))
+        return cls(
+            sources,
+            workers=config.vision_workers,
+            queue_size=config.source_queue_size,
+            stale_seconds=config.source_stale_seconds,
+            target_fps=effective_target_fps(config),
+            capture_cpus=config.capture_cpus,
+            inference_cpus=config.inference_cpus,
+        )
+
+    def isOpened(self) -> bool:
+        return not self._stop.is_set() and any(source.capture.isOpened() for source in self.sources)
+
+    def wait_until_ready(self) -> None:
+        for source in self.sources:
+            source.engine.wait_until_ready()
+
+    def start(self) -> None:
+        for source in self.sources:
+            if not source.capture.isOpened():
+                logger.error("Camera %d could not be opened; source %d disabled", source.camera_index, source.source_id)
+                continue
+            source.thread = threading.Thread(
+                target=self._capture_loop,
+                args=(source,),
+                name=f"capture-{source.camera_index}",
+                daemon=True,
+            )
+            source.thread.start()
+        for idx in range(self.worker_count):
+            worker = threading.Thread(target=self._inference_loop, name=f"vision-{idx}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+        logger.info(
+            "Multi-camera pipeline started: sources=%s workers=%d",
+            ",".join(f"{source.camera_index}(p{source.priority})" for source in self.sources),
+            self.worker_count,
+        )
+
+    def _capture_loop(self, source: _Source) -> None:
+        # Pacing the capture threads caps inference too: workers only run on
+        # queued frames. Sleeping on the stop event keeps release() prompt.
+        pin_current_thread(self.capture_cpus, "capture")
+        pacer = FramePacer(self.target_fps, sleep=self._stop.wait)
+        source.pacer = pacer
+        while not self._stop.is_set():
+            pacer.wait()
+            ok, frame = source.capture.read()
+            if not ok:
+                retry_delay = getattr(source.capture, "retry_delay", None)
+                delay = retry_delay() if retry_delay is not None else 0.0
+                self._stop.wait(min(max(delay, 0.01), 0.5))
+                pacer.reset()
+                continue
+            now = time.time()
+            with self._condition:
+                if len(source.pending) == source.pending.maxlen:
+                    # Inference is behind: the oldest queued frame is dropped.
+                    source.dropped_frames += 1
+                source.pending.append((now, frame))
+                source.captured.tick(now)
+                self._condition.notify_all()
+
+    def _next_job(self) -> Optional[_Source]:
+        # Round-robin over sources with a queued frame: the one served least
+        # recently goes first, so one fast camera cannot starve the others.
+        ready = [source for source in self.sources if source.pending and not source.busy]
+        if not ready:
+            return None
+        return min(ready, key=lambda source: source.last_served)
+
+    def _inference_loop(self) -> None:
+        pin_current_thread(self.inference_cpus, "inference")
+        while True:
+            with self._condition:
+                source = self._next_job()
+                while source is None and not self._stop.is_set():
+                    self._condition.wait(0.1)
+                    source = self._next_job()
+                if source is None:
+                    return
+                timestamp, frame = source.pending.popleft()
+                source.busy = True
+                source.last_served = time.perf_counter()
+            started = time.perf_counter()
+            try:
+                image, hand_info = source.engine.process_frame(frame, timestamp)
+            except Exception:
+                logger.exception("Vision engine failed on camera %d", source.camera_index)
+                image, hand_info = frame, None
+            if self.inference_observer is not None:
+                self.inference_observer(source.camera_index, time.perf_counter() - started)
+            with self._condition:
+                source.busy = False
+                source.result = SourceResult(source.source_id, timestamp, image, hand_info)
+                source.processed.tick(time.time())
+                self._result_version += 1
+                self._condition.notify_all()
+
+    def wait_for_result(self, timeout: float = 0.5) -> bool:
+        with self._condition:
+            if self._result_version == self._consumed_version:
+                self._condition.wait_for(lambda: self._result_version != self._consumed_version, timeout)
+            if self._result_version == self._consumed_version:
+                return False
+            self._consumed_version = self._result_version
+            return True
+
+    def merged(self) -> Optional[SourceResult]:
+        now = time.time()
+        with self._condition:
+            fresh = [
+                source.result
+                for source in self.sources
+                if source.result is not None and now - source.result.timestamp <= self.stale_seconds
+            ]
+        if not fresh:
+            return None
+        priority = {source.source_id: source.priority for source in self.sources}
+        with_hand = [result for result in fresh if result.hand_info is not None]
+        candidates = with_hand or fresh
+
+        def rank(result: SourceResult) -> tuple:
+            area = result.hand_info.bounding_box_area if result.hand_info is not None else 0.0
+            # Staying on the current source wins ties, so equal-priority
+            # cameras do not flicker between each other.
+            return (priority[result.source_id], result.source_id == self.active_source, area)
+
+        chosen = max(candidates, key=rank)
+        if with_hand and chosen.source_id != self.active_source:
+            logger.info("Active camera: %d", self.sources[chosen.source_id].camera_index)
+            self.active_source = chosen.source_id
+        return chosen
+
+    def stats(self) -> List[SourceStats]:
+        now = time.time()
+        with self._condition:
+            return [
+                SourceStats(
+                    source_id=source.source_id,
+                    camera_index=source.camera_index,
+                    priority=source.priority,
+                    capture_fps=source.captured.rate(now),
+                    processed_fps=source.processed.rate(now),
+                    queue_depth=len(source.pending),
+                    dropped_frames=source.dropped_frames,
+                )
+                for source in self.sources
+            ]
+
+    def detector_counts(self) -> Dict[int, tuple[int, int]]:
+        return {source.camera_index: (source.engine.detector_runs, source.engine.tracked_frames) for source in self.sources}
+
+    def release(self) -> None:
+        self._stop.set()
+        with self._condition:
+            self._condition.notify_all()
+        for thread in [source.thread for source in self.sources if source.thread] + self._workers:
+            thread.join(timeout=1.0)
+        for source in self.sources:
+            source.capture.release()
+            source.engine.close()
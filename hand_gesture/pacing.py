@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import logging
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Tuple
+
+from hand_gesture.config import RuntimeConfig
+
+logger = logging.getLogger(__name__)
+
+POWER_PROFILES = ("default", "power_saver")
+
+
+@dataclass(frozen=True)
+class PacingStats:
+    frames: int
+    target_fps: float
+    achieved_fps: float
+    jitter_ms: float
+    cpu_ms_per_frame: float
+    sleep_ms_per_frame: float
+    late_frames: int
+
+
+def effective_target_fps(config: RuntimeConfig) -> float:
+    if config.power_profile not in POWER_PROFILES:
+        raise ValueError(f"Unknown power_profile {config.power_profile!r}; expected one of {', '.join(POWER_PROFILES)}")
+    if config.power_profile == "power_saver":
+        if config.target_fps > 0:
+            return min(config.target_fps, config.power_saver_fps)
+        return config.power_saver_fps
+    return config.target_fps
+
+
+def apply_power_profile(config: RuntimeConfig) -> None:
+    effective_target_fps(config)
+    if config.power_profile != "power_saver":
+        return
+    import cv2
+
+    # OpenCV's worker pool mostly wakes cores for small per-frame resizes
+    # and colour conversions; on battery one thread is cheaper overall.
+    cv2.setNumThreads(config.power_saver_opencv_threads)
+    logger.info(
+        "Power saver profile: processing capped at %.1f fps, OpenCV threads=%d",
+        effective_target_fps(config),
+        cv2.getNumThreads(),
+    )
+
+
+class FramePacer:
+    # Sleeps until the next frame slot on an absolute schedule, so the rate
+    # does not drift with per-frame work. Each sleep is shortened by the
+    # running average of how late the OS woke us, which keeps jitter low
+    # without spinning. A loop that falls more than a frame behind starts a
+    # new schedule instead of bursting to catch up.
+    def __init__(
+        self,
+        target_fps: float = 0.0,
+        sleep: Callable[[float], object] = time.sleep,
+        clock: Callable[[], float] = time.perf_counter,
+        cpu_clock: Callable[[], float] = time.process_time,
+        window: int = 120,
+    ):
+        self.target_fps = max(target_fps, 0.0)
+        self.period = 1.0 / self.target_fps if self.target_fps > 0 else 0.0
+        self.sleep = sleep
+        self.clock = clock
+        self.cpu_clock = cpu_clock
+        self.frames = 0
+        self.late_frames = 0
+        self._deadline = 0.0
+        self._restart = True
+        self._oversleep = 0.0
+        # (wall time, cpu time, seconds slept) at each frame start.
+        self._samples: Deque[Tuple[float, float, float]] = deque(maxlen=window + 1)
+        self._slept = 0.0
+
+    @classmethod
+    def from_config(cls, config: RuntimeConfig, sleep: Callable[[float], object] = time.sleep) -> "FramePacer":
+        return cls(target_fps=effective_target_fps(config), sleep=sleep)
+
+    def wait(self) -> float:
+        # Blocks until the next slot and returns the time spent sleeping.
+        now = self.clock()
+        slept = 0.0
+        if self.period > 0.0:
+            if self._restart or now - self._deadline > self.period:
+                if not self._restart:
+                    self.late_frames += 1
+                self._deadline = now
+                self._restart = False
+            remaining = self._deadline - now
+            request = remaining - self._oversleep
+            if request > 0.0:
+                self.sleep(request)
+                woke = self.clock()
+                late = (woke - now) - request
+                self._oversleep = min(max(self._oversleep + (late - self._oversleep) * 0.1, 0.0), self.period * 0.5)
+                slept = woke - now
+                now = woke
+            self._deadline += self.period
+        self.frames += 1
+        self._slept += slept
+        self._samples.append((now, self.cpu_clock(), self._slept))
+        return slept
+
+    def reset(self) -> None:
+        # After a failed read the old schedule and intervals no longer apply.
+        self._restart = True
+        self._samples.clear()
+
+    def stats(self) -> PacingStats:
+        samples = list(self._samples)
+        if len(samples) < 2:
+            return PacingStats(self.frames, self.target_fps, 0.0, 0.0, 0.0, 0.0, self.late_frames)
+        intervals = [b[0] - a[0] for a, b in zip(samples, samples[1:])]
+        count = len(intervals)
+        mean = sum(intervals) / count
+        jitter = math.sqrt(sum((value - mean) ** 2 for value in intervals) / count)
+        return PacingStats(
+            frames=self.frames,
+            target_fps=self.target_fps,
+            achieved_fps=1.0 / mean if mean > 0 else 0.0,
+            jitter_ms=jitter * 1000.0,
+            cpu_ms_per_frame=(samples[-1][1] - samples[0][1]) / count * 1000.0,
+            sleep_ms_per_frame=(samples[-1][2] - samples[0][2]) / count * 1000.0,
+            late_frames=self.late_frames,
+        )
+
+    def log_stats(self, name: str) -> None:
+        stats = self.stats()
+        logger.info(
+            "%s pacing: target=%s achieved=%.1ffps jitter=%.2fms cpu=%.2fms/frame sleep=%.2fms/frame late=%d",
+            name,
+            f"{stats.target_fps:.1f}fps" if stats.target_fps > 0 else "unpaced",
+            stats.achieved_fps,
+            stats.jitter_ms,
+            stats.cpu_ms_per_frame,
+            stats.sleep_ms_per_frame,
+            stats.late_frames,
+        )
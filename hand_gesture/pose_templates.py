@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import time
+from collections import Counter
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from hand_gesture.config import RuntimeConfig, load_runtime_config
+from hand_gesture.gestures import GestureAction, HandInfo
+
+logger = logging.getLogger(__name__)
+
+LANDMARK_COUNT = 21
+TEMPLATE_DIM = LANDMARK_COUNT * 2
+
+TEMPLATE_DTYPE = np.dtype(
+    [
+        ("action", "U32"),
+        ("user", "U32"),
+        ("vector", np.float32, (TEMPLATE_DIM,)),
+    ]
+)
+
+
+def normalize_landmarks(
+    landmarks: Sequence[Tuple[float, float]],
+    palm_center: Tuple[float, float],
+    palm_scale: float,
+    hand_label: Optional[str] = None,
+) -> np.ndarray:
+    points = np.asarray(landmarks, dtype=np.float32).reshape(LANDMARK_COUNT, 2)
+    points = (points - np.asarray(palm_center, dtype=np.float32)) / max(palm_scale, 1e-6)
+    if hand_label == "Left":
+        # Mirror left hands so one set of samples covers both hands.
+        points[:, 0] = -points[:, 0]
+    # Rotate so the wrist -> middle-finger MCP axis points straight up.
+    axis = points[9] - points[0]
+    angle = np.arctan2(axis[0], -axis[1])
+    cos_a, sin_a = np.cos(angle), np.sin(angle)
+    rotation = np.array([[cos_a, sin_a], [-sin_a, cos_a]], dtype=np.float32)
+    return (points @ rotation.T).reshape(TEMPLATE_DIM)
+
+
+def pose_vector(hand_info: HandInfo) -> Optional[np.ndarray]:
+    if len(hand_info.landmarks) != LANDMARK_COUNT:
+        return None
+    return normalize_landmarks(hand_info.landmarks, hand_info.palm_center, hand_info.palm_scale, hand_info.hand_label)
+
+
+def load_templates(path: str, mmap: bool = True) -> np.ndarray:
+    templates = np.load(path, mmap_mode="r" if mmap else None)
+    if templates.dtype != TEMPLATE_DTYPE:
+        raise ValueError(f"{path}: not a pose template file (dtype {templates.dtype})")
+    return templates
+
+
+def append_templates(path: str, action: GestureAction, vectors: Sequence[np.ndarray], user: str = "default") -> int:
+    records = np.zeros(len(vectors), dtype=TEMPLATE_DTYPE)
+    records["action"] = action.value
+    records["user"] = user
+    if len(vectors):
+        records["vector"] = np.stack(vectors)
+    if os.path.exists(path):
+        records = np.concatenate([load_templates(path, mmap=False), records])
+    # Write next to the target and swap it in, so an interrupted recording
+    # never leaves a truncated template file behind.
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as handle:
+        np.save(handle, records)
+    os.replace(temporary, path)
+    return len(records)
+
+
+# Up to this many templates a brute-force scan (one matrix-vector product)
+# beats the KD-tree: in 42 dimensions the tree prunes little until the set
+# is large. Measured with benchmarks.pose_templates; see the README.
+LINEAR_SCAN_MAX = 20000
+
+
+class LinearIndex:
+    def __init__(self, points: np.ndarray):
+        # In-memory copy: the scan reads every row on every query.
+        self.points = np.ascontiguousarray(points, dtype=np.float32)
+        self._half_norms = 0.5 * np.einsum("ij,ij->i", self.points, self.points)
+
+    def nearest(self, query: np.ndarray, max_distance: float = float("inf")) -> Tuple[int, float]:
+        if not len(self.points):
+            return -1, float("inf")
+        # |p - q|^2 / 2 = |p|^2 / 2 - p.q + |q|^2 / 2, and the last term is
+        # the same for every row: one matrix-vector product ranks them all.
+        index = int(np.argmin(self._half_norms - self.points @ query))
+        diff = self.points[index] - query
+        distance_sq = float(diff @ diff)
+        if distance_sq >= max_distance * max_distance:
+            return -1, float("inf")
+        return index, float(np.sqrt(distance_sq))
+
+
+class KDTree:
+    def __init__(self, points: np.ndarray, leaf_size: int = 16):
+        # Only the permutation and split planes live in memory; leaf scans
+        # read points straight from the (possibly memory-mapped) array.
+        self.points = points
+        self.leaf_size = max(1, leaf_size)
+        self.order = np.arange(len(points), dtype=np.int64)
+        self._dims: List[int] = []
+        self._splits: List[float] = []
+        self._children: List[Tuple[int, int]] = []
+        self._ranges: List[Tuple[int, int]] = []
+        if len(points):
+            self._build()
+
+    def _add_node(self, start: int, end: int) -> int:
+        self._dims.append(-1)
+        self._splits.append(0.0)
+        self._children.append((-1, -1))
+        self._ranges.append((start, end))
+        return len(self._dims) - 1
+
+    def _build(self) -> None:
+        stack = [self._add_node(0, len(self.points))]
+        while stack:
+            node = stack.pop()
+            start, end = self._ranges[node]
+            if end - start <= self.leaf_size:
+                continue
+            indices = self.order[start:end]
+            values = np.asarray(self.points[indices])
+            dim = int(np.argmax(values.max(axis=0) - values.min(axis=0)))
+            mid = (end - start) // 2
+            partition = np.argpartition(values[:, dim], mid)
+            self.order[start:end] = indices[partition]
+            self._dims[node] = dim
+            self._splits[node] = float(values[partition[mid], dim])
+            left = self._add_node(start, start + mid)
+            right = self._add_node(start + mid, end)
+            self._children[node] = (left, right)
+            stack.extend((left, right))
+
+    def nearest(self, query: np.ndarray, max_distance: float = float("inf")) -> Tuple[int, float]:
+        if not self._dims:
+            return -1, float("inf")
+        best_index = -1
+        best_sq = max_distance * max_distance
+        stack = [(0, 0.0)]
+        while stack:
+            node, bound = stack.pop()
+            if bound >= best_sq:
+                continue
+            dim = self._dims[node]
+            if dim < 0:
+                start, end = self._ranges[node]
+                indices = self.order[start:end]
+                diff = np.asarray(self.points[indices]) - query
+                distances = np.einsum("ij,ij->i", diff, diff)
+                slot = int(np.argmin(distances))
+                if distances[slot] < best_sq:
+                    best_sq = float(distances[slot])
+                    best_index = int(indices[slot])
+                continue
+            offset = float(query[dim]) - self._splits[node]
+            left, right = self._children[node]
+            near, far = (left, right) if offset < 0.0 else (right, left)
+            # Visit the near side first; the far side only while the split
+            # plane is closer than the best match so far.
+            stack.append((far, max(bound, offset * offset)))
+            stack.append((near, bound))
+        return best_index, float(np.sqrt(best_sq)) if best_index >= 0 else float("inf")
+
+
+class PoseTemplateClassifier:
+    def __init__(
+        self,
+        templates_path: str,
+        max_distance: float = 1.5,
+        fallback: bool = True,
+        leaf_size: int = 16,
+        linear_scan_max: int = LINEAR_SCAN_MAX,
+    ):
+        self.templates_path = templates_path
+        self.max_distance = max_distance
+        self.fallback = fallback
+        self.templates = load_templates(templates_path)
+        self.actions = [GestureAction(value) for value in np.unique(self.templates["action"])]
+        self._action_of = {action.value: action for action in self.actions}
+        started_at = time.perf_counter()
+        if len(self.templates) <= linear_scan_max:
+            self.index: Union[LinearIndex, KDTree] = LinearIndex(self.templates["vector"])
+        else:
+            self.index = KDTree(self.templates["vector"], leaf_size=leaf_size)
+        logger.info(
+            "Pose templates loaded: path=%s templates=%d actions=%s index=%s index_build=%.1fms",
+            templates_path,
+            len(self.templates),
+            ",".join(action.value for action in self.actions),
+            type(self.index).__name__,
+            (time.perf_counter() - started_at) * 1000.0,
+        )
+        self.last_distance = float("inf")
+
+    @classmethod
+    def from_config(cls, config: RuntimeConfig) -> "PoseTemplateClassifier":
+        return cls(
+            templates_path=config.pose_templates_path,
+            max_distance=config.pose_template_max_distance,
+            fallback=config.pose_template_fallback,
+        )
+
+    def classify(self, hand_info: HandInfo) -> Optional[GestureAction]:
+        vector = pose_vector(hand_info)
+        if vector is None:
+            return None
+        return self.classify_vector(vector)
+
+    def classify_vector(self, vector: np.ndarray) -> Optional[GestureAction]:
+        index, self.last_distance = self.index.nearest(vector, self.max_distance)
+        if index < 0:
+            return None
+        return self._action_of[str(self.templates["action"][index])]
+
+
+def record_samples(config: RuntimeConfig, action: GestureAction, samples: int, interval_seconds: float) -> List[np.ndarray]:
+    import cv2
+
+    from hand_gesture.camera import CameraCapture
+    from hand_gesture.vision import VisionEngine
+
+    vision = VisionEngine(
+        max_num_hands=1,
+        min_detection_confidence=config.min_detection_confidence,
+        min_tracking_confidence=config.min_tracking_confidence,
+        warm_up_size=(config.frame_width, config.frame_height),
+    )
+    vision.start_warm_up()
+    cap = CameraCapture(
+        camera_index=config.camera_index,
+        width=config.frame_width,
+        height=config.frame_height,
+        fps=config.camera_fps,
+        buffer_size=config.camera_buffer_size,
+        backends=config.camera_backends,
+        fourccs=config.camera_fourccs,
+    )
+    vectors: List[np.ndarray] = []
+    last_sample = 0.0
+    try:
+        while cap.isOpened() and len(vectors) < samples:
+            ok, frame = cap.read()
+            if not ok:
+                continue
+            image, hand_info = vision.process_frame(frame)
+            now = time.time()
+            vector = pose_vector(hand_info) if hand_info else None
+            if vector is not None and now - last_sample >= interval_seconds:
+                vectors.append(vector)
+                last_sample = now
+            cv2.putText(
+                image,
+                f"Recording {action.value}: {len(vectors)}/{samples} (q to stop)",
+                (12, 30),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                0.7,
+                (255, 255, 255),
+                2,
+            )
+            cv2.imshow("Pose Template Recorder", image)
+            if (cv2.waitKey(1) & 0xFF) == ord("q"):
+                break
+    finally:
+        cap.release()
+        vision.close()
+        cv2.destroyAllWindows()
+    return vectors
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Record and inspect custom pose templates.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record = commands.add_parser("record", help="Record samples of a pose from the camera.")
+    record.add_argument("action", choices=[action.value for action in GestureAction])
+    record.add_argument("--out", default="pose_templates.npy")
+    record.add_argument("--samples", type=int, default=20)
+    record.add_argument("--interval", type=float, default=0.15, help="Seconds between samples.")
+    record.add_argument("--user", default=os.environ.get("USERNAME") or os.environ.get("USER") or "default")
+    record.add_argument("--config", help="Runtime config JSON for camera settings.")
+    show = commands.add_parser("list", help="Summarize a template file.")
+    show.add_argument("path", nargs="?", default="pose_templates.npy")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(name)s | %(message)s")
+    if args.command == "list":
+        templates = load_templates(args.path)
+        counts = Counter(zip(templates["user"].tolist(), templates["action"].tolist()))
+        print(f"{len(templates)} templates in {args.path}")
+        for (user, action), count in sorted(counts.items()):
+            print(f"{user:>16} {action:<24} {count:5d}")
+        return 0
+
+    config = load_runtime_config(args.config) if args.config else RuntimeConfig()
+    action = GestureAction(args.action)
+    vectors = record_samples(config, action, args.samples, args.interval)
+    if not vectors:
+        print("No samples recorded.")
+        return 1
+    total = append_templates(args.out, action, vectors, args.user)
+    print(f"Recorded {len(vectors)} samples of {action.value} for {args.user}; {total} templates in {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
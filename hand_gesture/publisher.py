@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import socket
+import struct
+import time
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple, Union
+
+from hand_gesture.config import RuntimeConfig
+from hand_gesture.gestures import HandInfo
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"HGST"
+VERSION = 1
+MESSAGE_FRAME = 1
+MESSAGE_EVENT = 2
+
+# All messages: magic, version, type, reserved, sequence, timestamp.
+HEADER = struct.Struct("<4sBBHId")
+# Frame payload: has_hand, hand label (0 none, 1 left, 2 right), finger bits
+# (thumb = bit 0), finger count, thumb vertical, landmark count, 2 pad bytes,
+# palm center, index tip, palm scale, bounding-box area, finger spread and
+# 21 landmark (x, y) pairs. Landmarks are zero when not available.
+FRAME = struct.Struct("<BBBBBB2x2f2f3f42f")
+# Event payload: action or event name, UTF-8, NUL padded. Longer names are
+# cut on a character boundary.
+EVENT = struct.Struct("<32s")
+EVENT_NAME_BYTES = EVENT.size
+
+_LABEL_CODES = {None: 0, "Left": 1, "Right": 2}
+_LABEL_NAMES = {code: label for label, code in _LABEL_CODES.items()}
+_NO_LANDMARKS = (0.0,) * 42
+
+
+@dataclass(frozen=True)
+class FrameMessage:
+    sequence: int
+    timestamp: float
+    hand_info: Optional[HandInfo]
+
+
+@dataclass(frozen=True)
+class EventMessage:
+    sequence: int
+    timestamp: float
+    name: str
+
+
+def _parse_target(target: str) -> Tuple[int, Union[str, Tuple[str, int]]]:
+    if target.startswith("udp://"):
+        host, _, port = target[len("udp://") :].rpartition(":")
+        return socket.AF_INET, (host or "127.0.0.1", int(port))
+    if target.startswith("unix://"):
+        if not hasattr(socket, "AF_UNIX"):
+            raise ValueError("Unix domain sockets are not available on this platform; use udp://host:port")
+        return socket.AF_UNIX, target[len("unix://") :]
+    raise ValueError(f"Unsupported publish target {target!r}; expected udp://host:port or unix:///path")
+
+
+def encode_frame(sequence: int, timestamp: float, hand_info: Optional[HandInfo]) -> bytes:
+    header = HEADER.pack(MAGIC, VERSION, MESSAGE_FRAME, 0, sequence & 0xFFFFFFFF, timestamp)
+    if hand_info is None:
+        return header + FRAME.pack(0, 0, 0, 0, 0, 0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, *_NO_LANDMARKS)
+    bits = 0
+    for idx, value in enumerate(hand_info.finger_state):
+        bits |= (1 if value else 0) << idx
+    landmarks = hand_info.landmarks
+    flat = tuple(value for point in landmarks for value in point) if len(landmarks) == 21 else _NO_LANDMARKS
+    return header + FRAME.pack(
+        1,
+        _LABEL_CODES.get(hand_info.hand_label, 0),
+        bits,
+        hand_info.finger_count,
+        1 if hand_info.thumb_is_vertical else 0,
+        len(landmarks) if len(landmarks) == 21 else 0,
+        *hand_info.palm_center,
+        *hand_info.index_tip,
+        hand_info.palm_scale,
+        hand_info.bounding_box_area,
+        hand_info.finger_spread,
+        *flat,
+    )
+
+
+def encode_event(sequence: int, timestamp: float, name: str) -> bytes:
+    header = HEADER.pack(MAGIC, VERSION, MESSAGE_EVENT, 0, sequence & 0xFFFFFFFF, timestamp)
+    raw = name.encode("utf-8")
+    if len(raw) > EVENT_NAME_BYTES:
+        raw = raw[:EVENT_NAME_BYTES].decode("utf-8", "ignore").encode("utf-8")
+    return header + EVENT.pack(raw)
+
+
+def decode_message(data: bytes) -> Union[FrameMessage, EventMessage]:
+    if len(data) < HEADER.size:
+        raise ValueError(f"message too short: {len(data)} bytes")
+    magic, version, kind, _, sequence, timestamp = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"unknown message header: magic={magic!r} version={version}")
+    if kind == MESSAGE_EVENT:
+        (raw,) = EVENT.unpack_from(data, HEADER.size)
+        return EventMessage(sequence, timestamp, raw.rstrip(b"\0").decode("utf-8", "replace"))
+    if kind != MESSAGE_FRAME:
+        raise ValueError(f"unknown message type {kind}")
+    values = FRAME.unpack_from(data, HEADER.size)
+    has_hand, label, bits, finger_count, thumb_vertical, landmark_count = values[:6]
+    if not has_hand:
+        return FrameMessage(sequence, timestamp, None)
+    floats = values[6:]
+    landmarks = tuple((floats[7 + 2 * idx], floats[8 + 2 * idx]) for idx in range(landmark_count))
+    return FrameMessage(
+        sequence,
+        timestamp,
+        HandInfo(
+            finger_state=tuple((bits >> idx) & 1 for idx in range(5)),
+            finger_count=finger_count,
+            index_tip=(floats[2], floats[3]),
+            palm_center=(floats[0], floats[1]),
+            bounding_box_area=floats[5],
+            palm_scale=floats[4],
+            hand_label=_LABEL_NAMES.get(label),
+            finger_spread=floats[6],
+            thumb_is_vertical=bool(thumb_vertical),
+            landmarks=landmarks,
+        ),
+    )
+
+
+class StatePublisher:
+    def __init__(self, target: str, max_rate_hz: float = 0.0):
+        self.target = target
+        self.min_interval = 1.0 / max_rate_hz if max_rate_hz > 0 else 0.0
+        self.sequence = 0
+        self.sent = 0
+        self.dropped = 0
+        self.throttled = 0
+        self._last_frame_time = float("-inf")
+        family, self._address = _parse_target(target)
+        self._socket = socket.socket(family, socket.SOCK_DGRAM)
+        # Datagrams and a non-blocking socket: a slow or absent subscriber
+        # costs a dropped message, never a stalled frame loop.
+        self._socket.setblocking(False)
+        logger.info("Publishing hand state to %s (max rate %s)", target, f"{max_rate_hz:g} Hz" if max_rate_hz > 0 else "unlimited")
+
+    @classmethod
+    def from_config(cls, config: RuntimeConfig) -> "StatePublisher":
+        return cls(target=config.publish_target, max_rate_hz=config.publish_max_rate_hz)
+
+    def _send(self, message: bytes) -> bool:
+        self.sequence += 1
+        try:
+            self._socket.sendto(message, self._address)
+        except (BlockingIOError, ConnectionRefusedError, FileNotFoundError, InterruptedError):
+            self.dropped += 1
+            return False
+        except OSError as ex:
+            # ENOBUFS and friends: the kernel queue is full; drop like above.
+            self.dropped += 1
+            logger.debug("Publish dropped: %s", ex)
+            return False
+        self.sent += 1
+        return True
+
+    def publish_frame(self, timestamp: float, hand_info: Optional[HandInfo]) -> bool:
+        if timestamp - self._last_frame_time < self.min_interval:
+            self.throttled += 1
+            return False
+        self._last_frame_time = timestamp
+        return self._send(encode_frame(self.sequence + 1, timestamp, hand_info))
+
+    def publish_event(self, timestamp: float, name: str) -> bool:
+        return self._send(encode_event(self.sequence + 1, timestamp, name))
+
+    def close(self) -> None:
+        self._socket.close()
+
+
+def open_subscriber(target: str, timeout: Optional[float] = None) -> socket.socket:
+    family, address = _parse_target(target)
+    sock = socket.socket(family, socket.SOCK_DGRAM)
+    if family == socket.AF_UNIX and os.path.exists(address):
+        os.unlink(address)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+    sock.bind(address)
+    sock.settimeout(timeout)
+    return sock
+
+
+def subscribe(target: str, show_frames: bool = False) -> None:
+    sock = open_subscriber(target)
+    expected: Optional[int] = None
+    lost = 0
+    received = 0
+    skipped = 0
+    started = time.perf_counter()
+    try:
+        while True:
+            data = sock.recv(4096)
+            try:
+                message = decode_message(data)
+            except ValueError as ex:
+                # Stray or malformed datagrams are skipped, not fatal.
+                skipped += 1
+                logger.warning("Skipping undecodable message (%d bytes): %s", len(data), ex)
+                continue
+            received += 1
+            if expected is not None and message.sequence != expected:
+                lost += (message.sequence - expected) & 0xFFFFFFFF
+            expected = (message.sequence + 1) & 0xFFFFFFFF
+            if isinstance(message, EventMessage):
+                print(f"{message.timestamp:.3f} #{message.sequence} event {message.name}")
+            elif show_frames:
+                hand = message.hand_info
+                state = "".join(str(value) for value in hand.finger_state) if hand else "-----"
+                center = f"({hand.palm_center[0]:.3f}, {hand.palm_center[1]:.3f})" if hand else "-"
+                print(f"{message.timestamp:.3f} #{message.sequence} frame fingers={state} palm={center}")
+    except KeyboardInterrupt:
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        print(f"received {received} messages ({received / elapsed:.1f}/s), {lost} lost, {skipped} skipped")
+    finally:
+        sock.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Reference subscriber for the binary hand-state stream.")
+    parser.add_argument("target", nargs="?", default="udp://127.0.0.1:5005", help="udp://host:port or unix:///path")
+    parser.add_argument("--frames", action="store_true", help="Print every frame message, not only events.")
+    args = parser.parse_args(argv)
+    subscribe(args.target, args.frames)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,424 @@
+from __future__ import annotations
+
+import logging
+import math
+import time
+from dataclasses import dataclass
+from numbers import Real
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from hand_gesture.config import RuntimeConfig
+from hand_gesture.dynamic import DynamicGestureEngine
+from hand_gesture.gestures import MOTION_ACTIONS, GestureAction, HandInfo, action_label, map_action
+from hand_gesture.identity import HandTracker
+from hand_gesture.macros import MacroRecognizer
+from hand_gesture.memo import MemoizedPoseClassifier
+from hand_gesture.pose_templates import PoseTemplateClassifier
+from hand_gesture.stability import GestureStabilizer, TaskViewNavigator
+
+# Nothing here may import cv2, mediapipe or pyautogui at module level: this
+# is the entry point for embedding recognition in other processes.
+
+logger = logging.getLogger(__name__)
+
+_FINGER_TIPS = np.array([8, 12, 16, 20])
+
+
+@dataclass(frozen=True)
+class Decision:
+    timestamp: float
+    action: str
+
+
+@dataclass(frozen=True)
+class ActionResult:
+    action: GestureAction
+    ok: bool
+    error: Optional[str] = None
+    # Name of the macro the action ran for, if any.
+    macro: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class HandEvent:
+    timestamp: float
+    hand_info: Optional[HandInfo]
+    action: Optional[GestureAction]
+    decisions: Tuple[str, ...] = ()
+    # Every action handed to the executor this frame, in order.
+    results: Tuple[ActionResult, ...] = ()
+    # Candidate that was ready but still inside the action cooldown.
+    cooldown_blocked: Optional[GestureAction] = None
+    # New status line, or None to keep the previous one.
+    status: Optional[str] = None
+
+
+class SimulatedExecutor:
+    # Stands in for DesktopActionExecutor when recognition runs without a
+    # desktop: every action succeeds, and Task View opens and closes as it
+    # does on Windows.
+    def __init__(self) -> None:
+        self.task_view_active = False
+        self.last_error: Optional[str] = None
+
+    def execute(self, action: GestureAction) -> bool:
+        if action in (GestureAction.OPEN_TASK_VIEW, GestureAction.SWIPE_UP):
+            self.task_view_active = True
+        elif action == GestureAction.SELECT_TASK_WINDOW:
+            self.task_view_active = False
+        return True
+
+    def navigate_task_view(self, direction: str) -> bool:
+        return self.task_view_active
+
+
+class GestureRecognizer:
+    # The gesture decision path: per-frame candidate actions in, committed
+    # decisions out. GestureController runs it with DesktopActionExecutor;
+    # embedded use gets SimulatedExecutor.
+    def __init__(
+        self,
+        stabilizer: GestureStabilizer,
+        navigator: TaskViewNavigator,
+        action_cooldown_seconds: float = 2.0,
+        motion_engine: Optional[DynamicGestureEngine] = None,
+        pose_classifier: Optional[Union[PoseTemplateClassifier, MemoizedPoseClassifier]] = None,
+        macros: Optional[MacroRecognizer] = None,
+        executor: Any = None,
+    ):
+        self.stabilizer = stabilizer
+        self.navigator = navigator
+        self.action_cooldown_seconds = action_cooldown_seconds
+        self.motion_engine = motion_engine
+        self.pose_classifier = pose_classifier
+        self.macros = macros
+        self.executor = executor if executor is not None else SimulatedExecutor()
+        self.last_action_time = float("-inf")
+        # Stabilizer and navigator per tracked hand ID (see track_hands);
+        # self.stabilizer and self.navigator are the active hand's pair.
+        self.hand_states: Dict[int, Tuple[GestureStabilizer, TaskViewNavigator]] = {}
+        self.state_hand_id: Optional[int] = None
+
+    @classmethod
+    def from_config(cls, config: RuntimeConfig, executor: Any = None) -> "GestureRecognizer":
+        pose_classifier = None
+        if config.pose_classifier == "templates":
+            pose_classifier = PoseTemplateClassifier.from_config(config)
+            if config.pose_memo_tolerance > 0.0:
+                pose_classifier = MemoizedPoseClassifier(pose_classifier, config.pose_memo_tolerance)
+        return cls(
+            stabilizer=GestureStabilizer.from_config(config),
+            navigator=TaskViewNavigator.from_config(config),
+            action_cooldown_seconds=config.action_cooldown_seconds,
+            motion_engine=DynamicGestureEngine.from_config(config) if config.dynamic_gestures_enabled else None,
+            pose_classifier=pose_classifier,
+            macros=MacroRecognizer.from_config(config) if config.macros_path else None,
+            executor=executor,
+        )
+
+    @property
+    def task_view_active(self) -> bool:
+        return self.executor.task_view_active
+
+    def _new_hand_state(self) -> Tuple[GestureStabilizer, TaskViewNavigator]:
+        stabilizer, navigator = self.stabilizer, self.navigator
+        return (
+            GestureStabilizer(
+                hold_seconds_required=stabilizer.hold_seconds_required,
+                action_vote_window_seconds=stabilizer.action_vote_window_seconds,
+                action_vote_ratio=stabilizer.action_vote_ratio,
+                hand_steady_speed=stabilizer.hand_steady_speed,
+                steady_seconds_required=stabilizer.steady_seconds_required,
+            ),
+            TaskViewNavigator(navigator.min_delta, navigator.cooldown_seconds, navigator.deadzone_speed),
+        )
+
+    def track_hands(self, hands: HandTracker, timestamp: float) -> None:
+        # Call before update() when several hands are tracked: decisions
+        # follow the tracker's active hand, and each visible hand keeps its
+        # own hold and steadiness timers so control can pass to another
+        # hand without starting over.
+        for hand_id in [hand_id for hand_id in self.hand_states if hand_id not in hands.tracks]:
+            del self.hand_states[hand_id]
+        active_id = hands.active_id
+        if active_id is not None and active_id != self.state_hand_id:
+            state = self.hand_states.get(active_id)
+            if state is None:
+                state = (self.stabilizer, self.navigator) if self.state_hand_id is None else self._new_hand_state()
+                self.hand_states[active_id] = state
+            if self.state_hand_id is not None and self.motion_engine is not None:
+                # A trajectory that starts on one hand and ends on another
+                # is not a gesture.
+                self.motion_engine.reset()
+            if self.state_hand_id is not None and self.macros is not None:
+                self.macros.reset()
+            self.stabilizer, self.navigator = state
+            self.state_hand_id = active_id
+        for track in hands.visible():
+            if track.hand_id == active_id:
+                continue
+            state = self.hand_states.get(track.hand_id)
+            if state is None:
+                state = self.hand_states[track.hand_id] = self._new_hand_state()
+            stabilizer = state[0]
+            stabilizer.update_steadiness(track.hand_info, timestamp)
+            stabilizer.update(map_action(track.hand_info, None, self.pose_classifier), timestamp)
+
+    def _execute(self, action: GestureAction, results: List[ActionResult], macro: Optional[str] = None) -> bool:
+        ok = self.executor.execute(action)
+        error = None if ok else self.executor.last_error
+        results.append(ActionResult(action, ok, error, macro))
+        if not ok:
+            logger.error("Action failed: %s: %s", action.value, error or "unknown error")
+        return ok
+
+    def update(self, timestamp: float, hand_info: Optional[HandInfo]) -> HandEvent:
+        now = timestamp
+        stabilizer = self.stabilizer
+        decisions: List[str] = []
+        results: List[ActionResult] = []
+        status: Optional[str] = None
+        blocked: Optional[GestureAction] = None
+        motion_action = self.motion_engine.update(hand_info, now) if self.motion_engine is not None else None
+        action = map_action(hand_info, motion_action, self.pose_classifier) if hand_info else motion_action
+        if (
+            self.task_view_active
+            and action not in {GestureAction.OPEN_TASK_VIEW, GestureAction.SELECT_TASK_WINDOW}
+            and action not in MOTION_ACTIONS
+        ):
+            action = None
+        stabilizer.update_steadiness(hand_info, now)
+        macro = None
+        if action in MOTION_ACTIONS:
+            # Motion gestures are complete when matched; they skip the hold.
+            stabilizer.update(None, now)
+            if self.macros is not None:
+                macro = self.macros.feed(action, now)
+            if macro is None:
+                logger.info("Executing motion action: %s", action.value)
+                decisions.append(action.value)
+                if self._execute(action, results):
+                    self.last_action_time = now
+                    status = f"Executed: {action_label(action)}"
+                else:
+                    status = self.executor.last_error or "Action failed"
+        else:
+            stabilizer.update(action, now)
+            if self.macros is not None:
+                macro = self.macros.observe(stabilizer)
+                if macro is not None:
+                    # The last step completes the macro instead of firing
+                    # its own action.
+                    stabilizer.reset_candidate()
+        if macro is not None:
+            spec = macro.spec
+            logger.info("Macro matched: %s (%.2fs)", spec.name, macro.timestamp - macro.started)
+            decisions.append(f"macro_{spec.name}")
+            status = f"Macro: {spec.name}"
+            # As with single actions, the cooldown starts only once every
+            # action has run.
+            for macro_action in spec.actions:
+                if not self._execute(macro_action, results, macro=spec.name):
+                    status = self.executor.last_error or f"Macro {spec.name} failed"
+                    break
+            else:
+                self.last_action_time = now
+
+        candidate_action = stabilizer.candidate_action
+        if candidate_action is not None:
+            ready, ready_status = stabilizer.check_ready()
+            status = ready_status or status
+            if ready:
+                cooldown_required = self.action_cooldown_seconds
+                if candidate_action == GestureAction.SELECT_TASK_WINDOW and self.task_view_active:
+                    cooldown_required = 0.0
+                cooldown_elapsed = now - self.last_action_time
+                if cooldown_elapsed < cooldown_required:
+                    blocked = candidate_action
+                    status = f"Cooldown {cooldown_required - cooldown_elapsed:.1f}s"
+                    logger.debug(
+                        "Execution blocked by cooldown: action=%s remaining=%.2fs",
+                        candidate_action.value,
+                        cooldown_required - cooldown_elapsed,
+                    )
+                else:
+                    logger.info("Executing action: %s", candidate_action.value)
+                    decisions.append(candidate_action.value)
+                    if self._execute(candidate_action, results):
+                        self.last_action_time = now
+                        status = f"Executed: {action_label(candidate_action)}"
+                    else:
+                        status = self.executor.last_error or "Action failed"
+                    stabilizer.reset_candidate()
+
+        if not self.task_view_active or hand_info is None or hand_info.finger_state != (0, 1, 0, 0, 0):
+            self.navigator.reset()
+        else:
+            # Freeze navigation while fist selection is being stabilized.
+            direction = self.navigator.update(
+                hand_info.index_tip,
+                now,
+                frozen=stabilizer.candidate_action == GestureAction.SELECT_TASK_WINDOW,
+            )
+            if direction and self.executor.navigate_task_view(direction):
+                self.navigator.commit(now)
+                decisions.append(f"navigate_{direction}")
+                status = f"Task View move: {direction}"
+                logger.info("Task View navigation: direction=%s", direction)
+        return HandEvent(now, hand_info, action, tuple(decisions), tuple(results), blocked, status)
+
+
+def hand_infos_from_landmarks(
+    landmarks: Any,
+    hand_labels: Union[Optional[str], Sequence[Optional[str]]] = None,
+) -> List[Optional[HandInfo]]:
+    # Vectorized extract_hand_info over an (N, 21, 2) or (N, 21, 3) array of
+    # normalized landmarks. Rows containing NaN mean "no hand" and give None.
+    points = np.asarray(landmarks, dtype=np.float64)
+    if points.ndim != 3 or points.shape[1] != 21 or points.shape[2] < 2:
+        raise ValueError(f"expected landmarks shaped (N, 21, 2) or (N, 21, 3), got {points.shape}")
+    points = points[:, :, :2]
+    count = len(points)
+    if hand_labels is None or isinstance(hand_labels, str):
+        labels: Sequence[Optional[str]] = [hand_labels] * count
+    else:
+        labels = list(hand_labels)
+        if len(labels) != count:
+            raise ValueError(f"{len(labels)} hand labels for {count} landmark rows")
+    label_array = np.array([label or "" for label in labels])
+    x = points[:, :, 0]
+    y = points[:, :, 1]
+
+    def distance(a: Any, b: Any) -> np.ndarray:
+        return np.hypot(x[:, a] - x[:, b], y[:, a] - y[:, b])
+
+    # Same summation order as extract_hand_info so results match exactly.
+    palm_x = (x[:, 0] + x[:, 5] + x[:, 9] + x[:, 13] + x[:, 17]) / 5.0
+    palm_y = (y[:, 0] + y[:, 5] + y[:, 9] + y[:, 13] + y[:, 17]) / 5.0
+
+    dx = x[:, 4] - x[:, 3]
+    horizontal = np.where(
+        label_array == "Right",
+        x[:, 4] < x[:, 3],
+        np.where(label_array == "Left", x[:, 4] > x[:, 3], np.abs(dx) > np.abs(y[:, 4] - y[:, 3])),
+    )
+    thumb = horizontal & (distance(4, 5) > distance(2, 5) * 0.85)
+    tip_y, pip_y, mcp_y = y[:, _FINGER_TIPS], y[:, _FINGER_TIPS - 2], y[:, _FINGER_TIPS - 3]
+    extended = (tip_y < pip_y) & (pip_y < mcp_y)
+    stretched = distance(_FINGER_TIPS, _FINGER_TIPS - 3) > distance(_FINGER_TIPS - 2, _FINGER_TIPS - 3) * 1.15
+    state = np.column_stack([thumb, extended & stretched]).astype(int)
+
+    area = np.maximum((x.max(axis=1) - x.min(axis=1)) * (y.max(axis=1) - y.min(axis=1)), 0.0)
+    vertical = (y[:, 4] < y[:, 2]) & (np.abs(y[:, 4] - y[:, 2]) > np.abs(x[:, 4] - x[:, 2]))
+    missing = np.isnan(points).any(axis=(1, 2))
+
+    columns = zip(
+        state.tolist(),
+        points.tolist(),
+        palm_x.tolist(),
+        palm_y.tolist(),
+        area.tolist(),
+        vertical.tolist(),
+        missing.tolist(),
+        labels,
+    )
+    infos: List[Optional[HandInfo]] = []
+    for finger_state, rows, px, py, box, thumb_vertical, absent, label in columns:
+        if absent:
+            infos.append(None)
+            continue
+        # Stored distances use math.hypot as extract_hand_info does; np.hypot
+        # can differ in the last bit. The threshold tests above tolerate that.
+        wrist, index_mcp, middle_mcp, pinky_mcp = rows[0], rows[5], rows[9], rows[17]
+        scale = max(
+            math.hypot(wrist[0] - middle_mcp[0], wrist[1] - middle_mcp[1]),
+            math.hypot(index_mcp[0] - pinky_mcp[0], index_mcp[1] - pinky_mcp[1]),
+            1e-6,
+        )
+        index_tip, middle_tip = rows[8], rows[12]
+        infos.append(
+            HandInfo(
+                finger_state=tuple(finger_state),
+                finger_count=sum(finger_state),
+                index_tip=tuple(index_tip),
+                palm_center=(px, py),
+                bounding_box_area=box,
+                palm_scale=scale,
+                hand_label=label,
+                finger_spread=math.hypot(index_tip[0] - middle_tip[0], index_tip[1] - middle_tip[1]) / scale,
+                thumb_is_vertical=thumb_vertical,
+                landmarks=tuple(map(tuple, rows)),
+            )
+        )
+    return infos
+
+
+def process_many(
+    landmarks: Any,
+    timestamps: Optional[Sequence[float]] = None,
+    hand_labels: Union[Optional[str], Sequence[Optional[str]]] = None,
+    config: Optional[RuntimeConfig] = None,
+    recognizer: Optional[GestureRecognizer] = None,
+    fps: float = 30.0,
+) -> List[HandEvent]:
+    # Rows are consecutive frames of one stream; pass the same recognizer to
+    # continue a stream across calls. Without timestamps frames are 1/fps apart.
+    infos = hand_infos_from_landmarks(landmarks, hand_labels)
+    if timestamps is None:
+        timestamps = np.arange(len(infos), dtype=np.float64) / fps
+    elif len(timestamps) != len(infos):
+        raise ValueError(f"{len(timestamps)} timestamps for {len(infos)} landmark rows")
+    recognizer = recognizer or GestureRecognizer.from_config(config or RuntimeConfig())
+    return [recognizer.update(float(timestamp), info) for timestamp, info in zip(timestamps, infos)]
+
+
+def _split_item(item: Any) -> Tuple[Optional[float], Any]:
+    if isinstance(item, tuple) and len(item) == 2 and isinstance(item[0], Real):
+        return float(item[0]), item[1]
+    return None, item
+
+
+def iter_hand_events(
+    source: Iterable[Any],
+    config: Optional[RuntimeConfig] = None,
+    hand_label: Optional[str] = None,
+    recognizer: Optional[GestureRecognizer] = None,
+    vision: Any = None,
+) -> Iterator[HandEvent]:
+    # Each item is a payload or a (timestamp, payload) pair. Payloads can be
+    # a BGR frame (H, W, 3), a (21, 2|3) landmark array or sequence, a
+    # HandInfo, or None for "no hand". Untimed items are stamped on arrival.
+    # Frames need a VisionEngine; one is built from config on first use, so
+    # cv2 and mediapipe load only when frames are actually passed.
+    config = config or RuntimeConfig()
+    recognizer = recognizer or GestureRecognizer.from_config(config)
+    owned_vision = None
+    try:
+        for item in source:
+            timestamp, payload = _split_item(item)
+            if timestamp is None:
+                timestamp = time.time()
+            if payload is None or isinstance(payload, HandInfo):
+                hand_info = payload
+            else:
+                array = np.asarray(payload)
+                if array.ndim == 3:
+                    if vision is None:
+                        from hand_gesture.landmarker import create_vision_engine
+
+                        vision = owned_vision = create_vision_engine(config, warm_up_size=(array.shape[1], array.shape[0]))
+                        vision.start_warm_up()
+                    # The engine's flow and hand-switch timers run on the
+                    # caller's timeline, as they do in GestureController.
+                    _, hand_info = vision.process_frame(array, timestamp)
+                    hands = getattr(vision, "hands", None)
+                    if hands is not None:
+                        recognizer.track_hands(hands, timestamp)
+                else:
+                    hand_info = hand_infos_from_landmarks(array[np.newaxis], hand_label)[0]
+            yield recognizer.update(timestamp, hand_info)
+    finally:
+        if owned_vision is not None:
+            owned_vision.close()
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from hand_gesture.config import RuntimeConfig
+from hand_gesture.gestures import HandInfo
+from hand_gesture.replay import hand_info_to_dict
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RecorderStats:
+    submitted: int
+    written: int
+    dropped: int
+    write_ms_per_frame: float
+    # Frames lost because the writer thread failed (see FrameRecorder.error).
+    failed: int = 0
+
+
+def sidecar_path(video_path: str) -> str:
+    return os.path.splitext(video_path)[0] + ".jsonl"
+
+
+def frame_record(hand_info: Optional[HandInfo], decision: Optional[str] = None, **overlay: Any) -> Dict[str, Any]:
+    # Same keys as SessionRecorder ("hand", "decision"), so a sidecar loads
+    # with replay.load_session; overlay state rides along in extra keys.
+    record: Dict[str, Any] = {"hand": hand_info_to_dict(hand_info) if hand_info is not None else None}
+    if decision is not None:
+        record["decision"] = decision
+    record.update(overlay)
+    return record
+
+
+class FrameRecorder:
+    # Writes what the operator saw to a video file plus a JSONL sidecar with
+    # one line per written frame. The loop only copies the frame into a
+    # bounded queue; encoding and file I/O happen on a writer thread. When
+    # the queue is full the frame is dropped, never waited for, and the "seq"
+    # gaps in the sidecar show where. If writing fails, the error is logged
+    # once, the writer thread keeps draining the queue and submit() stops
+    # queueing, so neither the loop nor close() can block on a dead writer.
+    def __init__(
+        self,
+        path: str,
+        fps: float = 30.0,
+        queue_size: int = 8,
+        codec: str = "mp4v",
+    ):
+        self.path = path
+        self.sidecar_path = sidecar_path(path)
+        self.fps = fps if fps > 0 else 30.0
+        self.codec = codec
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.error: Optional[str] = None
+        self._closed = False
+        self._write_seconds = 0.0
+        self._queue: "queue.Queue[Optional[Tuple[int, float, np.ndarray, Dict[str, Any]]]]" = queue.Queue(
+            maxsize=max(1, queue_size)
+        )
+        self._writer: Optional[cv2.VideoWriter] = None
+        self._sidecar = open(self.sidecar_path, "w", encoding="utf-8")
+        self._thread = threading.Thread(target=self._write_loop, name="frame-recorder", daemon=True)
+        self._thread.start()
+        logger.info("Recording frames to %s (sidecar %s)", path, self.sidecar_path)
+
+    @classmethod
+    def from_config(cls, config: RuntimeConfig, fps: float) -> "FrameRecorder":
+        return cls(
+            config.video_record_path,
+            fps=fps,
+            queue_size=config.video_record_queue_size,
+            codec=config.video_record_codec,
+        )
+
+    def submit(self, timestamp: float, frame: np.ndarray, record: Dict[str, Any], copy: bool = True) -> bool:
+        # The loop reuses its frame buffers, so by default the queue holds a
+        # copy; pass copy=False for a frame the caller will not touch again.
+        self.submitted += 1
+        if self.error is not None:
+            self.failed += 1
+            return False
+        try:
+            self._queue.put_nowait((self.submitted, timestamp, frame.copy() if copy else frame, record))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def _open_writer(self, frame: np.ndarray) -> None:
+        height, width = frame.shape[:2]
+        self._writer = cv2.VideoWriter(self.path, cv2.VideoWriter_fourcc(*self.codec), self.fps, (width, height))
+        if not self._writer.isOpened():
+            logger.error("Could not open video writer for %s (codec %s); frames are not recorded", self.path, self.codec)
+
+    def _write_loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if self.error is not None:
+                # Already failed: keep draining so submit() and close()
+                # never wait on a full queue.
+                self.failed += 1
+                continue
+            try:
+                self._write(*item)
+            except Exception as ex:
+                self.error = f"{type(ex).__name__}: {ex}"
+                self.failed += 1
+                logger.exception("Frame recording to %s failed; later frames are not recorded", self.path)
+
+    def _write(self, seq: int, timestamp: float, frame: np.ndarray, record: Dict[str, Any]) -> None:
+        started = time.perf_counter()
+        if self._writer is None:
+            self._open_writer(frame)
+        if frame.ndim == 2:
+            frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+        self._writer.write(frame)
+        line = {"t": round(timestamp, 6), "seq": seq, "frame": self.written, **record}
+        self._sidecar.write(json.dumps(line, separators=(",", ":")))
+        self._sidecar.write("\n")
+        self.written += 1
+        self._write_seconds += time.perf_counter() - started
+
+    def stats(self) -> RecorderStats:
+        return RecorderStats(
+            submitted=self.submitted,
+            written=self.written,
+            dropped=self.dropped,
+            write_ms_per_frame=self._write_seconds / max(self.written, 1) * 1000.0,
+            failed=self.failed,
+        )
+
+    def close(self) -> None:
+        # Queued frames are still written; only the loop never waits. The
+        # sentinel is retried while the writer thread is alive, so a writer
+        # that died with a full queue cannot hang shutdown.
+        if self._closed:
+            return
+        self._closed = True
+        while self._thread.is_alive():
+            try:
+                self._queue.put(None, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        self._thread.join()
+        try:
+            if self._writer is not None:
+                self._writer.release()
+            self._sidecar.close()
+        except Exception:
+            logger.exception("Could not finish recording %s", self.path)
+        stats = self.stats()
+        logger.info(
+            "Recording closed: %s, %d frames written, %d dropped under load, %d lost to errors, %.2f ms/frame on the writer thread",
+            self.path,
+            stats.written,
+            stats.dropped,
+            stats.failed,
+            stats.write_ms_per_frame,
+        )
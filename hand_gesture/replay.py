@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass
+from typing import Any, Iterable, List, Optional
+
+from hand_gesture.config import RuntimeConfig
+from hand_gesture.flight import FLIGHT_SUFFIX, load_flight
+from hand_gesture.gestures import HandInfo
+from hand_gesture.recognizer import Decision, GestureRecognizer
+
+
+@dataclass(frozen=True)
+class SessionFrame:
+    timestamp: float
+    hand_info: Optional[HandInfo]
+    label: Optional[str] = None
+
+
+def _as_tuple(value: Any) -> Any:
+    if isinstance(value, list):
+        return tuple(_as_tuple(item) for item in value)
+    return value
+
+
+def hand_info_to_dict(hand_info: HandInfo) -> dict:
+    return asdict(hand_info)
+
+
+def hand_info_from_dict(data: dict) -> HandInfo:
+    return HandInfo(**{key: _as_tuple(value) for key, value in data.items()})
+
+
+class SessionRecorder:
+    def __init__(self, path: str):
+        self.path = path
+        self.frames_written = 0
+        self._handle = open(path, "w", encoding="utf-8")
+
+    def write(self, timestamp: float, hand_info: Optional[HandInfo], decision: Optional[str] = None) -> None:
+        record: dict = {
+            "t": round(timestamp, 6),
+            "hand": hand_info_to_dict(hand_info) if hand_info is not None else None,
+        }
+        if decision is not None:
+            record["decision"] = decision
+        self._handle.write(json.dumps(record, separators=(",", ":")))
+        self._handle.write("\n")
+        self.frames_written += 1
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+def load_session(path: str) -> List[SessionFrame]:
+    if path.endswith(FLIGHT_SUFFIX):
+        # Flight recorder dumps carry no ground-truth labels.
+        return [SessionFrame(frame.timestamp, frame.hand_info) for frame in load_flight(path).frames]
+    frames: List[SessionFrame] = []
+    with open(path, "r", encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+                hand = record.get("hand")
+                frames.append(
+                    SessionFrame(
+                        timestamp=float(record["t"]),
+                        hand_info=hand_info_from_dict(hand) if hand is not None else None,
+                        label=record.get("label"),
+                    )
+                )
+            except (KeyError, TypeError, ValueError) as ex:
+                raise ValueError(f"{path}:{line_number}: invalid session record: {ex}") from ex
+    return frames
+
+
+def replay_session(frames: Iterable[SessionFrame], config: RuntimeConfig) -> List[Decision]:
+    # GestureController's decision path (GestureRecognizer) with the
+    # simulated executor, so recorded sessions can be re-scored offline.
+    recognizer = GestureRecognizer.from_config(config)
+    decisions: List[Decision] = []
+    for frame in frames:
+        event = recognizer.update(frame.timestamp, frame.hand_info)
+        decisions.extend(Decision(frame.timestamp, action) for action in event.decisions)
+    return decisions
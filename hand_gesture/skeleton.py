@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+Color = Tuple[int, int, int]
+
+# MediaPipe's 21 hand connections, so drawing does not need mediapipe.
+HAND_CONNECTIONS: Tuple[Tuple[int, int], ...] = (
+    (0, 1), (1, 2), (2, 3), (3, 4),
+    (0, 5), (5, 6), (6, 7), (7, 8),
+    (5, 9), (9, 10), (10, 11), (11, 12),
+    (9, 13), (13, 14), (14, 15), (15, 16),
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),
+)  # fmt: skip
+
+# The same edges as open chains: one polyline per finger plus the palm's
+# closing edge, so the skeleton is one cv2.polylines call.
+HAND_CHAINS: Tuple[Tuple[int, ...], ...] = (
+    (0, 1, 2, 3, 4),
+    (0, 5, 6, 7, 8),
+    (5, 9, 10, 11, 12),
+    (9, 13, 14, 15, 16),
+    (13, 17, 18, 19, 20),
+    (0, 17),
+)
+
+
+@dataclass(frozen=True)
+class SkeletonStyle:
+    connection_color: Color = (255, 255, 255)
+    connection_thickness: int = 2
+    # None skips the landmark dots; border_color rings them like MediaPipe's
+    # white circle border.
+    landmark_color: Optional[Color] = (255, 255, 255)
+    landmark_radius: int = 2
+    border_color: Optional[Color] = (255, 255, 255)
+    line_type: int = cv2.LINE_8
+
+
+SKELETON_STYLES: Dict[str, SkeletonStyle] = {
+    # Looks like mp_drawing.draw_landmarks with radius-2, thickness-2 specs.
+    "full": SkeletonStyle(),
+    # One-pixel skeleton, no dots: the cheapest draw that still shows the
+    # tracked pose.
+    "minimal": SkeletonStyle(connection_thickness=1, landmark_color=None, border_color=None),
+}
+
+
+def skeleton_style(name: str) -> SkeletonStyle:
+    style = SKELETON_STYLES.get(name)
+    if style is None:
+        raise ValueError(f"Unknown skeleton_style {name!r}; expected one of {', '.join(SKELETON_STYLES)}")
+    return style
+
+
+class SkeletonRenderer:
+    # Draws hand skeletons with batched OpenCV calls: landmarks become pixel
+    # coordinates in one array operation, the connections go out as a single
+    # polylines call over precomputed chain indices, and the landmark dots
+    # as another (a closed one-point polyline is a filled dot of the line's
+    # thickness).
+    def __init__(self, style: Optional[SkeletonStyle] = None, chains: Sequence[Sequence[int]] = HAND_CHAINS):
+        self.style = style or SkeletonStyle()
+        self._chains = [np.asarray(chain, dtype=np.intp) for chain in chains]
+
+    @classmethod
+    def from_name(cls, name: str) -> "SkeletonRenderer":
+        return cls(skeleton_style(name))
+
+    @staticmethod
+    def to_pixels(landmarks, width: int, height: int) -> np.ndarray:
+        points = np.asarray(landmarks, dtype=np.float64)[:, :2] * (width, height)
+        return points.astype(np.int32)
+
+    def draw(self, image: np.ndarray, landmarks) -> None:
+        # landmarks: normalized (x, y[, z]) rows, e.g. HandInfo.landmarks.
+        if len(landmarks) == 0:
+            return
+        height, width = image.shape[:2]
+        self.draw_pixels(image, self.to_pixels(landmarks, width, height))
+
+    def draw_pixels(self, image: np.ndarray, pixels: np.ndarray) -> None:
+        style = self.style
+        cv2.polylines(
+            image,
+            [pixels[chain] for chain in self._chains],
+            False,
+            style.connection_color,
+            style.connection_thickness,
+            style.line_type,
+        )
+        if style.landmark_color is None:
+            return
+        dots = pixels.reshape(-1, 1, 2)
+        diameter = style.landmark_radius * 2 + 1
+        if style.border_color is not None and style.border_color != style.landmark_color:
+            cv2.polylines(image, dots, True, style.border_color, diameter + 2, style.line_type)
+        elif style.border_color is not None:
+            diameter += 2
+        cv2.polylines(image, dots, True, style.landmark_color, diameter, style.line_type)
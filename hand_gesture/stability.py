@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import itertools
+import logging
+from collections import deque
+from typing import Optional
+
+from hand_gesture.config import RuntimeConfig
+from hand_gesture.gestures import GestureAction, HandInfo
+
+logger = logging.getLogger(__name__)
+
+
+class GestureStabilizer:
+    def __init__(
+        self,
+        hold_seconds_required: float,
+        action_vote_window_seconds: float,
+        action_vote_ratio: float,
+        hand_steady_speed: float,
+        steady_seconds_required: float,
+    ):
+        self.hold_seconds_required = hold_seconds_required
+        self.action_vote_window_seconds = action_vote_window_seconds
+        self.action_vote_ratio = action_vote_ratio
+        self.hand_steady_speed = hand_steady_speed
+        self.steady_seconds_required = steady_seconds_required
+        # (timestamp, action) pairs. The first entry may predate the window and
+        # only marks where the oldest in-window sample's interval begins.
+        self.action_history: deque[tuple[float, Optional[GestureAction]]] = deque()
+        self.candidate_action: Optional[GestureAction] = None
+        self.candidate_since = 0.0
+        self.last_palm_center: Optional[tuple[float, float]] = None
+        self.last_palm_time = 0.0
+        self.steady_since: Optional[float] = None
+        self.now = 0.0
+
+    @classmethod
+    def from_config(cls, config: RuntimeConfig) -> "GestureStabilizer":
+        return cls(
+            hold_seconds_required=config.hold_seconds_required,
+            action_vote_window_seconds=config.action_vote_window_seconds,
+            action_vote_ratio=config.action_vote_ratio,
+            hand_steady_speed=config.hand_steady_speed,
+            steady_seconds_required=config.steady_seconds_required,
+        )
+
+    @property
+    def hold_seconds(self) -> float:
+        if self.candidate_action is None:
+            return 0.0
+        return self.now - self.candidate_since
+
+    @property
+    def steady_seconds(self) -> float:
+        if self.steady_since is None:
+            return 0.0
+        return self.now - self.steady_since
+
+    def update_steadiness(self, hand_info: Optional[HandInfo], timestamp: float) -> None:
+        self.now = timestamp
+        if hand_info is None:
+            self.last_palm_center = None
+            self.steady_since = None
+            return
+
+        current_center = hand_info.palm_center
+        if self.last_palm_center is None:
+            self.last_palm_center = current_center
+            self.last_palm_time = timestamp
+            self.steady_since = timestamp
+            return
+
+        dx = current_center[0] - self.last_palm_center[0]
+        dy = current_center[1] - self.last_palm_center[1]
+        dt = timestamp - self.last_palm_time
+        distance = (dx * dx + dy * dy) ** 0.5
+        # Compare speed rather than per-frame displacement so the threshold
+        # means the same thing at 12 FPS and at 60 FPS.
+        if dt > 0.0 and distance / dt > self.hand_steady_speed:
+            self.steady_since = timestamp
+        self.last_palm_center = current_center
+        self.last_palm_time = timestamp
+
+    def vote_ratio(self, action: GestureAction) -> float:
+        history = self.action_history
+        if not history:
+            return 0.0
+        if len(history) == 1:
+            return 1.0 if history[0][1] == action else 0.0
+        window_start = self.now - self.action_vote_window_seconds
+        total = 0.0
+        matches = 0.0
+        previous_time = history[0][0]
+        for timestamp, item in itertools.islice(history, 1, None):
+            # Each sample is held over the interval since the previous frame,
+            # so a slow frame weighs more than a fast one.
+            weight = timestamp - max(previous_time, window_start)
+            previous_time = timestamp
+            if weight <= 0.0:
+                continue
+            total += weight
+            if item == action:
+                matches += weight
+        if total <= 0.0:
+            return 1.0 if history[-1][1] == action else 0.0
+        return matches / total
+
+    def update(self, action: Optional[GestureAction], timestamp: float) -> None:
+        self.now = timestamp
+        history = self.action_history
+        history.append((timestamp, action))
+        window_start = timestamp - self.action_vote_window_seconds
+        while len(history) > 1 and history[1][0] <= window_start:
+            history.popleft()
+
+        if action is None:
+            if self.candidate_action is not None:
+                logger.debug("Stability reset: previous_candidate=%s", self.candidate_action.value)
+            self.candidate_action = None
+            return
+        if action == self.candidate_action:
+            logger.debug(
+                "Stability tick: action=%s hold=%.3f/%.3fs vote_ratio=%.2f",
+                action.value,
+                self.hold_seconds,
+                self.hold_seconds_required,
+                self.vote_ratio(action),
+            )
+        else:
+            self.candidate_action = action
+            self.candidate_since = timestamp
+            logger.debug("New stability candidate: action=%s", action.value)
+
+    def check_ready(self) -> tuple[bool, Optional[str]]:
+        if self.candidate_action is None:
+            return False, None
+        if self.hold_seconds < self.hold_seconds_required:
+            return False, None
+        vote_ratio = self.vote_ratio(self.candidate_action)
+        if vote_ratio < self.action_vote_ratio:
+            return False, f"Stabilizing {vote_ratio:.0%}"
+        if self.steady_seconds < self.steady_seconds_required:
+            return False, f"Hold still {self.steady_seconds:.1f}/{self.steady_seconds_required:.1f}s"
+        return True, None
+
+    def candidate_confirmed(self) -> bool:
+        # The candidate holds the vote-window majority; hold time and
+        # steadiness are not required.
+        if self.candidate_action is None:
+            return False
+        return self.vote_ratio(self.candidate_action) >= self.action_vote_ratio
+
+    def reset_candidate(self) -> None:
+        self.candidate_action = None
+
+
+class TaskViewNavigator:
+    def __init__(self, min_delta: float, cooldown_seconds: float, deadzone_speed: float):
+        self.min_delta = min_delta
+        self.cooldown_seconds = cooldown_seconds
+        self.deadzone_speed = deadzone_speed
+        self.last_index_tip: Optional[tuple[float, float]] = None
+        self.last_tip_time = 0.0
+        self.last_switch_nav_time = 0.0
+        self.switch_motion_accum = (0.0, 0.0)
+
+    @classmethod
+    def from_config(cls, config: RuntimeConfig) -> "TaskViewNavigator":
+        return cls(
+            min_delta=config.switch_nav_min_delta,
+            cooldown_seconds=config.switch_nav_cooldown_seconds,
+            deadzone_speed=config.switch_nav_deadzone_speed,
+        )
+
+    def reset(self) -> None:
+        self.last_index_tip = None
+        self.switch_motion_accum = (0.0, 0.0)
+
+    def update(self, current_tip: tuple[float, float], now: float, frozen: bool = False) -> Optional[str]:
+        if self.last_index_tip is None or frozen:
+            self.last_index_tip = current_tip
+            self.last_tip_time = now
+            return None
+
+        frame_dx = current_tip[0] - self.last_index_tip[0]
+        frame_dy = current_tip[1] - self.last_index_tip[1]
+        deadzone = self.deadzone_speed * max(now - self.last_tip_time, 0.0)
+        if abs(frame_dx) < deadzone:
+            frame_dx = 0.0
+        if abs(frame_dy) < deadzone:
+            frame_dy = 0.0
+        accum_dx = self.switch_motion_accum[0] + frame_dx
+        accum_dy = self.switch_motion_accum[1] + frame_dy
+        self.switch_motion_accum = (accum_dx, accum_dy)
+        self.last_index_tip = current_tip
+        self.last_tip_time = now
+        logger.debug(
+            "TaskView motion: frame_dx=%.4f frame_dy=%.4f accum_dx=%.4f accum_dy=%.4f",
+            frame_dx,
+            frame_dy,
+            accum_dx,
+            accum_dy,
+        )
+
+        if now - self.last_switch_nav_time < self.cooldown_seconds:
+            return None
+        if abs(accum_dx) >= abs(accum_dy) and abs(accum_dx) >= self.min_delta:
+            return "right" if accum_dx > 0 else "left"
+        if abs(accum_dy) > abs(accum_dx) and abs(accum_dy) >= self.min_delta:
+            return "down" if accum_dy > 0 else "up"
+        return None
+
+    def commit(self, now: float) -> None:
+        self.last_switch_nav_time = now
+        self.switch_motion_accum = (0.0, 0.0)
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Generic, Iterator, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class StartupTimer:
+    def __init__(self, origin: Optional[float] = None):
+        self.origin = time.perf_counter() if origin is None else origin
+        self.phases: Dict[str, float] = {}
+        self.first_frame_seconds: Optional[float] = None
+        self.first_hand_seconds: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.origin
+
+    def record(self, phase: str, started_at: float) -> float:
+        duration = time.perf_counter() - started_at
+        with self._lock:
+            self.phases[phase] = duration
+        logger.info(
+            "Startup phase: %s took %.1f ms (t+%.1f ms)",
+            phase,
+            duration * 1000.0,
+            self.elapsed() * 1000.0,
+        )
+        return duration
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, started_at)
+
+    def frame_processed(self, hand_detected: bool) -> None:
+        if self.first_frame_seconds is None:
+            self.first_frame_seconds = self.elapsed()
+            logger.info(
+                "Startup metric: time_to_first_recognized_frame_ms=%.1f",
+                self.first_frame_seconds * 1000.0,
+            )
+        if hand_detected and self.first_hand_seconds is None:
+            self.first_hand_seconds = self.elapsed()
+            logger.info(
+                "Startup metric: time_to_first_hand_ms=%.1f",
+                self.first_hand_seconds * 1000.0,
+            )
+
+
+class BackgroundTask(Generic[T]):
+    def __init__(self, name: str, target: Callable[[], T], timer: Optional[StartupTimer] = None):
+        self.name = name
+        self._target = target
+        self._timer = timer
+        self._thread: Optional[threading.Thread] = None
+        self._done = threading.Event()
+        self._result: Optional[T] = None
+        self._error: Optional[BaseException] = None
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def start(self) -> "BackgroundTask[T]":
+        if self._thread is None and not self.done:
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+        return self
+
+    def result(self) -> T:
+        if self._thread is None and not self.done:
+            self._run()
+        if not self.done:
+            started_at = time.perf_counter()
+            self._done.wait()
+            if self._timer is not None:
+                self._timer.record(f"{self.name} wait", started_at)
+        if self._error is not None:
+            raise RuntimeError(f"{self.name} failed: {self._error}") from self._error
+        return self._result  # type: ignore[return-value]
+
+    def _run(self) -> None:
+        started_at = time.perf_counter()
+        try:
+            self._result = self._target()
+        except BaseException as ex:
+            self._error = ex
+            logger.exception("Background task failed: %s", self.name)
+        finally:
+            if self._timer is not None:
+                self._timer.record(self.name, started_at)
+            self._done.set()
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from hand_gesture.config import RuntimeConfig
+
+logger = logging.getLogger(__name__)
+
+STATE_OK = "ok"
+STATE_LOST = "lost"
+STATE_RECOVERED = "recovered"
+
+
+@dataclass(frozen=True)
+class CaptureStatus:
+    state: str
+    consecutive_failures: int
+    reopen_attempts: int
+    retry_in_seconds: float
+
+    @property
+    def message(self) -> str:
+        if self.state == STATE_LOST:
+            return f"Camera unavailable, retrying in {self.retry_in_seconds:.1f}s (attempt {self.reopen_attempts})"
+        if self.state == STATE_RECOVERED:
+            return "Camera reconnected"
+        return "Camera OK"
+
+
+class CaptureSupervisor:
+    # Wraps a capture (CameraCapture or anything with read/isOpened/release,
+    # optionally reopen) so a dead device costs a timer, not a spinning core.
+    # read() never blocks on backoff: between attempts it returns (False,
+    # None) at once and retry_delay() tells the caller how long to wait, so
+    # a UI loop can spend that time in cv2.waitKey and stay responsive.
+    def __init__(
+        self,
+        capture: Any,
+        failure_threshold: int = 5,
+        initial_backoff_seconds: float = 0.1,
+        max_backoff_seconds: float = 2.0,
+        on_status: Optional[Callable[[CaptureStatus], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.capture = capture
+        self.failure_threshold = max(1, failure_threshold)
+        self.initial_backoff_seconds = initial_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.on_status = on_status
+        self.clock = clock
+        self.consecutive_failures = 0
+        self.reopen_attempts = 0
+        self.reopens = 0
+        self.device_reads = 0
+        self.status = CaptureStatus(STATE_OK, 0, 0, 0.0)
+        self._backoff = 0.0
+        self._next_attempt = 0.0
+        self._ever_opened = capture.isOpened()
+
+    @classmethod
+    def from_config(
+        cls,
+        capture: Any,
+        config: RuntimeConfig,
+        on_status: Optional[Callable[[CaptureStatus], None]] = None,
+    ) -> "CaptureSupervisor":
+        return cls(
+            capture,
+            failure_threshold=config.capture_failure_threshold,
+            initial_backoff_seconds=config.capture_backoff_initial_seconds,
+            max_backoff_seconds=config.capture_backoff_max_seconds,
+            on_status=on_status,
+        )
+
+    @property
+    def lost(self) -> bool:
+        return self.status.state == STATE_LOST
+
+    def __getattr__(self, name: str):
+        # camera_index, dropped_frames, settings, ... come from the capture.
+        return getattr(self.capture, name)
+
+    def isOpened(self) -> bool:
+        # A device that opened once is still supervised while it is gone.
+        self._ever_opened = self._ever_opened or self.capture.isOpened()
+        return self._ever_opened
+
+    def retry_delay(self) -> float:
+        if not self.lost:
+            return 0.0
+        return max(self._next_attempt - self.clock(), 0.0)
+
+    def _emit(self, state: str) -> None:
+        self.status = CaptureStatus(state, self.consecutive_failures, self.reopen_attempts, self._backoff)
+        if self.on_status is not None:
+            self.on_status(self.status)
+
+    def read(self):
+        now = self.clock()
+        if self.lost:
+            if now < self._next_attempt:
+                return False, None
+            self.reopen_attempts += 1
+            reopen = getattr(self.capture, "reopen", None)
+            if reopen is not None:
+                logger.info("Reopening camera (attempt %d)", self.reopen_attempts)
+                try:
+                    opened = reopen()
+                except Exception:
+                    logger.exception("Camera reopen raised")
+                    opened = False
+                if opened:
+                    self.reopens += 1
+        self.device_reads += 1
+        try:
+            ok, frame = self.capture.read()
+        except Exception:
+            logger.exception("Camera read raised")
+            ok, frame = False, None
+        if ok and frame is not None:
+            if self.lost:
+                logger.info(
+                    "Camera recovered after %d failed reads and %d reopen attempts",
+                    self.consecutive_failures,
+                    self.reopen_attempts,
+                )
+                self.consecutive_failures = 0
+                self._backoff = 0.0
+                self._emit(STATE_RECOVERED)
+                self.reopen_attempts = 0
+            self.consecutive_failures = 0
+            return ok, frame
+
+        self.consecutive_failures += 1
+        if self.consecutive_failures < self.failure_threshold:
+            logger.debug("Empty camera frame (%d in a row)", self.consecutive_failures)
+            return False, None
+        self._backoff = (
+            self.initial_backoff_seconds
+            if self._backoff == 0.0
+            else min(self._backoff * 2.0, self.max_backoff_seconds)
+        )
+        self._next_attempt = now + self._backoff
+        if not self.lost:
+            logger.warning(
+                "Camera stopped delivering frames after %d failed reads; backing off",
+                self.consecutive_failures,
+            )
+        self._emit(STATE_LOST)
+        return False, None
+
+    def release(self) -> None:
+        self.capture.release()
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from typing import Sequence, Tuple
+
+from hand_gesture.config import RuntimeConfig
+
+logger = logging.getLogger(__name__)
+
+THREAD_STAGES = ("capture", "inference", "ui")
+# The mask the process started with, before any thread was pinned.
+_PROCESS_CPUS = tuple(sorted(os.sched_getaffinity(0))) if hasattr(os, "sched_getaffinity") else ()
+
+
+def stage_cpus(config: RuntimeConfig, stage: str) -> Tuple[int, ...]:
+    if stage not in THREAD_STAGES:
+        raise ValueError(f"Unknown thread stage {stage!r}; expected one of {', '.join(THREAD_STAGES)}")
+    return tuple(getattr(config, f"{stage}_cpus"))
+
+
+def available_cpus() -> Tuple[int, ...]:
+    if hasattr(os, "sched_getaffinity"):
+        return tuple(sorted(os.sched_getaffinity(0)))
+    return tuple(range(os.cpu_count() or 1))
+
+
+def pin_current_thread(cpus: Sequence[int], stage: str) -> bool:
+    # On Linux sched_setaffinity(0) applies to the calling thread only, and
+    # threads started afterwards inherit the mask: building the MediaPipe
+    # graph from a pinned thread keeps its calculator threads on those CPUs.
+    if not cpus:
+        return False
+    if not hasattr(os, "sched_setaffinity"):
+        logger.warning("CPU affinity is not supported on this platform; %s_cpus ignored", stage)
+        return False
+    try:
+        os.sched_setaffinity(0, set(cpus))
+    except OSError as ex:
+        logger.warning("Could not pin %s thread to CPUs %s: %s", stage, list(cpus), ex)
+        return False
+    logger.info("Pinned %s thread %s to CPUs %s", stage, threading.current_thread().name, sorted(set(cpus)))
+    return True
+
+
+def unpin_current_thread() -> bool:
+    # For threads started after the UI thread was pinned: they would inherit
+    # its mask, so they go back to the CPUs the process started with.
+    if not _PROCESS_CPUS:
+        return False
+    try:
+        os.sched_setaffinity(0, set(_PROCESS_CPUS))
+    except OSError as ex:
+        logger.debug("Could not reset the CPU affinity of %s: %s", threading.current_thread().name, ex)
+        return False
+    return True
+
+
+def pin_ui_thread(config: RuntimeConfig) -> bool:
+    # Called from the UI loop once the capture, vision and writer threads are
+    # running, so none of them inherits ui_cpus.
+    return pin_current_thread(config.ui_cpus, "ui")
+
+
+def apply_thread_settings(config: RuntimeConfig) -> None:
+    # Called on the UI thread before any worker thread starts. opencv_threads
+    # of 0 runs OpenCV single-threaded; a negative value keeps its default
+    # (or the power-saver setting). ui_cpus is applied later, by
+    # pin_ui_thread.
+    for stage in THREAD_STAGES:
+        unknown = sorted(set(stage_cpus(config, stage)) - set(available_cpus()))
+        if unknown:
+            raise ValueError(f"{stage}_cpus lists CPUs {unknown} that this process cannot use (available: {list(available_cpus())})")
+    if config.opencv_threads >= 0:
+        import cv2
+
+        cv2.setNumThreads(config.opencv_threads)
+        logger.info("OpenCV threads=%d", cv2.getNumThreads())
+    if config.capture_cpus and len(config.camera_indices) <= 1 and not config.frame_source:
+        logger.warning("capture_cpus has no effect with a single camera: it is read on the UI thread")
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import logging
+from typing import Optional
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class LandmarkFlowTracker:
+    def __init__(
+        self,
+        window_size: int = 21,
+        pyramid_levels: int = 3,
+        max_fb_error: float = 1.5,
+        min_valid_fraction: float = 0.7,
+    ):
+        self.window_size = (window_size, window_size)
+        self.pyramid_levels = pyramid_levels
+        self.max_fb_error = max_fb_error
+        self.min_valid_fraction = min_valid_fraction
+        self.criteria = (cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 20, 0.03)
+        self.valid_fraction = 0.0
+        self.median_fb_error = 0.0
+        self._previous_gray: Optional[np.ndarray] = None
+        self._points: Optional[np.ndarray] = None
+
+    @property
+    def active(self) -> bool:
+        return self._points is not None
+
+    def reset(self) -> None:
+        self._previous_gray = None
+        self._points = None
+
+    def start(self, gray: np.ndarray, points: np.ndarray) -> None:
+        self._previous_gray = gray
+        self._points = np.asarray(points, dtype=np.float32).reshape(-1, 1, 2)
+
+    def track(self, gray: np.ndarray) -> Optional[np.ndarray]:
+        if self._points is None or self._previous_gray is None:
+            return None
+        previous_points = self._points
+        lk_params = dict(winSize=self.window_size, maxLevel=self.pyramid_levels, criteria=self.criteria)
+        forward, status, _ = cv2.calcOpticalFlowPyrLK(self._previous_gray, gray, previous_points, None, **lk_params)
+        backward, back_status, _ = cv2.calcOpticalFlowPyrLK(gray, self._previous_gray, forward, None, **lk_params)
+        # Forward-backward check: a point that does not come back to where it
+        # started has drifted onto the background or another finger.
+        fb_error = np.linalg.norm((backward - previous_points).reshape(-1, 2), axis=1)
+        valid = (status.ravel() == 1) & (back_status.ravel() == 1) & (fb_error <= self.max_fb_error)
+        self.valid_fraction = float(valid.mean()) if len(valid) else 0.0
+        self.median_fb_error = float(np.median(fb_error)) if len(fb_error) else 0.0
+        if self.valid_fraction < self.min_valid_fraction:
+            logger.debug(
+                "Landmark flow lost: valid=%.2f median_fb_error=%.2fpx",
+                self.valid_fraction,
+                self.median_fb_error,
+            )
+            self.reset()
+            return None
+
+        points = forward.reshape(-1, 2)
+        previous = previous_points.reshape(-1, 2)
+        if not valid.all():
+            # Rejected points follow the hand's median motion instead.
+            shift = np.median(points[valid] - previous[valid], axis=0)
+            points[~valid] = previous[~valid] + shift
+        self._previous_gray = gray
+        self._points = points.reshape(-1, 1, 2)
+        return points
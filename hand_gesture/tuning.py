@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import argparse
+import glob
+import itertools
+import logging
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from hand_gesture.config import RuntimeConfig, load_runtime_config, save_runtime_config
+from hand_gesture.replay import Decision, SessionFrame, load_session, replay_session
+
+logger = logging.getLogger(__name__)
+
+SEARCH_SPACE: Dict[str, Tuple[float, ...]] = {
+    "hold_seconds_required": (0.1, 0.15, 0.2, 0.25, 0.3, 0.4),
+    "action_vote_window_seconds": (0.15, 0.2, 0.3, 0.4, 0.5),
+    "action_vote_ratio": (0.5, 0.55, 0.6, 0.65, 0.75, 0.85),
+    "steady_seconds_required": (0.0, 0.05, 0.1, 0.15, 0.2, 0.3),
+    "hand_steady_speed": (0.3, 0.45, 0.6, 0.9, 1.2),
+    "switch_nav_min_delta": (0.06, 0.08, 0.1, 0.12, 0.15),
+    "switch_nav_cooldown_seconds": (0.1, 0.15, 0.2, 0.3),
+    "switch_nav_deadzone_speed": (0.09, 0.18, 0.3),
+}
+
+
+@dataclass(frozen=True)
+class TrialResult:
+    params: Tuple[Tuple[str, float], ...]
+    mean_latency: float
+    false_triggers_per_minute: float
+    recall: float
+    hits: int
+    false_triggers: int
+    segments: int
+
+
+@dataclass(frozen=True)
+class _Segment:
+    label: str
+    start: float
+    end: float
+
+
+def _segments(frames: Sequence[SessionFrame]) -> List[_Segment]:
+    segments: List[_Segment] = []
+    label: Optional[str] = None
+    start = 0.0
+    previous = 0.0
+    for frame in frames:
+        if frame.label != label:
+            if label is not None:
+                segments.append(_Segment(label, start, previous))
+            label = frame.label
+            start = frame.timestamp
+        previous = frame.timestamp
+    if label is not None:
+        segments.append(_Segment(label, start, previous))
+    return segments
+
+
+def score_session(
+    frames: Sequence[SessionFrame],
+    decisions: Sequence[Decision],
+    grace_seconds: float = 0.5,
+) -> Tuple[List[float], int, int]:
+    segments = _segments(frames)
+    matched = [False] * len(segments)
+    latencies: List[float] = []
+    false_triggers = 0
+    for decision in decisions:
+        hit = False
+        for idx, segment in enumerate(segments):
+            if segment.label != decision.action:
+                continue
+            if not segment.start <= decision.timestamp <= segment.end + grace_seconds:
+                continue
+            if not matched[idx]:
+                matched[idx] = True
+                latencies.append(decision.timestamp - segment.start)
+                hit = True
+            elif decision.action.startswith("navigate_"):
+                # Navigation is expected to repeat while the finger keeps moving.
+                hit = True
+            break
+        if not hit:
+            false_triggers += 1
+    return latencies, false_triggers, len(segments)
+
+
+def grid_candidates(space: Dict[str, Sequence[float]]) -> Iterator[Dict[str, float]]:
+    names = sorted(space)
+    for values in itertools.product(*(space[name] for name in names)):
+        yield dict(zip(names, values))
+
+
+def random_candidates(space: Dict[str, Sequence[float]], count: int, seed: int = 0) -> List[Dict[str, float]]:
+    rng = random.Random(seed)
+    names = sorted(space)
+    seen = set()
+    candidates: List[Dict[str, float]] = []
+    attempts = 0
+    while len(candidates) < count and attempts < count * 20:
+        attempts += 1
+        values = tuple(rng.choice(tuple(space[name])) for name in names)
+        if values in seen:
+            continue
+        seen.add(values)
+        candidates.append(dict(zip(names, values)))
+    return candidates
+
+
+_worker_sessions: List[List[SessionFrame]] = []
+_worker_base_config = RuntimeConfig()
+_worker_grace_seconds = 0.5
+
+
+def _init_worker(session_paths: Sequence[str], base_config: RuntimeConfig, grace_seconds: float) -> None:
+    global _worker_sessions, _worker_base_config, _worker_grace_seconds
+    _worker_sessions = [load_session(path) for path in session_paths]
+    _worker_base_config = base_config
+    _worker_grace_seconds = grace_seconds
+
+
+def evaluate(params: Dict[str, float]) -> TrialResult:
+    config = replace(_worker_base_config, **params)
+    latencies: List[float] = []
+    false_triggers = 0
+    segments = 0
+    duration = 0.0
+    for frames in _worker_sessions:
+        if not frames:
+            continue
+        decisions = replay_session(frames, config)
+        session_latencies, session_false, session_segments = score_session(
+            frames, decisions, _worker_grace_seconds
+        )
+        latencies.extend(session_latencies)
+        false_triggers += session_false
+        segments += session_segments
+        duration += frames[-1].timestamp - frames[0].timestamp
+    minutes = max(duration / 60.0, 1e-9)
+    return TrialResult(
+        params=tuple(sorted(params.items())),
+        mean_latency=sum(latencies) / len(latencies) if latencies else float("inf"),
+        false_triggers_per_minute=false_triggers / minutes,
+        recall=len(latencies) / segments if segments else 0.0,
+        hits=len(latencies),
+        false_triggers=false_triggers,
+        segments=segments,
+    )
+
+
+def run_search(
+    session_paths: Sequence[str],
+    candidates: Sequence[Dict[str, float]],
+    base_config: RuntimeConfig,
+    workers: Optional[int] = None,
+    grace_seconds: float = 0.5,
+) -> List[TrialResult]:
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(candidates) // (workers * 8))
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(list(session_paths), base_config, grace_seconds),
+    ) as pool:
+        return list(pool.map(evaluate, candidates, chunksize=chunksize))
+
+
+def pareto_front(results: Sequence[TrialResult], min_recall: float = 0.0) -> List[TrialResult]:
+    eligible = sorted(
+        (result for result in results if result.recall >= min_recall and result.hits),
+        key=lambda result: (result.mean_latency, result.false_triggers_per_minute),
+    )
+    front: List[TrialResult] = []
+    best_false_rate = float("inf")
+    for result in eligible:
+        if result.false_triggers_per_minute < best_false_rate:
+            front.append(result)
+            best_false_rate = result.false_triggers_per_minute
+    return front
+
+
+def choose_profile(front: Sequence[TrialResult], max_false_per_minute: float) -> Optional[TrialResult]:
+    if not front:
+        return None
+    acceptable = [result for result in front if result.false_triggers_per_minute <= max_false_per_minute]
+    if acceptable:
+        return min(acceptable, key=lambda result: result.mean_latency)
+    return min(front, key=lambda result: result.false_triggers_per_minute)
+
+
+def _expand_sessions(patterns: Sequence[str]) -> List[str]:
+    paths: List[str] = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern))
+        paths.extend(matches if matches else [pattern])
+    return paths
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Sweep stability thresholds against labelled session recordings.",
+    )
+    parser.add_argument("sessions", nargs="+", help="Session .jsonl files or glob patterns.")
+    parser.add_argument("--search", choices=("grid", "random"), default="random")
+    parser.add_argument("--trials", type=int, default=500, help="Random search sample count.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--params", nargs="*", help="Restrict the sweep to these parameters.")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--base-config", help="Profile JSON to start from.")
+    parser.add_argument("--grace", type=float, default=0.5, help="Seconds after a labelled segment a decision still counts.")
+    parser.add_argument("--min-recall", type=float, default=0.9)
+    parser.add_argument("--max-false-per-minute", type=float, default=0.5)
+    parser.add_argument("--out", default="tuned_profile.json")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(name)s | %(message)s")
+    base_config = load_runtime_config(args.base_config) if args.base_config else RuntimeConfig()
+    space = dict(SEARCH_SPACE)
+    if args.params:
+        unknown = sorted(set(args.params) - set(space))
+        if unknown:
+            parser.error(f"unknown parameters: {', '.join(unknown)}")
+        space = {name: space[name] for name in args.params}
+
+    if args.search == "grid":
+        candidates = list(grid_candidates(space))
+    else:
+        candidates = random_candidates(space, args.trials, args.seed)
+    session_paths = _expand_sessions(args.sessions)
+    logger.info("Evaluating %d candidates over %d sessions", len(candidates), len(session_paths))
+
+    results = run_search(session_paths, candidates, base_config, args.workers, args.grace)
+    front = pareto_front(results, args.min_recall)
+    print(f"Pareto front ({len(front)} of {len(results)} trials, recall >= {args.min_recall:.0%}):")
+    print(f"{'latency_ms':>10} {'false/min':>9} {'recall':>7}  params")
+    for result in front:
+        params = " ".join(f"{name}={value}" for name, value in result.params)
+        print(
+            f"{result.mean_latency * 1000.0:10.0f} {result.false_triggers_per_minute:9.2f} "
+            f"{result.recall:7.0%}  {params}"
+        )
+
+    chosen = choose_profile(front, args.max_false_per_minute)
+    if chosen is None:
+        print("No candidate met the recall constraint; no profile written.")
+        return 1
+    save_runtime_config(replace(base_config, **dict(chosen.params)), args.out)
+    print(
+        f"Chosen profile: latency={chosen.mean_latency * 1000.0:.0f}ms "
+        f"false/min={chosen.false_triggers_per_minute:.2f} -> {args.out}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -40,7 +40,7 @@ def draw_overlay(
     )
     cv2.putText(
         image,
-        f"Stability: {stability_progress}/{stability_target} | {status_text}",
+        f"Stability: {stability_progress}/{stability_target} ms | {status_text}",
         (10, 84),
         cv2.FONT_HERSHEY_SIMPLEX,
         0.48,
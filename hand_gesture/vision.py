@@ -1,64 +1,171 @@
 from __future__ import annotations
 
-from typing import Optional
+import time
+from collections import namedtuple
+from typing import Optional, Sequence
 
 import cv2
-import mediapipe as mp
+import numpy as np
 
 from hand_gesture.gestures import HandInfo, extract_hand_info
+from hand_gesture.identity import HandTracker
+from hand_gesture.skeleton import SkeletonRenderer
+from hand_gesture.startup import BackgroundTask, StartupTimer
+from hand_gesture.threads import pin_current_thread
+from hand_gesture.tracking import LandmarkFlowTracker
+
+_Point = namedtuple("_Point", "x y")
+
+
+class _TrackedLandmarks:
+    # Quacks like a MediaPipe NormalizedLandmarkList for extract_hand_info.
+    def __init__(self, points):
+        self.landmark = [_Point(float(x), float(y)) for x, y in points]
 
 
 class VisionEngine:
-    def __init__(self, max_num_hands: int, min_detection_confidence: float, min_tracking_confidence: float):
-        self._mp_drawing = mp.solutions.drawing_utils
-        self._mp_hands = mp.solutions.hands
-        self._hand_landmark_style = self._mp_drawing.DrawingSpec(
-            color=(255, 255, 255),
-            thickness=2,
-            circle_radius=2,
-        )
-        self._hand_connection_style = self._mp_drawing.DrawingSpec(
-            color=(255, 255, 255),
-            thickness=2,
-            circle_radius=2,
-        )
-        self._hands = self._mp_hands.Hands(
+    def __init__(
+        self,
+        max_num_hands: int,
+        min_detection_confidence: float,
+        min_tracking_confidence: float,
+        startup: Optional[StartupTimer] = None,
+        warm_up_size: tuple[int, int] = (640, 480),
+        detection_interval: int = 1,
+        flow_max_fb_error: float = 1.5,
+        flow_min_valid_fraction: float = 0.7,
+        hand_tracker: Optional[HandTracker] = None,
+        inference_cpus: Sequence[int] = (),
+        skeleton_style: str = "full",
+    ):
+        self._max_num_hands = max_num_hands
+        self._min_detection_confidence = min_detection_confidence
+        self._min_tracking_confidence = min_tracking_confidence
+        self._warm_up_size = warm_up_size
+        self._inference_cpus = tuple(inference_cpus)
+        self._skeleton = SkeletonRenderer.from_name(skeleton_style)
+        self._hands = None
+        self._loader = BackgroundTask("vision warm-up", self._build, startup)
+        self.detection_interval = max(1, detection_interval)
+        self.detector_runs = 0
+        self.tracked_frames = 0
+        self._flow: Optional[LandmarkFlowTracker] = None
+        if self.detection_interval > 1:
+            self._flow = LandmarkFlowTracker(
+                max_fb_error=flow_max_fb_error,
+                min_valid_fraction=flow_min_valid_fraction,
+            )
+        self._frames_since_detection = 0
+        self._tracked_label: Optional[str] = None
+        # Stable IDs for every detected hand; process_frame reports the
+        # active one, which only changes with hysteresis.
+        self.hands = hand_tracker or HandTracker()
+        self._timestamp = 0.0
+
+    def start_warm_up(self) -> None:
+        self._loader.start()
+
+    def wait_until_ready(self) -> None:
+        if self._hands is None:
+            self._hands = self._loader.result()
+
+    def _build(self):
+        # mediapipe pulls in protobuf and the TFLite runtime, so it is only
+        # imported here, off the main thread, while the camera is opening.
+        # MediaPipe starts its graph threads from this one, so they inherit
+        # the inference CPU mask.
+        pin_current_thread(self._inference_cpus, "inference")
+        import mediapipe as mp
+
+        hands = mp.solutions.hands.Hands(
             static_image_mode=False,
-            max_num_hands=max_num_hands,
-            min_detection_confidence=min_detection_confidence,
-            min_tracking_confidence=min_tracking_confidence,
+            max_num_hands=self._max_num_hands,
+            min_detection_confidence=self._min_detection_confidence,
+            min_tracking_confidence=self._min_tracking_confidence,
         )
+        width, height = self._warm_up_size
+        dummy = np.zeros((height, width, 3), dtype=np.uint8)
+        dummy.flags.writeable = False
+        hands.process(dummy)
+        return hands
 
     def close(self) -> None:
-        self._hands.close()
+        if self._hands is None and self._loader.done:
+            try:
+                self._hands = self._loader.result()
+            except RuntimeError:
+                return
+        if self._hands is not None:
+            self._hands.close()
 
-    def process_frame(self, frame) -> tuple:
+    def reset_tracking(self) -> None:
+        # After a camera gap the flow track points at a scene that is gone.
+        if self._flow is not None:
+            self._flow.reset()
+        self._frames_since_detection = 0
+        self.hands.reset()
+
+    def process_frame(self, frame, timestamp: Optional[float] = None) -> tuple:
+        self.wait_until_ready()
+        self._timestamp = time.time() if timestamp is None else timestamp
         frame = cv2.flip(frame, 1)
+        if self._flow is None:
+            image, hand_info, _ = self._detect(frame)
+            return image, hand_info
+
+        # Between detector runs the landmarks of the selected hand are carried
+        # forward with optical flow; a failed track falls through to a run.
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if self._flow.active and self._frames_since_detection < self.detection_interval - 1:
+            points = self._flow.track(gray)
+            if points is not None:
+                self._frames_since_detection += 1
+                self.tracked_frames += 1
+                return self._tracked_result(frame, points)
+
+        image, hand_info, confidence = self._detect(frame)
+        self._frames_since_detection = 0
+        if hand_info is None or confidence < self._min_tracking_confidence:
+            self._flow.reset()
+        else:
+            height, width = gray.shape[:2]
+            points = np.asarray(hand_info.landmarks, dtype=np.float32) * (width, height)
+            self._flow.start(gray, points)
+            self._tracked_label = hand_info.hand_label
+        return image, hand_info
+
+    def _tracked_result(self, image, points: np.ndarray) -> tuple:
+        height, width = image.shape[:2]
+        normalized = points / (width, height)
+        hand_info = extract_hand_info(_TrackedLandmarks(normalized), self._tracked_label)
+        active = self.hands.update([(hand_info, 1.0)], self._timestamp, detected=False)
+        hand_info = active.hand_info if active is not None else None
+        self._skeleton.draw_pixels(image, np.rint(points).astype(np.int32))
+        return image, hand_info
+
+    def _detect(self, frame) -> tuple:
+        self.detector_runs += 1
         rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         rgb_image.flags.writeable = False
         results = self._hands.process(rgb_image)
-        rgb_image.flags.writeable = True
-        image = cv2.cvtColor(rgb_image, cv2.COLOR_RGB2BGR)
+        # frame is the flipped copy and MediaPipe only reads the RGB image,
+        # so landmarks are drawn on frame without converting back.
+        image = frame
 
-        hand_info: Optional[HandInfo] = None
-        best_score = float("-inf")
+        candidates = []
         if results.multi_hand_landmarks:
             for idx, hand_landmarks in enumerate(results.multi_hand_landmarks):
-                self._mp_drawing.draw_landmarks(
-                    image,
-                    hand_landmarks,
-                    self._mp_hands.HAND_CONNECTIONS,
-                    self._hand_landmark_style,
-                    self._hand_connection_style,
-                )
                 hand_label = None
+                hand_confidence = 1.0
                 if results.multi_handedness and len(results.multi_handedness) > idx:
                     hand_label = results.multi_handedness[idx].classification[0].label
+                    hand_confidence = results.multi_handedness[idx].classification[0].score
 
-                candidate = extract_hand_info(hand_landmarks, hand_label)
-                center_offset = abs(candidate.palm_center[0] - 0.5) + abs(candidate.palm_center[1] - 0.5)
-                score = candidate.bounding_box_area - (center_offset * 0.08)
-                if score > best_score:
-                    best_score = score
-                    hand_info = candidate
-        return image, hand_info
+                hand_info = extract_hand_info(hand_landmarks, hand_label)
+                # HandInfo already holds the landmarks as tuples; draw from those.
+                self._skeleton.draw(image, hand_info.landmarks)
+                candidates.append((hand_info, hand_confidence))
+        active = self.hands.update(candidates, self._timestamp)
+        if active is None:
+            return image, None, 0.0
+        return image, active.hand_info, active.confidence
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import ctypes
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class WindowInfo:
+    handle: int
+    pid: int
+    title: str
+
+
+@dataclass(frozen=True)
+class CloseAllResult:
+    requested: int
+    closed: int
+    remaining: Tuple[WindowInfo, ...]
+    skipped_own: int
+    elapsed_seconds: float
+
+    @property
+    def complete(self) -> bool:
+        return not self.remaining
+
+
+def close_all_windows(
+    backend: Any,
+    exclude_pid: int,
+    timeout_seconds: float,
+    clock: Callable[[], float] = time.monotonic,
+) -> CloseAllResult:
+    # One enumeration pass, one batch of close requests, then a single wait
+    # with a deadline. Windows that are still open afterwards (typically an
+    # unsaved-changes prompt) are reported rather than retried.
+    started = clock()
+    windows = backend.list_windows()
+    targets = [window for window in windows if window.pid != exclude_pid]
+    requested = backend.request_close([window.handle for window in targets])
+    remaining = set(backend.wait_closed([window.handle for window in targets], timeout_seconds))
+    return CloseAllResult(
+        requested=requested,
+        closed=len(targets) - len(remaining),
+        remaining=tuple(window for window in targets if window.handle in remaining),
+        skipped_own=len(windows) - len(targets),
+        elapsed_seconds=clock() - started,
+    )
+
+
+def default_window_backend(os_name: str) -> Optional[Any]:
+    if os_name == "windows":
+        return Win32WindowBackend()
+    return None
+
+
+_WM_CLOSE = 0x0010
+_GW_OWNER = 4
+_GWL_EXSTYLE = -20
+_WS_EX_TOOLWINDOW = 0x00000080
+_DWMWA_CLOAKED = 14
+# Desktop and taskbar windows: WM_CLOSE to Progman opens the shutdown dialog.
+_SHELL_CLASSES = frozenset({"Progman", "WorkerW", "Shell_TrayWnd", "Shell_SecondaryTrayWnd"})
+
+
+class Win32WindowBackend:
+    # Top-level windows as they appear in Alt+Tab: visible, unowned, titled,
+    # not tool windows and not cloaked (suspended UWP apps, other virtual
+    # desktops).
+    def __init__(self, poll_interval_seconds: float = 0.02, sleep: Callable[[float], None] = time.sleep):
+        self.poll_interval_seconds = poll_interval_seconds
+        self.sleep = sleep
+
+    def list_windows(self) -> List[WindowInfo]:
+        user32 = ctypes.windll.user32
+        shell = user32.GetShellWindow()
+        windows: List[WindowInfo] = []
+
+        @ctypes.WINFUNCTYPE(ctypes.c_bool, ctypes.c_void_p, ctypes.c_void_p)
+        def visit(raw, _):
+            hwnd = ctypes.c_void_p(raw)
+            if raw == shell or not user32.IsWindowVisible(hwnd) or user32.GetWindow(hwnd, _GW_OWNER):
+                return True
+            if user32.GetWindowLongW(hwnd, _GWL_EXSTYLE) & _WS_EX_TOOLWINDOW or _is_cloaked(hwnd):
+                return True
+            length = user32.GetWindowTextLengthW(hwnd)
+            if length == 0:
+                return True
+            class_name = ctypes.create_unicode_buffer(256)
+            user32.GetClassNameW(hwnd, class_name, 256)
+            if class_name.value in _SHELL_CLASSES:
+                return True
+            title = ctypes.create_unicode_buffer(length + 1)
+            user32.GetWindowTextW(hwnd, title, length + 1)
+            pid = ctypes.c_ulong(0)
+            user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+            windows.append(WindowInfo(int(raw), int(pid.value), title.value))
+            return True
+
+        user32.EnumWindows(visit, 0)
+        return windows
+
+    def request_close(self, handles: Sequence[int]) -> int:
+        # PostMessage returns at once; each app closes on its own thread.
+        post = ctypes.windll.user32.PostMessageW
+        return sum(1 for handle in handles if post(ctypes.c_void_p(handle), _WM_CLOSE, 0, 0))
+
+    def wait_closed(self, handles: Sequence[int], timeout_seconds: float) -> List[int]:
+        is_window = ctypes.windll.user32.IsWindow
+        deadline = time.monotonic() + timeout_seconds
+        remaining = list(handles)
+        while True:
+            remaining = [handle for handle in remaining if is_window(ctypes.c_void_p(handle))]
+            left = deadline - time.monotonic()
+            if not remaining or left <= 0:
+                return remaining
+            self.sleep(min(self.poll_interval_seconds, left))
+
+
+def _is_cloaked(hwnd) -> bool:
+    try:
+        cloaked = ctypes.c_int(0)
+        ctypes.windll.dwmapi.DwmGetWindowAttribute(hwnd, _DWMWA_CLOAKED, ctypes.byref(cloaked), ctypes.sizeof(cloaked))
+        return bool(cloaked.value)
+    except (AttributeError, OSError):
+        return False
+
+
+@dataclass
+class FakeWindow:
+    handle: int
+    pid: int
+    title: str
+    close_delay_seconds: float = 0.05
+    refuses_close: bool = False
+
+
+class FakeWindowBackend:
+    # Simulated desktop for running close-all on any OS. A close request
+    # removes the window after its close_delay_seconds on a timer thread;
+    # refuses_close windows stay open, like an app asking to save first.
+    # windows is in z-order, foreground first.
+    def __init__(self, windows: Sequence[FakeWindow]):
+        self.windows: List[FakeWindow] = list(windows)
+        self.enumerations = 0
+        self.close_requests: List[int] = []
+        self._closing: Dict[int, threading.Timer] = {}
+        self._changed = threading.Condition()
+
+    def list_windows(self) -> List[WindowInfo]:
+        self.enumerations += 1
+        with self._changed:
+            return [WindowInfo(window.handle, window.pid, window.title) for window in self.windows]
+
+    def is_open(self, handle: int) -> bool:
+        with self._changed:
+            return any(window.handle == handle for window in self.windows)
+
+    def focus(self, handle: int) -> bool:
+        with self._changed:
+            for index, window in enumerate(self.windows):
+                if window.handle == handle:
+                    self.windows.insert(0, self.windows.pop(index))
+                    return True
+            return False
+
+    def request_close(self, handles: Sequence[int]) -> int:
+        posted = 0
+        with self._changed:
+            by_handle = {window.handle: window for window in self.windows}
+            for handle in handles:
+                window = by_handle.get(handle)
+                if window is None:
+                    continue
+                posted += 1
+                self.close_requests.append(handle)
+                if window.refuses_close or handle in self._closing:
+                    continue
+                timer = threading.Timer(window.close_delay_seconds, self._destroy, (handle,))
+                timer.daemon = True
+                self._closing[handle] = timer
+                timer.start()
+        return posted
+
+    def wait_closed(self, handles: Sequence[int], timeout_seconds: float) -> List[int]:
+        wanted = set(handles)
+
+        def remaining() -> List[int]:
+            return [window.handle for window in self.windows if window.handle in wanted]
+
+        with self._changed:
+            self._changed.wait_for(lambda: not remaining(), timeout_seconds)
+            return remaining()
+
+    def _destroy(self, handle: int) -> None:
+        with self._changed:
+            self.windows = [window for window in self.windows if window.handle != handle]
+            self._closing.pop(handle, None)
+            self._changed.notify_all()
@@ -1,18 +1,23 @@
 from __future__ import annotations
 
+import argparse
+import logging
 import math
 import time
 from collections import Counter, deque
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import Deque, Dict, List, Optional, Tuple
 
 import cv2
-import mediapipe as mp
-import pyautogui
+import numpy as np
 
-
-pyautogui.FAILSAFE = False
-pyautogui.PAUSE = 0.0
+from hand_gesture.camera import CameraCapture
+from hand_gesture.cursor import PredictiveCursor
+from hand_gesture.pacing import FramePacer
+from hand_gesture.recording import FrameRecorder
+from hand_gesture.skeleton import SKELETON_STYLES, SkeletonRenderer, skeleton_style
+from hand_gesture.startup import BackgroundTask, StartupTimer
+from hand_gesture.supervisor import STATE_RECOVERED, CaptureStatus, CaptureSupervisor
 
 
 Point = Tuple[float, float]
@@ -45,14 +50,20 @@ class GestureFSM:
 
 
 class GestureController:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        startup: Optional[StartupTimer] = None,
+        record_path: Optional[str] = None,
+        record_annotated: bool = True,
+        skeleton: str = "full",
+    ) -> None:
+        self.startup = startup or StartupTimer()
         self.frame_width = 640
         self.frame_height = 480
         self.target_fps = 30
         self.min_confidence = 0.7
         self.landmark_average_window = 5
         self.action_vote_window = 7
-        self.screen_w, self.screen_h = pyautogui.size()
         self.overlay_lines: Deque[str] = deque(maxlen=6)
         self.last_status = "Ready"
         self.frame_history: Deque[FrameSample] = deque(maxlen=15)
@@ -69,24 +80,70 @@ class GestureController:
         self.cursor_mode = False
         self.task_view_active = False
         self.hand_missing_frames = 0
-        self.last_pointer_screen: Optional[Point] = None
+        # Pointer moves run on their own 120 Hz thread and extrapolate the
+        # fingertip forward, so the cursor neither steps at camera rate nor
+        # trails the hand by the capture and inference latency.
+        self.cursor = PredictiveCursor(move=self.move_pointer, rate_hz=120.0, lead_seconds=0.05)
+        # Cameras often deliver more than the requested rate; the pacer holds
+        # processing to target_fps and sleeps between frames.
+        self.pacer = FramePacer(target_fps=self.target_fps)
         self.last_nav_time = 0.0
         self.last_nav_tip: Optional[Point] = None
+        # What the operator saw, for debugging misfires in the field.
+        self.recorder = FrameRecorder(record_path, fps=self.target_fps) if record_path else None
+        self.record_annotated = record_annotated
+        # Teal landmark dots on a white skeleton; "minimal" drops the dots.
+        style = skeleton_style(skeleton)
+        if style.landmark_color is not None:
+            style = replace(style, landmark_color=(0, 255, 180))
+        self.skeleton = SkeletonRenderer(style)
+
+        self.mp_hands = None
+        self.hands = None
+        # Model construction and the pyautogui import run in the background
+        # while the camera opens; run() waits for them before the first frame.
+        self._hands_loader = BackgroundTask("vision warm-up", self._build_hands, self.startup).start()
+        self._desktop_loader = BackgroundTask("desktop automation import", _load_pyautogui, self.startup).start()
+        with self.startup.phase("camera open"):
+            self.cap = CaptureSupervisor(
+                CameraCapture(
+                    camera_index=0,
+                    width=self.frame_width,
+                    height=self.frame_height,
+                    fps=self.target_fps,
+                    buffer_size=1,
+                ),
+                on_status=self.on_capture_status,
+            )
+
+    def _build_hands(self):
+        import mediapipe as mp
 
         self.mp_hands = mp.solutions.hands
-        self.mp_draw = mp.solutions.drawing_utils
-        self.hands = self.mp_hands.Hands(
+        hands = self.mp_hands.Hands(
             static_image_mode=False,
             max_num_hands=1,
             model_complexity=1,
             min_detection_confidence=self.min_confidence,
             min_tracking_confidence=self.min_confidence,
         )
-        self.cap = cv2.VideoCapture(0)
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.frame_width)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.frame_height)
-        self.cap.set(cv2.CAP_PROP_FPS, self.target_fps)
-        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        dummy = np.zeros((self.frame_height, self.frame_width, 3), dtype=np.uint8)
+        dummy.flags.writeable = False
+        hands.process(dummy)
+        return hands
+
+    @property
+    def gui(self):
+        return self._desktop_loader.result()[0]
+
+    @property
+    def screen_size(self) -> Tuple[int, int]:
+        return self._desktop_loader.result()[1]
+
+    def on_capture_status(self, status: CaptureStatus) -> None:
+        self.add_status(status.message)
+        if status.state == STATE_RECOVERED:
+            self.raw_landmarks.clear()
 
     def add_status(self, text: str) -> None:
         self.last_status = text
@@ -279,22 +336,21 @@ class GestureController:
         y = (point[1] - margin_y) / (1.0 - 2.0 * margin_y)
         x = self.clamp(x, 0.0, 1.0)
         y = self.clamp(y, 0.0, 1.0)
-        sx = x * self.screen_w
-        sy = y * self.screen_h
-        if self.last_pointer_screen is None:
-            smoothed = (sx, sy)
-        else:
-            alpha = 0.28
-            smoothed = (
-                self.last_pointer_screen[0] * (1.0 - alpha) + sx * alpha,
-                self.last_pointer_screen[1] * (1.0 - alpha) + sy * alpha,
-            )
-        self.last_pointer_screen = smoothed
-        return smoothed
+        screen_w, screen_h = self.screen_size
+        return (x * screen_w, y * screen_h)
+
+    def move_pointer(self, x: float, y: float) -> None:
+        # Called from the cursor thread; prediction may overshoot the edges.
+        screen_w, screen_h = self.screen_size
+        self.gui.moveTo(
+            self.clamp(x, 0.0, screen_w - 1),
+            self.clamp(y, 0.0, screen_h - 1),
+            _pause=False,
+        )
 
     def reset_modes(self) -> None:
         self.cursor_mode = False
-        self.last_pointer_screen = None
+        self.cursor.release()
         self.last_nav_tip = None
 
     def handle_palm(self, sample: FrameSample, now: float) -> None:
@@ -310,7 +366,7 @@ class GestureController:
             and now - state.entered_at >= 0.55
             and self.can_fire("desktop_toggle", now)
         ):
-            if self.safe_action("Desktop toggle", lambda: pyautogui.hotkey("win", "d")):
+            if self.safe_action("Desktop toggle", lambda: self.gui.hotkey("win", "d")):
                 self.set_cooldown("desktop_toggle", 1.0, now)
                 state.entered_at = now + 999.0
 
@@ -329,7 +385,7 @@ class GestureController:
             and now - state.entered_at >= 0.30
             and self.can_fire("task_view", now)
         ):
-            if self.safe_action("Task view", lambda: pyautogui.hotkey("win", "tab")):
+            if self.safe_action("Task view", lambda: self.gui.hotkey("win", "tab")):
                 self.task_view_active = True
                 self.cursor_mode = False
                 self.last_nav_tip = sample.index_tip
@@ -352,10 +408,10 @@ class GestureController:
 
         if abs(dx) >= abs(dy) and abs(dx) > 0.06:
             key = "right" if dx > 0 else "left"
-            moved = self.safe_action(f"Task view {key}", lambda: pyautogui.press(key))
+            moved = self.safe_action(f"Task view {key}", lambda: self.gui.press(key))
         elif abs(dy) > abs(dx) and abs(dy) > 0.08:
             key = "down" if dy > 0 else "up"
-            moved = self.safe_action(f"Task view {key}", lambda: pyautogui.press(key))
+            moved = self.safe_action(f"Task view {key}", lambda: self.gui.press(key))
 
         if moved:
             self.last_nav_tip = sample.index_tip
@@ -374,6 +430,7 @@ class GestureController:
                 and not sample.gesture_flags["three_finger_click"]
             ):
                 self.cursor_mode = False
+                self.cursor.release()
             return
 
         if now - state.entered_at >= 0.20:
@@ -382,8 +439,8 @@ class GestureController:
                 (sample.index_tip[0] + sample.middle_tip[0]) / 2.0,
                 (sample.index_tip[1] + sample.middle_tip[1]) / 2.0,
             )
-            screen_point = self.map_to_screen(cursor_tip)
-            pyautogui.moveTo(screen_point[0], screen_point[1], _pause=False)
+            self.cursor.hold(False)
+            self.cursor.update(self.map_to_screen(cursor_tip), now)
             self.add_status("Cursor mode")
 
     def handle_three_finger_click(self, sample: FrameSample, now: float) -> None:
@@ -397,15 +454,12 @@ class GestureController:
         if not state.active:
             return
 
-        cursor_tip = (
-            (sample.index_tip[0] + sample.middle_tip[0]) / 2.0,
-            (sample.index_tip[1] + sample.middle_tip[1]) / 2.0,
-        )
-        screen_point = self.map_to_screen(cursor_tip)
-        pyautogui.moveTo(screen_point[0], screen_point[1], _pause=False)
+        # Raising the third finger shifts the fingertips; keep the pointer on
+        # its target until the hand is back in two-finger cursor mode.
+        self.cursor.hold(True)
 
         if now - state.entered_at >= 0.18 and self.can_fire("cursor_click", now):
-            if self.safe_action("Cursor click", pyautogui.click):
+            if self.safe_action("Cursor click", lambda: self.gui.click()):
                 self.set_cooldown("cursor_click", 0.5, now)
                 state.entered_at = now + 999.0
 
@@ -421,7 +475,7 @@ class GestureController:
             return
 
         if self.task_view_active and self.can_fire("task_select", now):
-            if self.safe_action("Open selected app", lambda: pyautogui.press("enter")):
+            if self.safe_action("Open selected app", lambda: self.gui.press("enter")):
                 self.task_view_active = False
                 self.last_nav_tip = None
                 self.set_cooldown("task_select", 0.8, now)
@@ -440,7 +494,7 @@ class GestureController:
             and now - state.entered_at >= 0.45
             and self.can_fire("close_app", now)
         ):
-            if self.safe_action("Close current app", lambda: pyautogui.hotkey("alt", "f4")):
+            if self.safe_action("Close current app", lambda: self.gui.hotkey("alt", "f4")):
                 self.set_cooldown("close_app", 1.0, now)
                 state.entered_at = now + 999.0
 
@@ -553,21 +607,34 @@ class GestureController:
             return
 
         window_name = "Hand Gesture Recognition and Action Control System"
-        cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
-        cv2.setWindowProperty(window_name, cv2.WND_PROP_ASPECT_RATIO, cv2.WINDOW_FREERATIO)
+        with self.startup.phase("window create"):
+            cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
+            cv2.setWindowProperty(window_name, cv2.WND_PROP_ASPECT_RATIO, cv2.WINDOW_FREERATIO)
+        try:
+            self.hands = self._hands_loader.result()
+        except RuntimeError as exc:
+            print(f"Error: could not start hand tracking: {exc}")
+            self.cap.release()
+            return
+        self.cursor.start()
         prev_time = time.time()
         fps = 0.0
         try:
             while True:
+                self.pacer.wait()
                 ok, frame = self.cap.read()
                 if not ok:
-                    self.add_status("Camera frame unavailable")
-                    key = cv2.waitKey(1) & 0xFF
+                    self.pacer.reset()
+                    # Sleep through the supervisor's backoff inside waitKey so
+                    # the window stays responsive without spinning a core.
+                    delay_ms = int(self.cap.retry_delay() * 1000)
+                    key = cv2.waitKey(max(1, min(delay_ms, 100))) & 0xFF
                     if key == ord("q"):
                         break
                     continue
 
                 frame = cv2.flip(frame, 1)
+                raw_frame = frame.copy() if self.recorder is not None and not self.record_annotated else None
                 self.frame_height, self.frame_width = frame.shape[:2]
                 now = time.time()
                 dt = max(now - prev_time, 1e-6)
@@ -578,6 +645,7 @@ class GestureController:
                 rgb.flags.writeable = False
                 results = self.hands.process(rgb)
                 rgb.flags.writeable = True
+                self.startup.frame_processed(bool(results.multi_hand_landmarks))
 
                 sample: Optional[FrameSample] = None
                 if results.multi_hand_landmarks:
@@ -588,21 +656,7 @@ class GestureController:
                         raw_points = [(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark]
                         smoothed = self.smooth_landmarks(raw_points)
                         sample = self.classify_hand(smoothed, confidence, now)
-                        self.mp_draw.draw_landmarks(
-                            frame,
-                            hand_landmarks,
-                            self.mp_hands.HAND_CONNECTIONS,
-                            self.mp_draw.DrawingSpec(
-                                color=(0, 255, 180),
-                                thickness=2,
-                                circle_radius=2,
-                            ),
-                            self.mp_draw.DrawingSpec(
-                                color=(255, 255, 255),
-                                thickness=2,
-                                circle_radius=2,
-                            ),
-                        )
+                        self.skeleton.draw(frame, raw_points)
                         self.hand_missing_frames = 0
                     else:
                         self.add_status("Low confidence hand tracking")
@@ -640,6 +694,19 @@ class GestureController:
                     2,
                 )
                 self.draw_overlay(frame, sample, fps)
+                if self.recorder is not None:
+                    record = {
+                        "vote": vote_text,
+                        "status": self.last_status,
+                        "finger_state": list(sample.finger_state) if sample is not None else None,
+                        "cursor_mode": self.cursor_mode,
+                        "task_view": self.task_view_active,
+                        "fps": round(fps, 1),
+                    }
+                    if raw_frame is not None:
+                        self.recorder.submit(now, raw_frame, record, copy=False)
+                    else:
+                        self.recorder.submit(now, frame, record)
                 display_frame = frame
                 try:
                     _, _, win_w, win_h = cv2.getWindowImageRect(window_name)
@@ -655,16 +722,44 @@ class GestureController:
         except KeyboardInterrupt:
             pass
         finally:
+            self.cursor.stop()
+            self.pacer.log_stats("Frame loop")
             try:
-                self.hands.close()
+                if self.hands is not None:
+                    self.hands.close()
             except Exception:
                 pass
             self.cap.release()
+            if self.recorder is not None:
+                self.recorder.close()
             cv2.destroyAllWindows()
 
 
+def _load_pyautogui():
+    import pyautogui
+
+    pyautogui.FAILSAFE = False
+    pyautogui.PAUSE = 0.0
+    return pyautogui, pyautogui.size()
+
+
 def main() -> None:
-    GestureController().run()
+    parser = argparse.ArgumentParser(description="Hand gesture recognition and action control.")
+    parser.add_argument("--record", metavar="VIDEO", help="Record the frames to this video file, with a .jsonl sidecar of per-frame state.")
+    parser.add_argument("--record-raw", action="store_true", help="Record frames without the overlay.")
+    parser.add_argument("--skeleton", choices=sorted(SKELETON_STYLES), default="full", help="Hand skeleton drawing style.")
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+    )
+    startup = StartupTimer()
+    GestureController(
+        startup=startup,
+        record_path=args.record,
+        record_annotated=not args.record_raw,
+        skeleton=args.skeleton,
+    ).run()
 
 
 if __name__ == "__main__":